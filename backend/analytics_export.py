@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Columnar exports of game data for analysis (pandas, polars, DuckDB, Spark...).
+
+Writes one file per table: games, player_game_stats and optionally
+play_by_play, plus the small teams and players tables to join names from.
+Formats are Parquet and Arrow IPC (.arrow, also readable as Feather v2),
+both zstd-compressed. Tables are read straight from the database in keyset pages
+of ANALYTICS_BATCH_ROWS rows, each written as one record batch, so memory
+stays flat however many seasons are exported. Columns keep their database
+types: DateTime becomes a timestamp and JSON (play_by_play.details) is kept
+as JSON text.
+
+Usage:
+    python analytics_export.py [--format parquet|arrow] [--runs 3-7 | --runs 5]
+                               [--pbp] [--out analytics]
+
+    import pandas as pd
+    box_scores = pd.read_parquet('analytics/player_game_stats.parquet')
+
+The same export is served as a zip by /api/backup/analytics.
+"""
+import argparse
+import os
+import time
+import zipfile
+from sqlalchemy import select, type_coerce, Boolean, DateTime, Float, Integer, JSON, String
+from models import Team, Player, Game, PlayerGameStats, PlayByPlay, get_session
+
+# pyarrow is optional and slow to import, so it is loaded on the first
+# export rather than with the app (see load_pyarrow)
+pa = pq = None
+
+ANALYTICS_BATCH_ROWS = 65536
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+COMPRESSION = 'zstd'
+
+
+def load_pyarrow():
+    """Import pyarrow on first use; returns False when it is not installed."""
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:  # pragma: no cover - pyarrow is optional
+            return False
+        pa, pq = pyarrow, pyarrow.parquet
+    return True
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp('us')
+    return pa.string()  # String, Text and JSON (as text)
+
+
+def table_schema(model):
+    return pa.schema([pa.field(c.name, _arrow_type(c)) for c in model.__table__.columns])
+
+
+def _selected(column):
+    # Read JSON as the stored text instead of decoding and re-encoding it
+    return type_coerce(column, String) if isinstance(column.type, JSON) else column
+
+
+def iter_batches(session, model, run_range=None, batch_rows=ANALYTICS_BATCH_ROWS):
+    """Yield a table as Arrow record batches, optionally limited to the games of a range of runs."""
+    schema = table_schema(model)
+    query = select(*[_selected(c) for c in model.__table__.columns])
+    if run_range is not None:
+        first, last = run_range
+        if model is not Game:
+            query = query.join(Game, Game.id == model.game_id)
+        query = query.where(Game.run_id.between(first, last))
+
+    last_id = 0
+    while True:
+        page = session.connection().execute(
+            query.where(model.id > last_id).order_by(model.id).limit(batch_rows)
+        ).all()
+        # End the read between pages so writers are never blocked for long
+        session.rollback()
+        if not page:
+            return
+        values = list(zip(*page))
+        yield pa.record_batch([pa.array(v, type=f.type) for v, f in zip(values, schema)], schema=schema)
+        last_id = page[-1][0]
+
+
+def _write_table(session, model, path, fmt, run_range):
+    schema = table_schema(model)
+    rows = 0
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression=COMPRESSION)
+    else:
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=COMPRESSION))
+    with writer:
+        for batch in iter_batches(session, model, run_range):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_tables(out_dir, fmt='parquet', run_range=None, pbp=False, session=None):
+    """
+    Write the analytics files into out_dir. run_range is an inclusive
+    (first, last) pair of run ids limiting the game tables. Returns
+    {table: (path, rows)}.
+    """
+    if not load_pyarrow():
+        raise RuntimeError("pyarrow is not installed (pip install pyarrow)")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+    models = [Team, Player, Game, PlayerGameStats] + ([PlayByPlay] if pbp else [])
+    os.makedirs(out_dir, exist_ok=True)
+    own_session = session is None
+    session = session or get_session()
+    written = {}
+    try:
+        for model in models:
+            path = os.path.join(out_dir, model.__tablename__ + FORMATS[fmt])
+            game_table = model not in (Team, Player)
+            rows = _write_table(session, model, path, fmt, run_range if game_table else None)
+            written[model.__tablename__] = (path, rows)
+    finally:
+        if own_session:
+            session.close()
+    return written
+
+
+def export_zip(work_dir, fmt='parquet', run_range=None, pbp=False):
+    """Export into work_dir and bundle the files into work_dir/analytics.zip; returns its path."""
+    if not load_pyarrow():
+        raise RuntimeError("pyarrow is not installed (pip install pyarrow)")
+    written = export_tables(os.path.join(work_dir, 'tables'), fmt, run_range, pbp)
+    zip_path = os.path.join(work_dir, 'analytics.zip')
+    # The files are compressed already
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as archive:
+        for path, _ in written.values():
+            archive.write(path, os.path.basename(path))
+    return zip_path
+
+
+def parse_run_range(text):
+    """'5' -> (5, 5), '3-7' -> (3, 7)."""
+    first, _, last = text.partition('-')
+    first, last = int(first), int(last or first)
+    if first > last:
+        raise ValueError(f"Empty run range {text}")
+    return first, last
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+    parser.add_argument('--runs', type=parse_run_range, help='a run id or an inclusive range like 3-7 (default: all)')
+    parser.add_argument('--pbp', action='store_true', help='also export play_by_play')
+    parser.add_argument('--out', default='analytics', help='output directory (default: analytics)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = export_tables(args.out, args.format, args.runs, args.pbp)
+    print(f"✓ Exported {len(written)} tables in {time.perf_counter() - start:.1f}s")
+    for table, (path, rows) in written.items():
+        print(f"  {path:<40} {rows:>12,} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Scheduled backups of basketball_sim.db with hourly/daily/weekly rotation.
+
+Runs as a companion process of the gunicorn master (started by the when_ready
+hook in gunicorn.conf.py, stopped with it) when BACKUP_INTERVAL_MINUTES is set;
+it is off by default. Every BACKUP_INTERVAL_MINUTES it
+takes an online snapshot (snapshots.create_snapshot, paced so writers are
+never blocked for long), checks it with PRAGMA quick_check and gzips it into
+BACKUP_DIR as basketball_sim_YYYYmmdd_HHMMSS.db.gz. The process runs at low
+CPU priority, so the compression does not compete with request handling.
+
+Rotation keeps the newest backup of each of the last BACKUP_KEEP_HOURLY
+hours, BACKUP_KEEP_DAILY days and BACKUP_KEEP_WEEKLY weeks, and deletes the
+rest. It works from the timestamps in the file names alone.
+
+The outcome of the last run is written to BACKUP_DIR/status.json and exported
+by /api/metrics as backup_* gauges (see metrics.py).
+
+Settings (environment):
+    BACKUP_INTERVAL_MINUTES   default 0 (off); e.g. 60 for hourly backups
+    BACKUP_DIR                default ./backups
+    BACKUP_KEEP_HOURLY / BACKUP_KEEP_DAILY / BACKUP_KEEP_WEEKLY   default 24 / 7 / 4
+
+Usage:
+    BACKUP_INTERVAL_MINUTES=60 python backup_scheduler.py   # run the loop (what gunicorn starts)
+    python backup_scheduler.py --once                           # take one backup, rotate and exit
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+import snapshots
+
+BACKUP_INTERVAL_MINUTES = float(os.environ.get('BACKUP_INTERVAL_MINUTES', 0))
+BACKUP_DIR = os.path.abspath(os.environ.get('BACKUP_DIR', 'backups'))
+BACKUP_KEEP_HOURLY = int(os.environ.get('BACKUP_KEEP_HOURLY', 24))
+BACKUP_KEEP_DAILY = int(os.environ.get('BACKUP_KEEP_DAILY', 7))
+BACKUP_KEEP_WEEKLY = int(os.environ.get('BACKUP_KEEP_WEEKLY', 4))
+GZIP_LEVEL = 6
+
+PREFIX = 'basketball_sim_'
+SUFFIX = '.db.gz'
+STAMP_FORMAT = '%Y%m%d_%H%M%S'
+STATUS_FILE = 'status.json'
+POLL_SECONDS = 5
+
+
+def backup_files(backup_dir=BACKUP_DIR):
+    """{timestamp: path} of the backups in backup_dir."""
+    found = {}
+    for name in os.listdir(backup_dir) if os.path.isdir(backup_dir) else ():
+        if name.startswith(PREFIX) and name.endswith(SUFFIX):
+            try:
+                stamp = datetime.strptime(name[len(PREFIX):-len(SUFFIX)], STAMP_FORMAT)
+            except ValueError:
+                continue
+            found[stamp] = os.path.join(backup_dir, name)
+    return found
+
+
+def select_kept(stamps, hourly=BACKUP_KEEP_HOURLY, daily=BACKUP_KEEP_DAILY, weekly=BACKUP_KEEP_WEEKLY):
+    """The timestamps rotation keeps: the newest one of each of the latest hours, days and weeks."""
+    periods = (
+        (hourly, lambda t: (t.date(), t.hour)),
+        (daily, lambda t: t.date()),
+        (weekly, lambda t: t.isocalendar()[:2]),
+    )
+    newest_first = sorted(stamps, reverse=True)
+    kept = set(newest_first[:1])
+    for count, period in periods:
+        seen = set()
+        for stamp in newest_first:
+            key = period(stamp)
+            if key in seen:
+                continue
+            if len(seen) == count:
+                break
+            seen.add(key)
+            kept.add(stamp)
+    return kept
+
+
+def rotate(backup_dir=BACKUP_DIR):
+    """Delete the backups rotation no longer keeps; returns how many are left."""
+    files = backup_files(backup_dir)
+    kept = select_kept(files)
+    for stamp, path in files.items():
+        if stamp not in kept:
+            os.remove(path)
+    return len(kept)
+
+
+def read_status(backup_dir=BACKUP_DIR):
+    """The last run's status dict, or None before the first backup."""
+    try:
+        with open(os.path.join(backup_dir, STATUS_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_status(backup_dir, status):
+    path = os.path.join(backup_dir, STATUS_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(status, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def take_backup(backup_dir=BACKUP_DIR, db_path=None):
+    """Snapshot, check, compress and rotate; returns the status dict (also written to status.json)."""
+    os.makedirs(backup_dir, exist_ok=True)
+    started = datetime.now()
+    start = time.perf_counter()
+    name = f"{PREFIX}{started.strftime(STAMP_FORMAT)}{SUFFIX}"
+    path = os.path.join(backup_dir, name)
+    snapshot = os.path.join(backup_dir, f'.{name}.db')
+    status = {'started_at': started.isoformat(timespec='seconds'), 'path': path}
+    try:
+        snapshots.create_snapshot(snapshot, db_path)
+        conn = sqlite3.connect(snapshot)
+        try:
+            check = conn.execute('PRAGMA quick_check').fetchone()[0]
+        finally:
+            conn.close()
+        if check != 'ok':
+            raise RuntimeError(f"snapshot failed quick_check: {check}")
+        with open(snapshot, 'rb') as src, gzip.open(path + '.partial', 'wb', GZIP_LEVEL) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(path + '.partial', path)
+        status.update(ok=True, size_bytes=os.path.getsize(path), kept=rotate(backup_dir))
+        print(f"✓ Backup {name} ({status['size_bytes'] / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        status.update(ok=False, error=str(e), path=None)
+        print(f"⚠ Backup failed: {e}")
+    finally:
+        for leftover in (snapshot, path + '.partial'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    status['duration_seconds'] = round(time.perf_counter() - start, 2)
+    status['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    previous = read_status(backup_dir) or {}
+    status['last_success_at'] = status['finished_at'] if status['ok'] else previous.get('last_success_at')
+    _write_status(backup_dir, status)
+    return status
+
+
+def run_forever(backup_dir=BACKUP_DIR, interval_minutes=BACKUP_INTERVAL_MINUTES):
+    """Take a backup every interval until SIGTERM or until the parent process exits."""
+    # POSIX only, like gunicorn itself; imported here so metrics.py can read
+    # the status file on Windows
+    import fcntl
+    os.makedirs(backup_dir, exist_ok=True)
+    # One scheduler per backup directory, even with several servers
+    lock = open(os.path.join(backup_dir, '.lock'), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"⚠ Another backup scheduler is using {backup_dir}; not starting")
+        return
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+    parent = os.getppid()
+    os.nice(10)
+    # Work files of a run that was killed
+    for name in os.listdir(backup_dir):
+        if name.startswith('.' + PREFIX) or name.endswith('.partial'):
+            os.remove(os.path.join(backup_dir, name))
+
+    # After a restart, continue the schedule instead of backing up right away
+    latest = max(backup_files(backup_dir), default=None)
+    next_run = latest.timestamp() + interval_minutes * 60 if latest else time.time()
+    print(f"✓ Backup scheduler: every {interval_minutes:g} min into {backup_dir}")
+    while not stopping and os.getppid() == parent:
+        if time.time() >= next_run:
+            take_backup(backup_dir)
+            next_run = time.time() + interval_minutes * 60
+        time.sleep(max(0.1, min(POLL_SECONDS, next_run - time.time())))
+
+
+def start_scheduler():
+    """Start the scheduler as a child process (None when disabled); called from gunicorn.conf.py."""
+    if BACKUP_INTERVAL_MINUTES <= 0:
+        print("⚠ Scheduled backups are off (set BACKUP_INTERVAL_MINUTES to enable them)")
+        return None
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__)])
+
+
+def stop_scheduler(process):
+    if process is not None and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--once', action='store_true', help='take one backup, rotate and exit')
+    args = parser.parse_args()
+    if args.once:
+        status = take_backup()
+        sys.exit(0 if status['ok'] else 1)
+    if BACKUP_INTERVAL_MINUTES <= 0:
+        parser.error("set BACKUP_INTERVAL_MINUTES to run the scheduler, or use --once")
+    run_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Shared setup for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database in a temp directory so
+they never touch ``basketball_sim.db``.
+"""
+import os
+import random
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def use_temp_database(db_path=None):
+    """
+    Switch the working directory so the app's relative ``basketball_sim.db``
+    resolves to a temp copy (or to ``db_path`` when one is given).
+    Returns True when the database still needs seeding.
+    """
+    if db_path:
+        os.chdir(os.path.dirname(os.path.abspath(db_path)))
+        return False
+    os.chdir(tempfile.mkdtemp(prefix='bball_bench_'))
+    return True
+
+
+def seed_league():
+    """Create the 32 teams, their rosters and the free agent pool."""
+    from seed_data import seed_teams_and_players
+    from add_free_agents import add_free_agents
+    seed_teams_and_players()
+    add_free_agents()
+
+
+def simulate_games(client, count, seed=42):
+    """Play ``count`` games through the API against the active series."""
+    rng = random.Random(seed)
+    played = 0
+    while played < count:
+        active = client.get('/api/tournament/active-series').get_json()
+        if not active:
+            break
+        for series in active:
+            if played >= count:
+                break
+            info = client.get(f"/api/tournament/series/{series['id']}").get_json()
+            home, away = rng.randint(18, 34), rng.randint(18, 34)
+            if home == away:
+                home += 1
+            client.post('/api/games/create', json={
+                'home_team_id': info['team1']['id'],
+                'away_team_id': info['team2']['id'],
+                'quarter_number': rng.randint(1, 4),
+                'home_score': home,
+                'away_score': away,
+                'series_id': series['id']
+            })
+            played += 1
+    return played
+
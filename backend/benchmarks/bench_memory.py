@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Memory regression check: simulate many games through the API in one process
+and track resident memory. With request-scoped sessions nothing a request
+loads should outlive it, so RSS must level off after warm-up instead of
+growing with the number of games played.
+
+Exits with status 1 when RSS grows by more than --max-growth-mb between the
+end of warm-up and the last game.
+
+Usage:
+    python benchmarks/bench_memory.py [--games 10000] [--warmup 500] [--sample 500] [--max-growth-mb 25]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+from _setup import use_temp_database, seed_league
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=10000, help='games to simulate after warm-up')
+    parser.add_argument('--warmup', type=int, default=500, help='games played before the baseline is taken')
+    parser.add_argument('--sample', type=int, default=500, help='record RSS every N games')
+    parser.add_argument('--max-growth-mb', type=float, default=25.0, help='allowed RSS growth after warm-up')
+    parser.add_argument('--db', help='run against an existing database instead of a fresh one')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    if use_temp_database(args.db):
+        seed_league()
+
+    from app import create_app
+    client = create_app().test_client()
+    team_ids = [t['id'] for t in client.get('/api/teams').get_json()]
+    rng = random.Random(42)
+
+    def play_game():
+        home, away = rng.sample(team_ids, 2)
+        home_score, away_score = rng.randint(18, 34), rng.randint(18, 34)
+        if home_score == away_score:
+            home_score += 1
+        # Exhibition games (no series) so the bracket never runs out
+        response = client.post('/api/games/create', json={
+            'home_team_id': home,
+            'away_team_id': away,
+            'quarter_number': rng.randint(1, 4),
+            'home_score': home_score,
+            'away_score': away_score
+        })
+        if response.status_code != 200:
+            raise SystemExit(f"create_game failed: {response.status_code} {response.get_data(as_text=True)}")
+        client.get(f"/api/games/{response.get_json()['game_id']}")
+
+    for _ in range(args.warmup):
+        play_game()
+    gc.collect()
+    baseline = rss_mb()
+
+    samples = [{'games': 0, 'rss_mb': round(baseline, 1), 'elapsed_s': 0.0}]
+    start = time.perf_counter()
+    for played in range(1, args.games + 1):
+        play_game()
+        if played % args.sample == 0 or played == args.games:
+            gc.collect()
+            samples.append({
+                'games': played,
+                'rss_mb': round(rss_mb(), 1),
+                'elapsed_s': round(time.perf_counter() - start, 1)
+            })
+
+    growth = samples[-1]['rss_mb'] - baseline
+    passed = growth <= args.max_growth_mb
+    result = {
+        'warmup_games': args.warmup,
+        'games': args.games,
+        'baseline_rss_mb': round(baseline, 1),
+        'final_rss_mb': samples[-1]['rss_mb'],
+        'growth_mb': round(growth, 1),
+        'max_growth_mb': args.max_growth_mb,
+        'passed': passed,
+        'samples': samples
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'games':>8} {'rss MB':>8} {'elapsed s':>10}")
+        for s in samples:
+            print(f"{s['games']:>8} {s['rss_mb']:>8.1f} {s['elapsed_s']:>10.1f}")
+        print(f"RSS growth after warm-up: {growth:+.1f} MB over {args.games} games "
+              f"(limit {args.max_growth_mb} MB) -> {'OK' if passed else 'FAIL'}")
+
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
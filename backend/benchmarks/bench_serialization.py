@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization time and bytes on the wire for the two largest
+payloads: a full game's play-by-play and the full database export.
+
+Usage:
+    python benchmarks/bench_serialization.py [--games 60] [--repeat 20] [--db PATH]
+"""
+import argparse
+import json
+import time
+
+from _setup import use_temp_database, seed_league, simulate_games
+
+
+def time_call(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def wire_bytes(client, path, encoding):
+    response = client.get(path, headers={'Accept-Encoding': encoding})
+    return len(response.data), response.headers.get('Content-Encoding', 'identity')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=60, help='games to simulate into a fresh database')
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions (best is reported)')
+    parser.add_argument('--db', help='benchmark an existing database instead of a fresh one')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    needs_seed = use_temp_database(args.db)
+    if needs_seed:
+        seed_league()
+
+    from flask.json.provider import DefaultJSONProvider
+    from json_provider import FastJSONProvider, fast_json_available
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    if needs_seed:
+        simulate_games(client, args.games)
+
+    latest = client.get('/api/games').get_json()
+    if not latest:
+        raise SystemExit('No games in the database to benchmark')
+
+    payloads = {
+        'playbyplay': f"/api/games/{latest[0]['id']}/playbyplay",
+        'export': '/api/backup/export'
+    }
+
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    results = []
+    for name, path in payloads.items():
+        data = client.get(path, headers={'Accept-Encoding': 'identity'}).get_json()
+        row = {
+            'payload': name,
+            'path': path,
+            'stdlib_ms': round(time_call(lambda: stdlib.dumps(data), args.repeat), 3),
+            'fast_ms': round(time_call(lambda: fast.dumps(data), args.repeat), 3),
+            'fast_backend': 'orjson' if fast_json_available() else 'stdlib',
+        }
+        for encoding in ('identity', 'gzip', 'br'):
+            size, applied = wire_bytes(client, path, encoding)
+            row[f'bytes_{encoding}'] = size if applied == encoding else None
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'payload':<12}{'stdlib ms':>11}{'fast ms':>10}{'identity B':>13}{'gzip B':>10}{'br B':>10}")
+    for row in results:
+        print(f"{row['payload']:<12}{row['stdlib_ms']:>11.2f}{row['fast_ms']:>10.2f}"
+              f"{row['bytes_identity']:>13}{str(row['bytes_gzip']):>10}{str(row['bytes_br']):>10}")
+
+
+if __name__ == '__main__':
+    main()
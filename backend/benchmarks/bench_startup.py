@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold start: time-to-first-response for a group of workers booting
+at the same time against one database, the way gunicorn starts them.
+
+Each worker is a separate Python process that imports the app, calls
+create_app() and serves GET /api/health through the test client. The first
+request also runs the one-time startup work (startup.py), so with a fresh
+database the workers contend for the initialization lock.
+
+Usage:
+    python benchmarks/bench_startup.py [--workers 4] [--rounds 3] [--preinit] [--db PATH]
+
+--preinit runs the startup work in this process first and marks it done, as
+the on_starting hook in gunicorn.conf.py does for the gunicorn master.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from _setup import BACKEND_DIR, use_temp_database, seed_league
+
+WORKER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+response = app.test_client().get('/api/health')
+done = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code,
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (done - created) * 1000,
+    'total_ms': (done - start) * 1000,
+}))
+"""
+
+
+def boot_workers(count, env):
+    """Start count worker processes at once and return their timings."""
+    started = time.perf_counter()
+    procs = [
+        subprocess.Popen([sys.executable, '-c', WORKER_SCRIPT], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for _ in range(count)
+    ]
+    results = []
+    for index, proc in enumerate(procs):
+        out, _ = proc.communicate()
+        row = json.loads(out.strip().splitlines()[-1])
+        row['worker'] = index
+        results.append(row)
+    wall_ms = (time.perf_counter() - started) * 1000
+    return results, wall_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='workers booted together')
+    parser.add_argument('--rounds', type=int, default=3, help='boot rounds, each from a fresh copy of the database')
+    parser.add_argument('--preinit', action='store_true', help='initialize once up front like the gunicorn master hook')
+    parser.add_argument('--db', help='copy this database for every round instead of a freshly seeded one')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    source = os.path.abspath(args.db) if args.db else None
+    use_temp_database()
+    if not source:
+        seed_league()
+        source = os.path.abspath('seed.db')
+        shutil.move('basketball_sim.db', source)
+
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+
+    rounds = []
+    for number in range(args.rounds):
+        shutil.copyfile(source, 'basketball_sim.db')
+        env.pop('BBALL_DB_INITIALIZED', None)
+
+        preinit_ms = None
+        if args.preinit:
+            from startup import initialize_database, INITIALIZED_ENV
+            start = time.perf_counter()
+            initialize_database()
+            preinit_ms = (time.perf_counter() - start) * 1000
+            env[INITIALIZED_ENV] = '1'
+
+        workers, wall_ms = boot_workers(args.workers, env)
+        rounds.append({'round': number, 'preinit_ms': preinit_ms, 'wall_ms': wall_ms, 'workers': workers})
+
+    if args.json:
+        print(json.dumps(rounds, indent=2))
+        return
+
+    for r in rounds:
+        preinit = f", master init {r['preinit_ms']:.0f} ms" if r['preinit_ms'] is not None else ''
+        print(f"Round {r['round']}: all {args.workers} workers ready in {r['wall_ms']:.0f} ms{preinit}")
+        print(f"  {'worker':>6} {'status':>6} {'import':>9} {'create_app':>11} {'1st request':>12} {'total':>9}")
+        for w in r['workers']:
+            print(f"  {w['worker']:>6} {w['status']:>6} {w['import_ms']:>7.0f}ms {w['create_app_ms']:>9.1f}ms "
+                  f"{w['first_request_ms']:>10.0f}ms {w['total_ms']:>7.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
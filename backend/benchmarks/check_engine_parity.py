@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Engine parity check: play the same inputs through the per-game engine
+(GameExtrapolator._generate_all_quarters / _team_player_stat_rows) and the
+vectorized one (extrapolate_quarters_batch / box_score_batch) and fail if
+their score and box score distributions drift apart.
+
+The two draw from different random generators, so games are compared in
+aggregate: the mean and spread of every quarter, of the game totals and of
+each roster slot's stats over --games games must agree to within MAX_SIGMA
+standard errors. Both are seeded, so a run is reproducible and a failure
+points at the formula that changed.
+
+Usage:
+    python benchmarks/check_engine_parity.py [--games 4000] [--seed 42]
+"""
+import argparse
+import random
+import sys
+from types import SimpleNamespace
+
+import _setup  # noqa: F401  (puts backend/ on the path)
+import numpy as np
+from game_extrapolator import GameExtrapolator, box_score_batch, extrapolate_quarters_batch
+
+# (quarter_number, home score, away score): close, blowout, each quarter
+QUARTER_INPUTS = ((1, 28, 25), (2, 22, 30), (3, 35, 15), (4, 12, 31))
+
+# A roster sorted by PPG, stars to end of the bench
+ROSTER = {
+    'ppg': [27.5, 21.0, 16.2, 12.8, 11.1, 9.4, 7.7, 6.0, 4.2, 3.1, 2.0, 1.2],
+    'rpg': [7.1, 4.2, 9.8, 3.5, 5.0, 2.9, 6.3, 2.1, 3.0, 1.8, 1.0, 0.8],
+    'apg': [6.5, 5.1, 2.2, 3.9, 1.7, 2.4, 1.1, 1.6, 0.9, 0.7, 0.4, 0.3],
+    'spg': [1.4, 1.1, 0.8, 1.0, 0.6, 0.7, 0.5, 0.6, 0.4, 0.3, 0.2, 0.1],
+    'bpg': [0.6, 0.4, 1.9, 0.3, 1.1, 0.2, 0.8, 0.3, 0.5, 0.2, 0.1, 0.1],
+    'mpg': [36.0, 34.0, 31.0, 29.0, 27.0, 22.0, 18.0, 15.0, 12.0, 9.0, 6.0, 4.0],
+}
+TEAM_SCORES = (95, 112, 128)
+BOX_STATS = ('points', 'minutes', 'rebounds', 'assists', 'steals', 'blocks')
+
+# Allowed gap between the engines, in standard errors of the difference
+MAX_SIGMA = 4.5
+
+
+def moments(sample):
+    """(mean, variance, squared standard error of the mean, squared standard error of the variance)."""
+    sample = np.asarray(sample, dtype=float)
+    mean = sample.mean()
+    deviations = (sample - mean) ** 2
+    variance = deviations.mean()
+    # From the fourth moment: these stats are small integer counts, far from normal
+    return mean, variance, variance / len(sample), (np.mean(deviations ** 2) - variance ** 2) / len(sample)
+
+
+def compare(label, scalar, batch, failures):
+    """Record a failure when two samples' means or variances differ by more than MAX_SIGMA."""
+    scalar_mean, scalar_var, scalar_mean_err, scalar_var_err = moments(scalar)
+    batch_mean, batch_var, batch_mean_err, batch_var_err = moments(batch)
+    ok = abs(scalar_mean - batch_mean) <= MAX_SIGMA * (scalar_mean_err + batch_mean_err) ** 0.5
+    ok = ok and abs(scalar_var - batch_var) <= MAX_SIGMA * (scalar_var_err + batch_var_err) ** 0.5
+    if not ok:
+        failures.append(f"{label}: mean {scalar_mean:.2f} vs {batch_mean:.2f}, "
+                        f"sd {scalar_var ** 0.5:.2f} vs {batch_var ** 0.5:.2f} (per-game vs vectorized)")
+
+
+def check_quarters(engine, games, seed, failures):
+    rng = np.random.default_rng(seed)
+    for quarter, home_score, away_score in QUARTER_INPUTS:
+        scalar = [engine._generate_all_quarters(home_score / 12, away_score / 12, quarter, home_score, away_score)
+                  for _ in range(games)]
+        home, away = extrapolate_quarters_batch(rng, np.full(games, quarter), np.full(games, home_score),
+                                                np.full(games, away_score))
+        label = f"Q{quarter} {home_score}-{away_score}"
+        for side, batch in (('home', home), ('away', away)):
+            for q in range(4):
+                compare(f"{label} {side} q{q + 1}", [g[side][q] for g in scalar], batch[:, q], failures)
+            compare(f"{label} {side} total", [sum(g[side]) for g in scalar], batch.sum(axis=1), failures)
+
+
+def check_box_scores(engine, games, seed, failures):
+    rng = np.random.default_rng(seed)
+    players = [
+        SimpleNamespace(id=slot, fg_pct=0.46, three_pt_pct=0.36, ft_pct=0.78,
+                        **{stat: values[slot] for stat, values in ROSTER.items()})
+        for slot in range(len(ROSTER['ppg']))
+    ]
+    ratings = {stat: np.array(values) for stat, values in ROSTER.items()}
+    game = SimpleNamespace(id=0)
+    column = {'minutes': 'minutes_played'}
+
+    for team_score in TEAM_SCORES:
+        scalar = [{row['player_id']: row for row in engine._team_player_stat_rows(game, 1, players, team_score, 100)}
+                  for _ in range(games)]
+        batch = box_score_batch(rng, ratings, np.full(games, team_score))
+        for stat in BOX_STATS:
+            for slot in range(len(players)):
+                values = [box[slot][column.get(stat, stat)] if slot in box else 0 for box in scalar]
+                compare(f"{team_score} pts slot {slot + 1} {stat}", values, batch[stat][:, slot], failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=4000, help='games per input')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # The per-game methods don't touch the session
+    engine = GameExtrapolator.__new__(GameExtrapolator)
+    failures = []
+    check_quarters(engine, args.games, args.seed, failures)
+    check_box_scores(engine, args.games, args.seed, failures)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"✓ Per-game and vectorized engines agree over {args.games} games per input")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Query budget check: run the main read endpoints against a freshly seeded
+league with a fixed number of games and fail if any of them issues more SQL
+statements than its budget. Statements repeated per row (N+1 lazy loads)
+are listed for every endpoint, so a regression points straight at the cause.
+
+Budgets are for the default --games; handlers whose count grows with the
+data fail first when a per-row query sneaks in.
+
+Usage:
+    python benchmarks/check_query_counts.py [--games 24] [--report]
+
+--report prints the counts without enforcing the budgets.
+"""
+import argparse
+import sys
+
+from _setup import use_temp_database, seed_league, simulate_games
+
+# Max statements per request with the default --games (24)
+QUERY_BUDGETS = {
+    '/api/games': 5,
+    '/api/games/history': 22,
+    '/api/games/{game_id}': 25,
+    '/api/games/{game_id}/playbyplay': 2,
+    '/api/tournament/overview': 6,
+    '/api/tournament/active-series': 6,
+    '/api/stats/leaders': 7,
+    '/api/runs': 4,
+    '/api/dashboard': 15,
+    '/api/teams': 3,
+    '/api/teams/{team_id}': 4,
+    '/api/free-agents': 3,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=24, help='games to simulate before measuring')
+    parser.add_argument('--report', action='store_true', help='print counts only, do not enforce budgets')
+    args = parser.parse_args()
+
+    use_temp_database()
+    seed_league()
+
+    from app import create_app
+    from cache import read_cache
+    from sql_debug import assert_max_queries, count_queries
+
+    client = create_app().test_client()
+    simulate_games(client, args.games)
+    game_id = client.get('/api/games').get_json()[0]['id']
+
+    failures = []
+    print(f"{'endpoint':<34} {'queries':>7} {'budget':>6}  repeated shapes")
+    for template, budget in QUERY_BUDGETS.items():
+        path = template.format(game_id=game_id, team_id=1)
+        # Measure the uncached path; cached reads would hide per-row queries
+        read_cache.clear()
+        if args.report:
+            with count_queries() as collector:
+                client.get(path)
+        else:
+            try:
+                _, collector = assert_max_queries(client, path, budget)
+            except AssertionError as e:
+                failures.append(str(e))
+                continue
+        repeated = ', '.join(f"{n}x" for n, _ in collector.repeated())
+        print(f"{template:<34} {collector.count:>7} {budget:>6}  {repeated}")
+
+    for failure in failures:
+        print(f"\nFAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Load test a running server with the request mix the frontend generates, or
+by replaying a recorded access log, to compare worker models (gunicorn
+WEB_CONCURRENCY, --worker-class, --threads) and database profiles.
+
+Scenario mode (default) runs --users virtual users for --duration seconds.
+Each one opens the app the way App.tsx does (one dashboard request for runs,
+active run, active series and leaders), then loops over weighted actions with
+--think seconds between them:
+
+    tournament view    GET  /api/tournament/overview
+    games view         GET  /api/games
+    create-game view   GET  /api/tournament/active-series
+    stats view         GET  /api/stats/leaders?season=current
+    open a game        GET  /api/games/<id>
+    preview a game     GET  /api/tournament/series/<id>, POST /api/games/preview
+    create a game      GET  /api/tournament/series/<id>, POST /api/games/create,
+                       then the post-game burst: GET /api/games/<new id> and
+                       GET /api/dashboard?season=current
+
+--writes is the share of actions that create a game. When a game finishes a
+round (or the run), every user refetches the dashboard, as the change feed
+makes all open clients do.
+
+Replay mode (--replay FILE) re-issues the GET requests of a gunicorn access
+log (start the server with ACCESS_LOG=access.log to record one) with
+--concurrency threads, as fast as possible or, with --realtime, at the
+original pace. Other methods are skipped since their bodies are not logged.
+
+Reports throughput, p50/p95/p99 latency per endpoint, errors by status and
+SQLite lock errors (responses mentioning "database is locked").
+
+Usage:
+    python benchmarks/load_test.py [--url http://localhost:8080] [--users 16]
+                                   [--duration 30] [--think 0.5] [--writes 0.1]
+    python benchmarks/load_test.py --replay access.log [--concurrency 16] [--realtime]
+
+    add --output results.json to keep the numbers
+"""
+import argparse
+import gzip
+import http.client
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+LOCK_MARKER = b'database is locked'
+
+# Relative weights of the read actions; creates are --writes of all actions
+READ_WEIGHTS = {
+    'tournament': 15,
+    'games': 15,
+    'active_series': 10,
+    'leaders': 10,
+    'open_game': 20,
+    'preview': 10,
+}
+
+RUN_OVER = 6  # one past the Finals
+
+MOUNT_FIELDS = 'runs,active_run,active_series,leaders'
+ROUND_CHANGE_FIELDS = 'runs,active_run,active_series,tournament'
+
+# Gunicorn's default access log format ('%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s ...')
+ACCESS_LOG_LINE = re.compile(r'^\S+ \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)[^"]*" (\d{3})')
+ACCESS_LOG_TIME = '%d/%b/%Y:%H:%M:%S %z'
+NUMBER_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+class Results:
+    """Thread-safe per-endpoint samples."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.lock_errors = defaultdict(int)
+        self.connection_errors = defaultdict(int)
+
+    def record(self, label, status, elapsed, locked):
+        with self.lock:
+            self.samples[label].append(elapsed)
+            self.statuses[label][status] += 1
+            if locked:
+                self.lock_errors[label] += 1
+
+    def record_failure(self, label):
+        with self.lock:
+            self.connection_errors[label] += 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class Client:
+    """One keep-alive connection per thread; reconnects when the server closes it."""
+
+    def __init__(self, base_url, results, timeout):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connect = lambda: connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.conn = self.connect()
+        self.results = results
+
+    def request(self, method, path, label=None, body=None):
+        """Send one request and record it under label; returns the parsed JSON or None."""
+        label = label or f"{method} {NUMBER_SEGMENT.sub('/<id>', path.split('?')[0])}"
+        # gzip rather than br so responses decode with the standard library
+        headers = {'Accept-Encoding': 'gzip'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in range(2):
+            start = time.perf_counter()
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # A keep-alive connection the server already closed; retry once on a new one
+                self.conn.close()
+                self.conn = self.connect()
+                if attempt == 0:
+                    continue
+                self.results.record_failure(label)
+                return None
+            except (OSError, http.client.HTTPException):
+                self.conn.close()
+                self.conn = self.connect()
+                self.results.record_failure(label)
+                return None
+            elapsed = time.perf_counter() - start
+            break
+
+        self.results.record(label, response.status, elapsed, LOCK_MARKER in data)
+        if response.status >= 400:
+            return None
+        try:
+            if response.getheader('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            return json.loads(data)
+        except (ValueError, OSError):
+            return None
+
+
+class VirtualUser:
+    """Replays the App.tsx request pattern for one browser tab."""
+
+    def __init__(self, client, shared, rng, think, writes):
+        self.client = client
+        self.shared = shared
+        self.rng = rng
+        self.think = think
+        self.writes = writes
+        self.active_series = []
+        self.game_ids = []
+        self.seen_round = 0
+
+    def load_dashboard(self, label, fields=None):
+        path = '/api/dashboard?season=current' + (f'&fields={fields}' if fields else '')
+        data = self.client.request('GET', path, label)
+        if data:
+            if 'active_series' in data:
+                self.active_series = [s['id'] for s in data['active_series']]
+                # No active series left means the run is over, which counts as the last change
+                self.note_round(min((s['round'] for s in data['active_series']), default=RUN_OVER))
+            if 'games' in data:
+                self.game_ids = [g['id'] for g in data['games']][:100]
+        return data
+
+    def note_round(self, current_round):
+        """
+        Count a round change the first time any user sees the bracket move on.
+        Responses can arrive out of order, so only a later round counts.
+        """
+        with self.shared['lock']:
+            if current_round > self.shared['round']:
+                if self.shared['round']:
+                    self.shared['round_changes'] += 1
+                self.shared['round'] = current_round
+
+    def run(self, deadline):
+        self.load_dashboard('GET /api/dashboard (mount)', MOUNT_FIELDS)
+        self.seen_round = self.shared['round_changes']
+        actions, weights = zip(*READ_WEIGHTS.items())
+
+        while time.monotonic() < deadline:
+            # Another user's game ended a round: the change feed makes every tab refetch
+            if self.shared['round_changes'] != self.seen_round:
+                self.seen_round = self.shared['round_changes']
+                self.load_dashboard('GET /api/dashboard (round change)', ROUND_CHANGE_FIELDS)
+
+            if self.active_series and self.rng.random() < self.writes:
+                self.create_game()
+            else:
+                getattr(self, f'view_{self.rng.choices(actions, weights)[0]}')()
+            if self.think:
+                time.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+
+    def view_tournament(self):
+        self.client.request('GET', '/api/tournament/overview')
+
+    def view_games(self):
+        games = self.client.request('GET', '/api/games')
+        if games:
+            self.game_ids = [g['id'] for g in games][:100]
+
+    def view_active_series(self):
+        series = self.client.request('GET', '/api/tournament/active-series')
+        if series is not None:
+            self.active_series = [s['id'] for s in series]
+
+    def view_leaders(self):
+        self.client.request('GET', '/api/stats/leaders?season=current')
+
+    def view_open_game(self):
+        if not self.game_ids:
+            return self.view_games()
+        self.client.request('GET', f"/api/games/{self.rng.choice(self.game_ids)}")
+
+    def _quarter_input(self, series):
+        home, away = self.rng.randint(18, 34), self.rng.randint(18, 34)
+        if home == away:
+            home += 1
+        return {
+            'home_team_id': series['team1']['id'],
+            'away_team_id': series['team2']['id'],
+            'quarter_number': self.rng.randint(1, 4),
+            'home_score': home,
+            'away_score': away,
+        }
+
+    def view_preview(self):
+        if not self.active_series:
+            return self.view_active_series()
+        series = self.client.request('GET', f"/api/tournament/series/{self.rng.choice(self.active_series)}")
+        if series:
+            self.client.request('POST', '/api/games/preview', body=self._quarter_input(series))
+
+    def create_game(self):
+        series_id = self.rng.choice(self.active_series)
+        series = self.client.request('GET', f"/api/tournament/series/{series_id}")
+        if not series:
+            return
+        created = self.client.request('POST', '/api/games/create',
+                                      body={**self._quarter_input(series), 'series_id': series_id})
+        if not created:
+            # Most likely the series was just decided by someone else
+            self.active_series.remove(series_id)
+            return
+
+        self.client.request('GET', f"/api/games/{created['game_id']}")
+        self.game_ids.insert(0, created['game_id'])
+        self.load_dashboard('GET /api/dashboard (post-game)')
+
+
+def run_scenario(args, results):
+    shared = {'lock': threading.Lock(), 'round': 0, 'round_changes': 0}
+    deadline = time.monotonic() + args.duration
+
+    def user(index):
+        client = Client(args.url, results, args.timeout)
+        VirtualUser(client, shared, random.Random(args.seed + index), args.think, args.writes).run(deadline)
+
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for future in [pool.submit(user, i) for i in range(args.users)]:
+            future.result()
+    return {'round_changes': shared['round_changes']}
+
+
+def read_access_log(path):
+    """[(offset_seconds, path)] for the GET requests in a gunicorn access log, plus skipped count."""
+    requests, skipped, first = [], 0, None
+    with open(path) as f:
+        for line in f:
+            match = ACCESS_LOG_LINE.match(line)
+            if not match:
+                continue
+            stamp, method, target, _ = match.groups()
+            if method != 'GET' or not target.startswith('/api/') or target.startswith('/api/events'):
+                skipped += 1
+                continue
+            when = datetime.strptime(stamp, ACCESS_LOG_TIME).timestamp()
+            first = when if first is None else first
+            requests.append((when - first, target))
+    return requests, skipped
+
+
+def run_replay(args, results):
+    requests, skipped = read_access_log(args.replay)
+    if not requests:
+        raise SystemExit(f"No GET /api requests found in {args.replay}")
+    print(f"Replaying {len(requests):,} requests ({skipped:,} non-GET or streaming lines skipped)")
+
+    local = threading.local()
+    start = time.monotonic()
+
+    def send(item):
+        offset, target = item
+        if args.realtime:
+            delay = start + offset / args.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        if not hasattr(local, 'client'):
+            local.client = Client(args.url, results, args.timeout)
+        local.client.request('GET', target)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(send, requests))
+    return {'replayed': len(requests), 'skipped': skipped}
+
+
+def summarize(results, wall):
+    rows = []
+    for label in sorted(results.samples, key=lambda l: -len(results.samples[l])):
+        samples = sorted(s * 1000 for s in results.samples[label])
+        statuses = results.statuses[label]
+        rows.append({
+            'endpoint': label,
+            'count': len(samples),
+            'rps': round(len(samples) / wall, 2),
+            'errors': sum(n for status, n in statuses.items() if status >= 400),
+            'lock_errors': results.lock_errors[label],
+            'connection_errors': results.connection_errors[label],
+            'statuses': {str(status): n for status, n in sorted(statuses.items())},
+            'mean_ms': round(statistics.fmean(samples), 2),
+            'p50_ms': round(percentile(samples, 50), 2),
+            'p95_ms': round(percentile(samples, 95), 2),
+            'p99_ms': round(percentile(samples, 99), 2),
+            'max_ms': round(samples[-1], 2),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8080', help='server base URL')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    parser.add_argument('--users', type=int, default=16, help='virtual users (scenario mode)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to run (scenario mode)')
+    parser.add_argument('--think', type=float, default=0.5, help='mean pause between user actions, seconds')
+    parser.add_argument('--writes', type=float, default=0.1, help='share of actions that create a game')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--replay', metavar='FILE', help='replay the GET requests of a gunicorn access log')
+    parser.add_argument('--concurrency', type=int, default=16, help='replay threads')
+    parser.add_argument('--realtime', action='store_true', help='replay at the recorded pace')
+    parser.add_argument('--speed', type=float, default=1.0, help='with --realtime, replay this many times faster')
+    parser.add_argument('--output', help='write the results as JSON')
+    args = parser.parse_args()
+
+    results = Results()
+    started = time.monotonic()
+    if args.replay:
+        meta = run_replay(args, results)
+        meta.update(mode='replay', source=args.replay, concurrency=args.concurrency, realtime=args.realtime)
+    else:
+        print(f"{args.users} users for {args.duration:.0f}s against {args.url} "
+              f"(think {args.think}s, writes {args.writes:.0%})")
+        meta = run_scenario(args, results)
+        meta.update(mode='scenario', users=args.users, duration=args.duration,
+                    think=args.think, writes=args.writes, seed=args.seed)
+    wall = time.monotonic() - started
+
+    rows = summarize(results, wall)
+    total = sum(r['count'] for r in rows)
+    totals = {
+        'requests': total,
+        'wall_seconds': round(wall, 2),
+        'throughput_rps': round(total / wall, 2),
+        'errors': sum(r['errors'] for r in rows),
+        'lock_errors': sum(r['lock_errors'] for r in rows),
+        'connection_errors': sum(r['connection_errors'] for r in rows),
+    }
+
+    print(f"\n{'endpoint':<44} {'count':>6} {'rps':>7} {'err':>5} {'lock':>5} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for r in rows:
+        print(f"{r['endpoint'][:44]:<44} {r['count']:>6} {r['rps']:>7.1f} {r['errors']:>5} {r['lock_errors']:>5} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+    print(f"\n{total:,} requests in {wall:.1f}s = {totals['throughput_rps']:.1f} req/s, "
+          f"{totals['errors']} errors, {totals['lock_errors']} SQLite lock errors, "
+          f"{totals['connection_errors']} connection errors")
+    if meta.get('round_changes'):
+        print(f"{meta['round_changes']} round changes triggered a dashboard refetch in every user")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': {**meta, 'url': args.url,
+                                'timestamp': datetime.now().isoformat(timespec='seconds')},
+                       'totals': totals, 'endpoints': rows}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 1 if totals['connection_errors'] == total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the simulation and persistence hot paths.
+
+Builds (once, then reuses) a league at the chosen scale with
+generate_league.py and times:
+    simulation   GameExtrapolator._generate_all_quarters,
+                 GameExtrapolator._generate_team_player_stats,
+                 PlayByPlayGenerator.generate_play_by_play
+    tournament   TournamentManager.create_tournament_bracket,
+                 create_next_round, reset_tournament
+    endpoints    the main read endpoints through Flask's test client,
+                 cold (read cache cleared) and warm
+
+Writes run against the benchmark database inside transactions that are
+rolled back, so every run measures the same data.
+
+Scales:
+    small    1,000 games
+    medium   100,000 games
+    large    1,000,000 games
+
+Usage:
+    python benchmarks/run_suite.py [--scale small] [--seed 42] [--repeat N]
+                                   [--only PATTERN] [--output results.json]
+
+Results are written as JSON (default benchmarks/results/<scale>-<timestamp>.json)
+with the scale, seed, git commit and environment, so runs can be compared.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from _setup import BACKEND_DIR, seed_league
+
+SCALES = {
+    'small': 1_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+# Timed repetitions per benchmark when --repeat is not given
+DEFAULT_REPEAT = {'small': 20, 'medium': 5, 'large': 3}
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+ENDPOINTS = [
+    '/api/games',
+    '/api/games/history?limit=50',
+    '/api/games/{game_id}',
+    '/api/games/{game_id}/playbyplay',
+    '/api/tournament/overview',
+    '/api/tournament/active-series',
+    '/api/stats/leaders',
+    '/api/stats/leaders?season=all',
+    '/api/stats/input-performance',
+    '/api/runs',
+    '/api/dashboard',
+    '/api/teams',
+    '/api/free-agents',
+]
+
+
+def summarize(name, group, samples_ms, ops_per_sample=1):
+    per_op = sorted(s / ops_per_sample for s in samples_ms)
+    return {
+        'name': name,
+        'group': group,
+        'samples': len(per_op),
+        'ops_per_sample': ops_per_sample,
+        'min_ms': round(per_op[0], 4),
+        'median_ms': round(statistics.median(per_op), 4),
+        'mean_ms': round(statistics.fmean(per_op), 4),
+        'p95_ms': round(per_op[min(len(per_op) - 1, int(len(per_op) * 0.95))], 4),
+        'max_ms': round(per_op[-1], 4),
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def prepare_database(scale, seed):
+    """chdir into the cached league for (scale, seed), building it first if needed."""
+    path = os.path.join(DATA_DIR, f"{scale}-seed{seed}")
+    ready = os.path.join(path, '.ready')
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    if os.path.exists(ready):
+        return False
+
+    for stale in ('basketball_sim.db', 'basketball_sim.db-journal'):
+        if os.path.exists(stale):
+            os.remove(stale)
+    print(f"Building {scale} league ({SCALES[scale]:,} games, seed {seed}) in {path} ...")
+    start = time.perf_counter()
+    random.seed(seed)
+    seed_league()
+    from generate_league import LeagueGenerator
+    LeagueGenerator(seed=seed).generate(games=SCALES[scale])
+
+    from startup import initialize_database
+    initialize_database()
+    # Play round 1 of the active bracket so the tournament and play-by-play paths have data
+    from app import create_app
+    client = create_app().test_client()
+    from _setup import simulate_games
+    simulate_games(client, 64, seed=seed)
+
+    open(ready, 'w').close()
+    print(f"Built in {time.perf_counter() - start:.0f}s")
+    return True
+
+
+def bench_simulation(repeat):
+    from models import get_session, Game, Team
+    from sqlalchemy.orm import selectinload
+    from game_extrapolator import GameExtrapolator
+    from play_by_play_generator import PlayByPlayGenerator
+
+    results = []
+    session = get_session()
+    extrapolator = GameExtrapolator(session=session, autocommit=False)
+    pbp = PlayByPlayGenerator(session=session, autocommit=False)
+    try:
+        calls = 1000
+        samples = [timed(lambda: [extrapolator._generate_all_quarters(26 / 12, 22 / 12, 2, 26, 22)
+                                  for _ in range(calls)]) for _ in range(repeat)]
+        results.append(summarize('GameExtrapolator._generate_all_quarters', 'simulation', samples, calls))
+
+        game = session.query(Game).filter(Game.series_id.isnot(None)).order_by(Game.id.desc()).first()
+        team = session.query(Team).options(selectinload(Team.players)).filter_by(id=game.home_team_id).one()
+        calls = 50
+        samples = [timed(lambda: [extrapolator._generate_team_player_stats(
+            game, team, game.home_team_score, game.away_team_score, is_home=True
+        ) for _ in range(calls)]) for _ in range(repeat)]
+        results.append(summarize('GameExtrapolator._generate_team_player_stats', 'simulation', samples, calls))
+        session.rollback()
+
+        samples = []
+        for _ in range(repeat):
+            game = session.query(Game).filter(Game.series_id.isnot(None)).order_by(Game.id.desc()).first()
+            samples.append(timed(lambda: pbp.generate_play_by_play(game)))
+            session.rollback()
+        results.append(summarize('PlayByPlayGenerator.generate_play_by_play', 'simulation', samples))
+    finally:
+        session.rollback()
+        session.close()
+    return results
+
+
+def bench_tournament(repeat):
+    from models import get_session, Run, Series
+    from tournament_manager import TournamentManager
+
+    def in_rollback(setup, action):
+        """Time action() after setup(), both in one transaction that is then discarded."""
+        session = get_session()
+        manager = TournamentManager(session=session, autocommit=False)
+        try:
+            state = setup(session, manager)
+            return timed(lambda: action(manager, state))
+        finally:
+            session.rollback()
+            session.close()
+
+    def new_run(session, manager):
+        run = Run(name='Benchmark', year=datetime.now().year, is_active=False)
+        session.add(run)
+        session.flush()
+        return run.id
+
+    def completed_round1(session, manager):
+        run_id = new_run(session, manager)
+        manager.create_tournament_bracket(run_id=run_id)
+        for series in session.query(Series).filter_by(run_id=run_id, tournament_round=1):
+            series.team1_wins, series.is_completed, series.winner_team_id = 4, True, series.team1_id
+        session.flush()
+        return run_id
+
+    def active_run(session, manager):
+        return session.query(Run).filter_by(is_active=True).one().id
+
+    results = []
+    cases = [
+        ('TournamentManager.create_tournament_bracket', new_run,
+         lambda m, run_id: m.create_tournament_bracket(run_id=run_id)),
+        ('TournamentManager.create_next_round', completed_round1,
+         lambda m, run_id: m.create_next_round(1, run_id=run_id)),
+        ('TournamentManager.reset_tournament', active_run,
+         lambda m, run_id: m.reset_tournament(run_id=run_id)),
+    ]
+    for name, setup, action in cases:
+        samples = [in_rollback(setup, action) for _ in range(repeat)]
+        results.append(summarize(name, 'tournament', samples))
+    return results
+
+
+def bench_endpoints(repeat, only):
+    from app import create_app
+    from cache import read_cache
+
+    client = create_app().test_client()
+    game_id = client.get('/api/games/history?limit=1').get_json()[0]['id']
+
+    results = []
+    for template in ENDPOINTS:
+        path = template.format(game_id=game_id)
+        if only and not fnmatch.fnmatch(f"GET {path}", only):
+            continue
+        for mode in ('cold', 'warm'):
+            samples = []
+            for _ in range(repeat):
+                if mode == 'cold':
+                    read_cache.clear()
+                start = time.perf_counter()
+                response = client.get(path, headers={'Accept-Encoding': 'identity'})
+                samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise SystemExit(f"GET {path} returned {response.status_code}")
+            row = summarize(f"GET {path} ({mode})", 'endpoints', samples)
+            row['response_bytes'] = len(response.data)
+            results.append(row)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, help='timed repetitions per benchmark (default depends on scale)')
+    parser.add_argument('--only', help="fnmatch pattern on benchmark names, e.g. 'GET /api/games*'")
+    parser.add_argument('--output', help='where to write the JSON results')
+    args = parser.parse_args()
+
+    repeat = args.repeat or DEFAULT_REPEAT[args.scale]
+    built = prepare_database(args.scale, args.seed)
+    random.seed(args.seed)
+
+    results = []
+    for group in (bench_simulation, bench_tournament):
+        for row in group(repeat):
+            if not args.only or fnmatch.fnmatch(row['name'], args.only):
+                results.append(row)
+    results += bench_endpoints(repeat, args.only)
+
+    report = {
+        'meta': {
+            'scale': args.scale,
+            'games': SCALES[args.scale],
+            'seed': args.seed,
+            'repeat': repeat,
+            'database_built': built,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{args.scale}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'benchmark':<62} {'median ms':>10} {'p95 ms':>10}")
+    for row in results:
+        print(f"{row['name']:<62} {row['median_ms']:>10.3f} {row['p95_ms']:>10.3f}")
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import threading
+from sqlalchemy.dialects.sqlite import insert
+from models import DataVersion
+
+# Version namespaces bumped by writers. Each cached value declares which of
+# these it depends on and is rebuilt when any of them changes.
+RUNS = 'runs'        # runs created/activated/completed
+BRACKET = 'bracket'  # series created, scored, advanced or reset
+GAMES = 'games'      # games (and their stats/play-by-play) created or deleted
+ROSTERS = 'rosters'  # players signed, released or traded
+TEAMS = 'teams'      # team rows added or edited
+
+
+def get_versions(session):
+    """Return {namespace: version} for every namespace, in one query."""
+    return {name: version for name, version in session.query(DataVersion.name, DataVersion.version)}
+
+
+def bump_versions(session, *names):
+    """
+    Increment the given namespaces inside the caller's transaction, so the
+    new version becomes visible to every worker together with the write.
+    """
+    for name in set(names):
+        stmt = insert(DataVersion).values(name=name, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DataVersion.name],
+            set_={'version': DataVersion.version + 1}
+        )
+        session.execute(stmt)
+
+
+class VersionedCache:
+    """
+    Process-local cache whose entries are tagged with the data versions they
+    were built from. Versions live in the database, so a write made by any
+    gunicorn worker invalidates the matching entries in every worker.
+
+    Cached values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, versions, depends_on, builder):
+        """
+        Return the cached value for key, calling builder() to (re)build it
+        when the versions of depends_on have moved since it was stored.
+        """
+        tag = tuple(versions.get(name, 0) for name in depends_on)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == tag:
+            return entry[1]
+
+        value = builder()
+        with self._lock:
+            self._entries[key] = (tag, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the read endpoints and /api/dashboard
+read_cache = VersionedCache()
@@ -0,0 +1,98 @@
+import gzip
+import os
+import zlib
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/css',
+    'text/html',
+    'text/plain',
+    'image/svg+xml',
+}
+
+
+def _compress(data, encoding, app):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_BR_QUALITY'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_GZIP_LEVEL'])
+
+
+def _negotiate_encoding():
+    """Pick the best encoding the client accepts, honouring q-values."""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress_stream(chunks):
+    """
+    Compress an iterable of byte chunks on the fly, for streamed responses
+    (which the after_request hook leaves alone). Call it inside the request.
+    Returns (chunks, encoding); encoding is None when nothing was applied.
+    """
+    config = current_app.config
+    encoding = _negotiate_encoding()
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BR_QUALITY'])
+        process, finish = compressor.process, compressor.finish
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)  # 31: gzip container
+        process, finish = compressor.compress, compressor.flush
+    else:
+        return chunks, None
+
+    def generate():
+        for chunk in chunks:
+            data = process(chunk)
+            if data:
+                yield data
+        yield finish()
+
+    return generate(), encoding
+
+
+def init_compression(app):
+    """
+    Register an after_request hook that compresses large responses with
+    brotli or gzip, depending on the client's Accept-Encoding header.
+
+    Config (each falls back to an environment variable of the same name):
+        COMPRESS_MIN_SIZE: smallest body, in bytes, worth compressing
+        COMPRESS_GZIP_LEVEL: gzip compression level (1-9)
+        COMPRESS_BR_QUALITY: brotli quality (0-11)
+    """
+    app.config.setdefault('COMPRESS_MIN_SIZE', int(os.environ.get('COMPRESS_MIN_SIZE', 1024)))
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', int(os.environ.get('COMPRESS_GZIP_LEVEL', 6)))
+    app.config.setdefault('COMPRESS_BR_QUALITY', int(os.environ.get('COMPRESS_BR_QUALITY', 4)))
+
+    @app.after_request
+    def compress_response(response):
+        # Streamed and file responses are left alone; they are sent as-is
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if not 200 <= response.status_code < 300 or 'Content-Encoding' in response.headers:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        encoding = _negotiate_encoding()
+        if not encoding:
+            return response
+
+        response.set_data(_compress(data, encoding, app))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return app
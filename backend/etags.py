@@ -0,0 +1,32 @@
+import hashlib
+from flask import request
+
+ETAG_MIMETYPES = {'application/json'}
+
+
+def init_etags(app):
+    """
+    Register an after_request hook that tags GET JSON responses with an ETag
+    (a hash of the body) and answers If-None-Match with 304 Not Modified, so
+    clients holding the current data skip the download.
+
+    Register it after init_compression: hooks run in reverse order, so the
+    hash is taken over the uncompressed body and is the same for every
+    Content-Encoding. The ETag is weak for the same reason.
+    """
+    @app.after_request
+    def conditional_response(response):
+        if request.method != 'GET' or response.status_code != 200:
+            return response
+        # Streamed and file responses are left alone; they are sent as-is
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if response.mimetype not in ETAG_MIMETYPES or 'ETag' in response.headers:
+            return response
+
+        response.set_etag(hashlib.blake2b(response.get_data(), digest_size=12).hexdigest(), weak=True)
+        # Stored, but checked with the server before every reuse
+        response.headers.setdefault('Cache-Control', 'no-cache')
+        return response.make_conditional(request)
+
+    return app
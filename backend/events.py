@@ -0,0 +1,81 @@
+"""
+Change feed for the UI.
+
+Writers call publish() inside their own transaction, which appends a row to
+the change_events table. /api/events (routes/events.py) tails that table and
+streams new rows as Server-Sent Events. Because the log lives in SQLite,
+events written by one gunicorn worker reach clients connected to any other.
+
+Event kinds and payloads:
+    game_created      id, date, home_team, away_team, home_team_id, away_team_id,
+                      final_score, series_id (same shape as a /api/games row)
+    game_deleted      id, series_id
+    series_updated    id, round, team1_wins, team2_wins, score, is_completed,
+                      winner_team_id
+    round_advanced    run_id, round, series_ids
+    run_completed     run_id, champion_team_id
+    tournament_reset  run_id
+    roster_move       player_id, move (sign/release/trade), from_team_id, to_team_id
+"""
+import os
+from datetime import datetime, timedelta
+from models import ChangeEvent
+
+# Events older than this are pruned; clients that fall further behind refetch
+EVENT_RETENTION_HOURS = int(os.environ.get('EVENT_RETENTION_HOURS', 24))
+PRUNE_EVERY = 500
+
+_published = 0
+
+
+def publish(session, kind, **payload):
+    """Queue a change event on the caller's session; it is sent once committed."""
+    global _published
+    session.add(ChangeEvent(kind=kind, payload=payload))
+
+    _published += 1
+    if _published % PRUNE_EVERY == 0:
+        prune_events(session)
+
+
+def events_since(session, last_id, limit=200):
+    """Return up to limit events with an id greater than last_id, oldest first."""
+    return session.query(ChangeEvent).filter(ChangeEvent.id > last_id)\
+                  .order_by(ChangeEvent.id).limit(limit).all()
+
+
+def latest_event_id(session):
+    last = session.query(ChangeEvent.id).order_by(ChangeEvent.id.desc()).first()
+    return last[0] if last else 0
+
+
+def prune_events(session, hours=EVENT_RETENTION_HOURS):
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    session.query(ChangeEvent).filter(ChangeEvent.created_at < cutoff).delete(synchronize_session=False)
+
+
+def game_row(game, teams):
+    """Payload for game_created, matching the rows of /api/games; teams is the team directory (queries.py)."""
+    return {
+        'id': game.id,
+        'date': game.game_date.isoformat() if game.game_date else None,
+        'home_team': teams[game.home_team_id]['full_name'],
+        'away_team': teams[game.away_team_id]['full_name'],
+        'home_team_id': game.home_team_id,
+        'away_team_id': game.away_team_id,
+        'final_score': f"{game.home_team_score} - {game.away_team_score}",
+        'series_id': game.series_id
+    }
+
+
+def series_row(series):
+    """Payload for series_updated."""
+    return {
+        'id': series.id,
+        'round': series.tournament_round,
+        'team1_wins': series.team1_wins,
+        'team2_wins': series.team2_wins,
+        'score': f"{series.team1_wins} - {series.team2_wins}",
+        'is_completed': series.is_completed,
+        'winner_team_id': series.winner_team_id
+    }
@@ -0,0 +1,238 @@
+"""
+Streamed database exports for /api/backup/export (routes/backup.py).
+
+Version 1 is the original single JSON document: teams, players, runs, series
+and games with a fixed set of columns (no box scores or play-by-play).
+
+Version 2 is the full-fidelity format, a .ndjson.gz file that holds every
+column of every league table. It is a concatenation of gzip members, so
+`gunzip` gives plain NDJSON, and each section can also be decompressed and
+checked on its own:
+
+    {"type": "header", "version": 2, "export_date": ..., "run_id": null,
+     "since": null, "watermark": 1234, "tables": [...]}
+    {"__section__": "teams", "columns": [...]}                  one gzip member
+    {"id": 1, "name": "Celtics", ...}                           per section,
+    ...                                                         rows follow
+    {"__section__": "players", "columns": [...]}                their header
+    ...
+    {"__manifest__": {"teams": {"rows": 33, "sha256": ...}, ...}}
+
+Section and manifest lines are told apart from rows by their key
+(SECTION_KEY, MANIFEST_KEY), which no table has as a column. A section's
+sha256 covers its row lines exactly as written (excluding the section line). With run_id, only that run and its series, games, box scores
+and play-by-play are exported, plus all teams and players they refer to.
+
+Incremental backups: the header of a whole-database export carries a
+watermark, the position in the row_changes log (models.RowChange) when the
+export started. An export with since=<watermark> holds only the rows
+changed after it (with the whole box score and play-by-play of every changed
+game), then a "deleted" section of {"table": ..., "id": ...} rows, and a new
+watermark to pass next time. The watermark is taken before the first row is read, so a
+change made during an export may be sent again by the next one; replaying
+it is harmless (restore.py applies rows by id).
+
+Both versions read each table in keyset pages (id > last id), so memory stays
+flat and a slow download never holds SQLite's read lock for long. Paging
+stops at each table's highest id when the export started (export_bounds), so
+rows added during the export are left out of every table alike: a game
+created halfway through can't have its box scores exported without it.
+"""
+import hashlib
+import zlib
+from datetime import datetime
+from sqlalchemy import select, func, or_, Date, DateTime
+from models import Team, Player, Run, Series, Game, PlayerGameStats, PlayByPlay, RowChange
+
+# Rows fetched per query
+EXPORT_PAGE_SIZE = 1000
+GZIP_LEVEL = 6
+
+# Version 1: exported columns per table, in dependency order
+V1_TABLES = (
+    ('teams', Team, ('id', 'name', 'city', 'abbreviation', 'conference', 'division', 'team_type')),
+    ('players', Player, ('id', 'name', 'team_id', 'position', 'jersey_number', 'height', 'weight',
+                         'ppg', 'rpg', 'apg', 'spg', 'bpg', 'fg_pct', 'three_pt_pct', 'ft_pct', 'mpg')),
+    ('runs', Run, ('id', 'name', 'year', 'created_at', 'is_active', 'is_completed', 'champion_team_id')),
+    ('series', Series, ('id', 'tournament_round', 'series_number', 'conference', 'team1_id', 'team2_id',
+                        'team1_wins', 'team2_wins', 'winner_team_id', 'is_completed', 'run_id')),
+    ('games', Game, ('id', 'game_date', 'home_team_id', 'away_team_id', 'series_id',
+                     'game_number_in_series', 'run_id', 'home_team_score', 'away_team_score',
+                     'home_q1', 'home_q2', 'home_q3', 'home_q4', 'away_q1', 'away_q2', 'away_q3', 'away_q4',
+                     'input_quarter_number', 'input_home_score', 'input_away_score', 'is_completed')),
+)
+
+# Version 2: every column of these tables, in dependency order
+V2_MODELS = (Team, Player, Run, Series, Game, PlayerGameStats, PlayByPlay)
+# Keys of the v2 section and manifest lines; never a column name
+SECTION_KEY = '__section__'
+MANIFEST_KEY = '__manifest__'
+
+
+def table_columns(model):
+    return tuple(c.name for c in model.__table__.columns)
+
+
+def iter_pages(session, model, columns, where=None, max_id=None, page_size=EXPORT_PAGE_SIZE):
+    """
+    Yield a table's rows as lists of dicts, one keyset page at a time, up to
+    max_id. Changes to those rows committed while the export runs may or may
+    not be included.
+    """
+    selected = [getattr(model, c) for c in columns]
+    # Only these need converting; checking every value costs more than the JSON encoding
+    dates = [c for c in columns if isinstance(model.__table__.c[c].type, (DateTime, Date))]
+    last_id = 0
+    while True:
+        query = select(*selected).where(model.id > last_id)
+        if where is not None:
+            query = query.where(where)
+        if max_id is not None:
+            query = query.where(model.id <= max_id)
+        # Core execution: plain tuples, without the ORM's per-row processing
+        page = session.connection().execute(query.order_by(model.id).limit(page_size)).all()
+        # End the read between pages so writers are never blocked for long
+        session.rollback()
+        if not page:
+            return
+        rows = [dict(zip(columns, row)) for row in page]
+        for column in dates:
+            for row in rows:
+                if row[column] is not None:
+                    row[column] = row[column].isoformat()
+        yield rows
+        last_id = page[-1].id
+
+
+def generate_v1(session, dumps):
+    """Version 1 as a stream of byte chunks, one page of rows per chunk."""
+    try:
+        _, max_ids = export_bounds(session)
+        session.rollback()
+        yield f'{{"export_date": "{datetime.utcnow().isoformat()}", "version": "1.0"'.encode()
+        for name, model, columns in V1_TABLES:
+            yield f', "{name}": ['.encode()
+            separator = ''
+            for page in iter_pages(session, model, columns, max_id=max_ids[model]):
+                yield (separator + ','.join(dumps(row) for row in page)).encode()
+                separator = ','
+            yield b']'
+        yield b'}'
+    finally:
+        session.close()
+
+
+def run_filters(run_id):
+    """Per-table WHERE clauses that limit a v2 export to one run (None: no filter)."""
+    if run_id is None:
+        return {}
+    run_games = select(Game.id).where(Game.run_id == run_id)
+    return {
+        Run: Run.id == run_id,
+        Series: Series.run_id == run_id,
+        Game: Game.run_id == run_id,
+        PlayerGameStats: PlayerGameStats.game_id.in_(run_games),
+        PlayByPlay: PlayByPlay.game_id.in_(run_games),
+    }
+
+
+def export_bounds(session):
+    """
+    (watermark, {model: highest id}) at this moment: the position of the
+    latest change in the row_changes log and each table's last row (0 when
+    empty). One statement, so SQLite reads them all from the same snapshot.
+    """
+    row = session.connection().execute(select(
+        select(func.coalesce(func.max(RowChange.seq), 0)).scalar_subquery(),
+        *(select(func.coalesce(func.max(model.id), 0)).scalar_subquery() for model in V2_MODELS)
+    )).one()
+    return row[0], dict(zip(V2_MODELS, row[1:]))
+
+
+def changed_ids(table, since, deleted=False):
+    return select(RowChange.row_id).where(
+        RowChange.table_name == table, RowChange.seq > since, RowChange.deleted == deleted
+    )
+
+
+def delta_filters(since):
+    """Per-table WHERE clauses that limit a v2 export to rows changed after since."""
+    filters = {model: model.id.in_(changed_ids(model.__tablename__, since)) for model in V2_MODELS}
+    # A changed game is sent with its whole box score and play-by-play
+    # (restore.py replaces them as a unit)
+    changed_games = changed_ids('games', since)
+    for model in (PlayerGameStats, PlayByPlay):
+        filters[model] = or_(filters[model], model.game_id.in_(changed_games))
+    return filters
+
+
+def iter_deleted(session, since, watermark, page_size=EXPORT_PAGE_SIZE):
+    """Yield pages of {"table", "id"} dicts for rows deleted after since, up to watermark."""
+    last_seq = since
+    while True:
+        page = session.connection().execute(
+            select(RowChange.table_name, RowChange.row_id, RowChange.seq)
+            .where(RowChange.seq > last_seq, RowChange.seq <= watermark, RowChange.deleted == True)
+            .order_by(RowChange.seq).limit(page_size)
+        ).all()
+        session.rollback()
+        if not page:
+            return
+        yield [{'table': row.table_name, 'id': row.row_id} for row in page]
+        last_seq = page[-1].seq
+
+
+def generate_v2(session, dumps, watermark, max_ids, run_id=None, since=None):
+    """
+    Version 2 as a stream of gzip members: header, one per table, manifest.
+    watermark and max_ids come from export_bounds(), read before calling;
+    the watermark goes in the header of whole-database exports. With since,
+    only changes after it.
+    """
+    def member(lines):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        for line in lines:
+            data = compressor.compress(line)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def line(obj):
+        return dumps(obj).encode() + b'\n'
+
+    filters = delta_filters(since) if since is not None else run_filters(run_id)
+    manifest = {}
+
+    def section(name, columns, pages):
+        stats = manifest[name] = {'rows': 0}
+        digest = hashlib.sha256()
+        yield line({SECTION_KEY: name, 'columns': list(columns)})
+        for page in pages:
+            chunk = b''.join(line(row) for row in page)
+            digest.update(chunk)
+            stats['rows'] += len(page)
+            yield chunk
+        stats['sha256'] = digest.hexdigest()
+
+    try:
+        yield from member([line({
+            'type': 'header',
+            'version': 2,
+            'export_date': datetime.utcnow().isoformat(),
+            'run_id': run_id,
+            'since': since,
+            # A single run can't be the base of an incremental backup
+            'watermark': watermark if run_id is None else None,
+            'tables': [model.__tablename__ for model in V2_MODELS],
+        })])
+
+        for model in V2_MODELS:
+            columns = table_columns(model)
+            yield from member(section(model.__tablename__, columns,
+                                      iter_pages(session, model, columns, filters.get(model), max_ids[model])))
+        if since is not None:
+            yield from member(section('deleted', ('table', 'id'), iter_deleted(session, since, watermark)))
+
+        yield from member([line({MANIFEST_KEY: manifest})])
+    finally:
+        session.close()
@@ -1,6 +1,10 @@
 import random
-import numpy as np
-from models import Game, Player, PlayerGameStats, get_session
+from sqlalchemy.orm import selectinload
+from models import Game, Player, PlayerGameStats, Series, Team, get_session
+from cache import bump_versions, get_versions, GAMES
+from events import publish, game_row
+from metrics import timed_stage
+import queries
 
 class GameExtrapolator:
     """
@@ -8,11 +12,20 @@ class GameExtrapolator:
     with realistic statistical variance.
     """
     
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None, autocommit=True):
+        self.session = session or get_session()
+        self.autocommit = autocommit
+
+    def _commit(self):
+        """Commit, or only flush when the caller owns the transaction."""
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
     
+    @timed_stage('extrapolate_game')
     def extrapolate_game(self, home_team_id, away_team_id, quarter_number, 
-                        home_quarter_score, away_quarter_score):
+                        home_quarter_score, away_quarter_score, series_id=None):
         """
         Main method to extrapolate a full game from one quarter of data.
         
@@ -22,15 +35,91 @@ class GameExtrapolator:
             quarter_number: Which quarter was played (1-4)
             home_quarter_score: Score of home team in that quarter
             away_quarter_score: Score of away team in that quarter
+            series_id: Optional playoff series the game belongs to
         
         Returns:
             Game object with full extrapolated data
         """
         
+        game = self._build_game(home_team_id, away_team_id, quarter_number,
+                                home_quarter_score, away_quarter_score, series_id)
+        
+        self.session.add(game)
+        bump_versions(self.session, GAMES)
+        self._commit()
+        
+        # Announce the game; the event is committed together with the player stats
+        publish(self.session, 'game_created', **game_row(game, self._teams()))
+        
+        # Generate player stats for this game
+        self._generate_player_stats(game)
+        
+        return game
+    
+    @timed_stage('extrapolate_games')
+    def extrapolate_games(self, game_inputs):
+        """
+        Batch version of extrapolate_game for several quarter results at once.
+        Teams and rosters are loaded once for the whole batch and everything
+        is written with a single commit (or flush, see autocommit).
+        
+        Args:
+            game_inputs: List of dicts with home_team_id, away_team_id,
+                quarter_number, home_score, away_score and optionally series_id
+        
+        Returns:
+            List of Game objects in the same order as game_inputs
+        """
+        games = [
+            self._build_game(g['home_team_id'], g['away_team_id'], g['quarter_number'],
+                             g['home_score'], g['away_score'], g.get('series_id'))
+            for g in game_inputs
+        ]
+        self.session.add_all(games)
+        bump_versions(self.session, GAMES)
+        self.session.flush()
+        
+        team_ids = {g.home_team_id for g in games} | {g.away_team_id for g in games}
+        teams = {
+            t.id: t for t in self.session.query(Team)
+            .options(selectinload(Team.players))
+            .filter(Team.id.in_(team_ids))
+        }
+        
+        directory = self._teams()
+        for game in games:
+            self._generate_team_player_stats(game, teams[game.home_team_id], game.home_team_score,
+                                             game.away_team_score, is_home=True)
+            self._generate_team_player_stats(game, teams[game.away_team_id], game.away_team_score,
+                                             game.home_team_score, is_home=False)
+            publish(self.session, 'game_created', **game_row(game, directory))
+        
+        self._commit()
+        return games
+    
+    def _teams(self):
+        """The cached team directory, for event payloads."""
+        return queries.team_directory(self.session, get_versions(self.session))
+    
+    def _run_id(self, series_id):
+        """The run a new game belongs to: its series' run, or the active run for games outside a series."""
+        if series_id:
+            series = self.session.get(Series, series_id)
+            return series.run_id if series else None
+        run = queries.get_active_run(self.session)
+        return run.id if run else None
+    
+    def _build_game(self, home_team_id, away_team_id, quarter_number,
+                    home_quarter_score, away_quarter_score, series_id=None):
+        """
+        Build an unsaved Game with all four quarters extrapolated.
+        """
         # Create the game record
         game = Game(
             home_team_id=home_team_id,
             away_team_id=away_team_id,
+            series_id=series_id,
+            run_id=self._run_id(series_id),
             input_quarter_number=quarter_number,
             input_home_score=home_quarter_score,
             input_away_score=away_quarter_score
@@ -61,12 +150,6 @@ class GameExtrapolator:
         game.away_team_score = sum(quarters_data['away'])
         game.is_completed = True
         
-        self.session.add(game)
-        self.session.commit()
-        
-        # Generate player stats for this game
-        self._generate_player_stats(game)
-        
         return game
     
     def _generate_all_quarters(self, home_base_rate, away_base_rate, 
@@ -156,12 +239,11 @@ class GameExtrapolator:
         
         return quarters
     
+    @timed_stage('generate_player_stats')
     def _generate_player_stats(self, game):
         """
         Generate realistic player statistics for all players in the game.
         """
-        from models import Team
-        
         # Get both teams
         home_team = self.session.query(Team).filter_by(id=game.home_team_id).first()
         away_team = self.session.query(Team).filter_by(id=game.away_team_id).first()
@@ -174,13 +256,25 @@ class GameExtrapolator:
         self._generate_team_player_stats(game, away_team, game.away_team_score,
                                          game.home_team_score, is_home=False)
         
-        self.session.commit()
+        # The game row was committed on its own; bump again so reads cached
+        # in between (leaders without this game's stats) are not kept
+        bump_versions(self.session, GAMES)
+        self._commit()
     
     def _generate_team_player_stats(self, game, team, team_score, opponent_score, is_home):
         """
         Generate individual player stats for a team that sum up to team totals.
         """
-        players = team.players
+        rows = self._team_player_stat_rows(game, team.id, team.players, team_score, opponent_score)
+        self.session.add_all(PlayerGameStats(**row) for row in rows)
+    
+    def _team_player_stat_rows(self, game, team_id, players, team_score, opponent_score):
+        """
+        Build one team's box score as PlayerGameStats column dicts. players
+        only needs the Player rating columns, and the dicts can be bulk
+        inserted as they are (see generate_league.py).
+        """
+        stats = []
         
         # Sort players by PPG (stars play more and score more)
         players_sorted = sorted(players, key=lambda p: p.ppg, reverse=True)
@@ -252,10 +346,10 @@ class GameExtrapolator:
             per = max(0, per * 10)  # Scale to typical PER range
             
             # Create player game stats
-            player_stats = PlayerGameStats(
+            player_stats = dict(
                 game_id=game.id,
                 player_id=player.id,
-                team_id=team.id,
+                team_id=team_id,
                 minutes_played=round(minutes, 1),
                 points=points,
                 rebounds=rebounds,
@@ -279,4 +373,101 @@ class GameExtrapolator:
                 per=round(per, 1)
             )
             
-            self.session.add(player_stats)
+            stats.append(player_stats)
+        
+        return stats
+
+
+# ==================== VECTORIZED ENGINE ====================
+# numpy versions of _generate_all_quarters and _team_player_stat_rows that
+# play many games per call, for Monte Carlo evaluations (trade_evaluator.py).
+# They draw from the same distributions as the methods above, which stay
+# pure Python so single games don't load numpy; after changing either, run
+# benchmarks/check_engine_parity.py, which fails when the two drift apart.
+# numpy is imported where it is used, so importing the app doesn't load it
+# in every worker.
+
+NBA_AVG_RATE = 27.5 / 12
+# Extra per-quarter variance (low, high), as in _generate_all_quarters
+QUARTER_VARIANCE = ((0.92, 1.05), (0.95, 1.10), (1.00, 1.15), (0.90, 1.20))
+ROTATION_MIN, ROTATION_MAX = 8, 10
+STRENGTH_PLAYERS = 8
+
+
+def team_strength(ppgs):
+    """Roster strength used to pick winners: the sum of the top 8 scorers' PPG."""
+    return sum(sorted(ppgs, reverse=True)[:STRENGTH_PLAYERS]) or 1.0
+
+
+def win_probability(strength, opponent_strength):
+    """Chance that a team beats an opponent, from their strengths (scalars or arrays)."""
+    import numpy as np
+    p = 0.5 + (strength - opponent_strength) / (2 * (strength + opponent_strength))
+    return np.clip(p, 0.2, 0.8)
+
+
+def extrapolate_quarters_batch(rng, quarter_number, home_input, away_input):
+    """
+    Extrapolate many games at once. Takes arrays with one input quarter per
+    game and returns (home, away) quarter scores as (games, 4) int arrays.
+    """
+    import numpy as np
+    quarter_number, home_input, away_input = (np.asarray(a) for a in (quarter_number, home_input, away_input))
+    games = len(quarter_number)
+    rows = np.arange(games)
+    # Strong regression to the league average after a blowout quarter
+    weight = np.where(np.abs(home_input - away_input) > 10, 0.4, 0.7)
+    low, high = np.array(QUARTER_VARIANCE).T
+
+    quarters = []
+    for inputs in (home_input, away_input):
+        rate = inputs / 12 * weight + NBA_AVG_RATE * (1 - weight)
+        variance = rng.uniform(0.85, 1.15, (games, 4)) * rng.uniform(low, high, (games, 4))
+        scores = np.clip((rate[:, None] * 12 * variance).astype(np.int64), 18, 35)
+        scores[rows, quarter_number - 1] = inputs
+        quarters.append(scores)
+    home, away = quarters
+
+    # The team that won the input quarter wins the game
+    home_total, away_total = home.sum(axis=1), away.sum(axis=1)
+    home_should_win = home_input > away_input
+    margin = rng.integers(3, 9, games)
+    home[:, 3] += np.where(home_should_win & (home_total <= away_total), away_total - home_total + margin, 0)
+    away[:, 3] += np.where(~home_should_win & (away_total <= home_total), home_total - away_total + margin, 0)
+    return home, away
+
+
+def box_score_batch(rng, ratings, team_score):
+    """
+    One roster's box scores over many games. ratings maps ppg, rpg, apg, spg,
+    bpg and mpg to arrays for the roster sorted by PPG (best first);
+    team_score has one score per game. Returns {stat: (games, players) array}
+    for points, rebounds, assists, steals, blocks and minutes, zero for
+    players outside that game's rotation.
+    """
+    import numpy as np
+    team_score = np.asarray(team_score)
+    games, size = len(team_score), len(ratings['ppg'])
+    ppg = ratings['ppg'][:ROTATION_MAX]
+    used = len(ppg)
+
+    def draw(low, high):
+        # Always ROTATION_MAX wide, so runs with different rosters share their draws
+        return rng.uniform(low, high, (games, ROTATION_MAX))[:, :used]
+
+    rotation = rng.integers(ROTATION_MIN, ROTATION_MAX + 1, games)
+    played = np.arange(used) < rotation[:, None]
+    total_ppg = (ppg * played).sum(axis=1, keepdims=True)
+    share = np.where(total_ppg > 0, ppg / np.where(total_ppg > 0, total_ppg, 1), 1 / rotation[:, None])
+    share = share * draw(0.7, 1.3)
+
+    stats = {
+        'points': (team_score[:, None] * share).astype(np.int64),
+        'minutes': np.minimum(48, ratings['mpg'][:used] * draw(0.85, 1.15)),
+        'rebounds': (ratings['rpg'][:used] * draw(0.7, 1.3)).astype(np.int64),
+        'assists': (ratings['apg'][:used] * draw(0.7, 1.3)).astype(np.int64),
+        'steals': (ratings['spg'][:used] * draw(0.5, 1.5)).astype(np.int64),
+        'blocks': (ratings['bpg'][:used] * draw(0.5, 1.5)).astype(np.int64),
+    }
+    padding = ((0, 0), (0, size - used))
+    return {name: np.pad(np.where(played, values, 0), padding) for name, values in stats.items()}
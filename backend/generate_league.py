@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Generate a large synthetic league history for scale testing and profiling.
+
+Adds completed runs (seasons) to basketball_sim.db in the current directory.
+Each run has a full 5-round bracket, and every series is played out game by
+game: quarter scores come from the real extrapolator, box scores from the
+real player stats generator and play-by-play from the real play-by-play
+generator. Rows are bulk-inserted with executemany instead of going through
+the ORM session, so a million games load in minutes.
+
+Play-by-play is ~100 rows per game, so by default it is only generated for
+the games of the last run (--pbp latest); use --pbp all for small leagues.
+
+The same --seed always produces the same league.
+
+Usage:
+    python generate_league.py [--games 100000 | --runs 500] [--seed 42]
+                              [--pbp latest|all|none] [--fresh]
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import insert, func
+from models import Run, Team, Player, Series, Game, PlayerGameStats, PlayByPlay, get_engine, get_session, session_scope, ensure_schema
+from game_extrapolator import GameExtrapolator, team_strength, win_probability
+from play_by_play_generator import PlayByPlayGenerator
+from cache import bump_versions, RUNS, BRACKET, GAMES
+
+DB_PATH = 'basketball_sim.db'
+ROUNDS = 5
+CHUNK_GAMES = 20000  # games buffered before each bulk insert
+
+PLAY_COLUMNS = [c.name for c in PlayByPlay.__table__.columns if c.name != 'id']
+
+# Home court in a best-of-7: team1 hosts games 1, 2, 5 and 7
+TEAM1_HOME_GAMES = {1, 2, 5, 7}
+
+
+class LeagueGenerator:
+    def __init__(self, seed=42, pbp='latest'):
+        self.seed = seed
+        self.pbp = pbp
+        # The simulators draw from the module-level RNG, so seed that
+        random.seed(seed)
+
+        session = get_session()
+        self.extrapolator = GameExtrapolator(session=session, autocommit=False)
+        self.pbp_generator = PlayByPlayGenerator(session=session, autocommit=False)
+
+        teams = session.query(Team).filter(Team.conference.in_(['East', 'West'])).order_by(Team.id).all()
+        self.east = [t.id for t in teams if t.conference == 'East']
+        self.west = [t.id for t in teams if t.conference == 'West']
+        if len(self.east) < 16 or len(self.west) < 16:
+            raise SystemExit("Need 16 East and 16 West teams; run seed_data.py first")
+
+        self.rosters = {t.id: [] for t in teams}
+        self.player_names = {}
+        for player in session.query(Player).filter(Player.team_id.in_(list(self.rosters))).order_by(Player.id):
+            self.rosters[player.team_id].append(player)
+            self.player_names[player.id] = SimpleNamespace(name=player.name)
+        # Strength decides who wins each game: sum of the top 8 scorers' PPG
+        self.strength = {
+            team_id: team_strength(p.ppg for p in players)
+            for team_id, players in self.rosters.items()
+        }
+        session.close()
+
+        conn = get_engine().connect()
+        self.next_id = {
+            table: (conn.execute(func.max(model.id).select()).scalar() or 0) + 1
+            for table, model in (('runs', Run), ('series', Series), ('games', Game))
+        }
+        conn.close()
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        self.buffers = {'runs': [], 'series': [], 'games': [], 'stats': [], 'plays': []}
+
+    def _take_id(self, table):
+        value = self.next_id[table]
+        self.next_id[table] += 1
+        return value
+
+    # ---- simulation -------------------------------------------------------
+
+    def _play_game(self, run_id, series_id, game_number, home_id, away_id, home_wins, game_date, with_pbp):
+        quarter = random.randint(1, 4)
+        winner_score, loser_score = random.randint(24, 36), random.randint(16, 30)
+        if loser_score >= winner_score:
+            loser_score = winner_score - random.randint(1, 6)
+        home_input, away_input = (winner_score, loser_score) if home_wins else (loser_score, winner_score)
+
+        quarters = self.extrapolator._generate_all_quarters(
+            home_input / 12, away_input / 12, quarter, home_input, away_input
+        )
+        game = SimpleNamespace(
+            id=self._take_id('games'), game_date=game_date,
+            home_team_id=home_id, away_team_id=away_id,
+            series_id=series_id, game_number_in_series=game_number, run_id=run_id,
+            home_team_score=sum(quarters['home']), away_team_score=sum(quarters['away']),
+            home_q1=quarters['home'][0], home_q2=quarters['home'][1],
+            home_q3=quarters['home'][2], home_q4=quarters['home'][3],
+            away_q1=quarters['away'][0], away_q2=quarters['away'][1],
+            away_q3=quarters['away'][2], away_q4=quarters['away'][3],
+            input_quarter_number=quarter, input_home_score=home_input,
+            input_away_score=away_input, is_completed=True
+        )
+        self.buffers['games'].append(vars(game).copy())
+
+        box_scores = []
+        for team_id, score, opponent in ((home_id, game.home_team_score, game.away_team_score),
+                                         (away_id, game.away_team_score, game.home_team_score)):
+            stats = self.extrapolator._team_player_stat_rows(game, team_id, self.rosters[team_id], score, opponent)
+            self.buffers['stats'].extend(stats)
+            box_scores.append(stats)
+
+        if with_pbp:
+            home_stats, away_stats = (
+                [SimpleNamespace(player_id=s['player_id'], minutes_played=s['minutes_played'],
+                                 player=self.player_names[s['player_id']]) for s in stats]
+                for stats in box_scores
+            )
+            plays = self.pbp_generator._build_plays(game, home_stats, away_stats)
+            self.buffers['plays'].extend({c: getattr(p, c) for c in PLAY_COLUMNS} for p in plays)
+
+        return game.home_team_score > game.away_team_score
+
+    def _play_series(self, run_id, round_number, series_number, conference, team1, team2, game_date, with_pbp):
+        series_id = self._take_id('series')
+        wins = {team1: 0, team2: 0}
+        # Stronger rosters win more often, but any game can go either way
+        p_team1 = win_probability(self.strength[team1], self.strength[team2])
+
+        game_number = 0
+        while max(wins.values()) < 4:
+            game_number += 1
+            team1_home = game_number in TEAM1_HOME_GAMES
+            home, away = (team1, team2) if team1_home else (team2, team1)
+            team1_wins_game = random.random() < p_team1
+            home_wins = team1_wins_game == team1_home
+            game_date += timedelta(days=1)
+            self._play_game(run_id, series_id, game_number, home, away, home_wins, game_date, with_pbp)
+            wins[team1 if team1_wins_game else team2] += 1
+
+        winner = team1 if wins[team1] == 4 else team2
+        self.buffers['series'].append({
+            'id': series_id, 'tournament_round': round_number, 'series_number': series_number,
+            'conference': conference, 'team1_id': team1, 'team2_id': team2,
+            'team1_wins': wins[team1], 'team2_wins': wins[team2],
+            'winner_team_id': winner, 'is_completed': True, 'run_id': run_id
+        })
+        return winner, game_number
+
+    def play_run(self, year, with_pbp):
+        """Play one full season bracket; returns the number of games played."""
+        run_id = self._take_id('runs')
+        game_date = datetime(year, 4, 15)
+        played = 0
+
+        # Same bracket rules as TournamentManager: 8 East and 8 West round 1
+        # series, winners re-paired at random within their conference, then
+        # East champion vs West champion in the Finals
+        east, west = self.east[:], self.west[:]
+        random.shuffle(east)
+        random.shuffle(west)
+        for round_number in range(1, ROUNDS + 1):
+            if round_number == ROUNDS:
+                matchups = [(None, east[0], west[0])]
+            else:
+                matchups = [('East', east[i], east[i + 1]) for i in range(0, len(east), 2)]
+                matchups += [('West', west[i], west[i + 1]) for i in range(0, len(west), 2)]
+
+            winners = {'East': [], 'West': [], None: []}
+            for number, (conference, team1, team2) in enumerate(matchups, start=1):
+                winner, games = self._play_series(run_id, round_number, number, conference,
+                                                  team1, team2, game_date, with_pbp)
+                winners[conference].append(winner)
+                played += games
+            game_date += timedelta(days=8)
+            east, west = winners['East'], winners['West']
+            random.shuffle(east)
+            random.shuffle(west)
+
+        self.buffers['runs'].append({
+            'id': run_id, 'name': f"Season {year}", 'year': year,
+            'created_at': datetime(year, 4, 1), 'is_active': False, 'is_completed': True,
+            'champion_team_id': winners[None][0]
+        })
+        return played
+
+    # ---- persistence ------------------------------------------------------
+
+    def flush(self):
+        """Bulk-insert everything buffered so far in one transaction."""
+        with get_engine().begin() as conn:
+            conn.exec_driver_sql('PRAGMA synchronous=OFF')
+            for table, model in (('runs', Run), ('series', Series), ('games', Game),
+                                 ('stats', PlayerGameStats), ('plays', PlayByPlay)):
+                if self.buffers[table]:
+                    conn.execute(insert(model.__table__), self.buffers[table])
+        self._reset_buffers()
+
+    def generate(self, games=None, runs=None):
+        """Play runs until `runs` seasons or at least `games` games were generated."""
+        # ~180 games per run; needed up front to know which run is the last one
+        if runs is None:
+            runs = max(1, -(-games // 180))
+        first_year = datetime.now().year - runs
+        total = 0
+        start = time.perf_counter()
+        buffered = 0
+
+        for index in range(runs):
+            last = index == runs - 1
+            with_pbp = self.pbp == 'all' or (self.pbp == 'latest' and last)
+            played = self.play_run(first_year + index, with_pbp)
+            total += played
+            buffered += played
+            if buffered >= CHUNK_GAMES or last:
+                self.flush()
+                buffered = 0
+                rate = total / (time.perf_counter() - start)
+                print(f"  {index + 1:,}/{runs:,} runs, {total:,} games ({rate:,.0f} games/s)")
+
+        with session_scope() as session:
+            bump_versions(session, RUNS, BRACKET, GAMES)
+        return runs, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    scale = parser.add_mutually_exclusive_group()
+    scale.add_argument('--games', type=int, default=10000, help='approximate number of games (default 10000)')
+    scale.add_argument('--runs', type=int, help='number of seasons to generate instead of --games')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default 42)')
+    parser.add_argument('--pbp', choices=['latest', 'all', 'none'], default='latest',
+                        help='which games get play-by-play (default: the last run)')
+    parser.add_argument('--fresh', action='store_true', help='delete basketball_sim.db and reseed teams first')
+    args = parser.parse_args()
+
+    if args.fresh and os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    ensure_schema(DB_PATH)
+    with session_scope() as session:
+        has_teams = session.query(Team).count() > 0
+    if not has_teams:
+        print("🏀 No teams found, seeding league...")
+        from seed_data import seed_teams_and_players
+        from add_free_agents import add_free_agents
+        seed_teams_and_players(seed=args.seed)
+        add_free_agents(seed=args.seed)
+
+    print(f"🏀 Generating {'%d runs' % args.runs if args.runs else '~%d games' % args.games} (seed {args.seed}, play-by-play: {args.pbp})")
+    start = time.perf_counter()
+    runs, games = LeagueGenerator(seed=args.seed, pbp=args.pbp).generate(games=args.games, runs=args.runs)
+    print(f"✓ Added {runs:,} runs and {games:,} games in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
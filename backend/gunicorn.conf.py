@@ -0,0 +1,62 @@
+"""
+Gunicorn settings, loaded automatically from the backend directory
+(or explicitly with `gunicorn -c gunicorn.conf.py 'app:create_app()'`).
+"""
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+# Threaded workers: each /api/events stream holds a thread, not a whole
+# process, for up to EVENTS_STREAM_SECONDS, so open tabs can't starve the API
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Set ACCESS_LOG to a file (or '-' for stdout) to record traffic, e.g. for
+# benchmarks/load_test.py --replay
+accesslog = os.environ.get('ACCESS_LOG')
+
+# Workers write their Prometheus metrics here and /api/metrics sums them.
+# Must be set before any worker imports prometheus_client.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'bball_metrics')
+)
+
+# Child process taking the scheduled backups (off unless BACKUP_INTERVAL_MINUTES is set)
+backup_process = None
+
+
+def on_starting(server):
+    """Run the one-time database setup in the master, before any worker forks."""
+    # Drop metric files left over from a previous run
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    from startup import initialize_database, INITIALIZED_ENV
+    initialize_database()
+    # Inherited by the workers, which then skip the per-process check
+    os.environ[INITIALIZED_ENV] = '1'
+
+
+def when_ready(server):
+    """Start the scheduled backups (backup_scheduler.py) next to the workers, if enabled."""
+    from backup_scheduler import start_scheduler
+    global backup_process
+    backup_process = start_scheduler()
+
+
+def on_exit(server):
+    from backup_scheduler import stop_scheduler
+    stop_scheduler(backup_process)
+
+
+def post_fork(server, worker):
+    """Workers must not share SQLite connections opened in the master."""
+    from models import dispose_engines
+    dispose_engines()
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's in-progress requests."""
+    from metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,52 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson when it is installed and
+    falls back to Flask's stdlib provider otherwise.
+
+    Output matches the default provider: keys are sorted, non-string keys
+    are stringified and dates go through the same ``default`` hook.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for stdlib-only options (cls, separators, ...) get the stdlib path
+        if orjson is None or set(kwargs) - {'sort_keys', 'indent'}:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj, kwargs.get('sort_keys', self.sort_keys),
+                                  bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            self._orjson_dumps(obj, self.sort_keys, pretty),
+            mimetype=self.mimetype
+        )
+
+    def _orjson_dumps(self, obj, sort_keys, pretty):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+def fast_json_available():
+    """Return True when the orjson backend is in use."""
+    return orjson is not None
@@ -0,0 +1,246 @@
+"""
+Prometheus metrics for the API.
+
+init_metrics(app) registers request hooks that record, per route:
+    http_requests_total             method, endpoint, status
+    http_request_duration_seconds   method, endpoint (histogram)
+    http_requests_in_progress       method, endpoint
+    http_request_size_bytes         method, endpoint (histogram)
+    http_response_size_bytes        method, endpoint (histogram, bytes on the wire)
+
+and stage() / timed_stage() time the internal steps of simulating a game:
+    simulation_stage_duration_seconds   stage (histogram)
+
+Stages that run during a request are also reported back to the client in a
+Server-Timing header (e.g. "extrapolate_game;dur=41.2, total;dur=97.0") and
+in one JSON log line per request.
+
+The last scheduled backup (backup_scheduler.py) is reported from its status
+file at scrape time:
+    backup_last_success                     1 if it succeeded, else 0
+    backup_last_duration_seconds
+    backup_last_success_timestamp_seconds
+    backup_last_size_bytes, backup_files_kept
+
+The endpoint label is the URL rule (e.g. /api/games/<int:game_id>), never the
+raw path, so label cardinality stays bounded.
+
+Under gunicorn every worker writes to PROMETHEUS_MULTIPROC_DIR (set up in
+gunicorn.conf.py) and /api/metrics aggregates them all. Without that
+variable the metrics are those of the current process only.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from flask import request, g, has_request_context
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+        CONTENT_TYPE_LATEST, generate_latest, multiprocess
+    )
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - prometheus_client is optional
+    CollectorRegistry = None
+
+MULTIPROC_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Scrapes of the metrics endpoint itself are not recorded
+EXCLUDED_ENDPOINTS = {'/api/metrics'}
+
+
+def metrics_available():
+    return CollectorRegistry is not None
+
+
+if metrics_available():
+    REQUEST_COUNT = Counter(
+        'http_requests_total', 'HTTP requests served',
+        ['method', 'endpoint', 'status']
+    )
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'Time spent handling a request',
+        ['method', 'endpoint'], buckets=LATENCY_BUCKETS
+    )
+    REQUESTS_IN_PROGRESS = Gauge(
+        'http_requests_in_progress', 'Requests currently being handled',
+        ['method', 'endpoint'], multiprocess_mode='livesum'
+    )
+    REQUEST_SIZE = Histogram(
+        'http_request_size_bytes', 'Request body size',
+        ['method', 'endpoint'], buckets=SIZE_BUCKETS
+    )
+    RESPONSE_SIZE = Histogram(
+        'http_response_size_bytes', 'Response body size as sent (after compression)',
+        ['method', 'endpoint'], buckets=SIZE_BUCKETS
+    )
+    STAGE_LATENCY = Histogram(
+        'simulation_stage_duration_seconds', 'Time spent in each game simulation stage',
+        ['stage'], buckets=LATENCY_BUCKETS
+    )
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as one simulation stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if metrics_available():
+            STAGE_LATENCY.labels(stage=name).observe(elapsed)
+        if has_request_context():
+            g.setdefault('stage_timings', []).append((start, name, elapsed))
+
+
+def timed_stage(name):
+    """Decorator form of stage()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _server_timing(timings, total):
+    """
+    Build the Server-Timing value: one entry per stage in the order the
+    stages started, summed over repeated calls (bulk requests run each stage
+    per game). Nested stages are listed separately, so durations can overlap.
+    """
+    totals = {}
+    for _, name, elapsed in sorted(timings):
+        duration, calls = totals.get(name, (0.0, 0))
+        totals[name] = (duration + elapsed, calls + 1)
+
+    entries = []
+    for name, (duration, calls) in totals.items():
+        entry = f"{name};dur={duration * 1000:.1f}"
+        if calls > 1:
+            entry += f';desc="{calls} calls"'
+        entries.append(entry)
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries), {name: round(d * 1000, 1) for name, (d, _) in totals.items()}
+
+
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+def _report_stage_timings(response):
+    timings = g.get('stage_timings')
+    if not timings:
+        return response
+    total = time.perf_counter() - g.request_start
+    header, stages_ms = _server_timing(timings, total)
+    response.headers['Server-Timing'] = header
+    print(json.dumps({
+        'event': 'stage_timings',
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'total_ms': round(total * 1000, 1),
+        'stages_ms': stages_ms
+    }))
+    return response
+
+
+def _endpoint_label():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _before_request():
+    endpoint = _endpoint_label()
+    if endpoint in EXCLUDED_ENDPOINTS:
+        return
+    g.metrics_labels = (request.method, endpoint)
+    REQUESTS_IN_PROGRESS.labels(*g.metrics_labels).inc()
+    if request.content_length:
+        REQUEST_SIZE.labels(*g.metrics_labels).observe(request.content_length)
+
+
+def _after_request(response):
+    labels = g.get('metrics_labels')
+    if labels is None:
+        return response
+    REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - g.request_start)
+    REQUEST_COUNT.labels(*labels, str(response.status_code)).inc()
+    # Streamed responses (e.g. the SSE feed) have no length up front
+    if response.content_length is not None:
+        RESPONSE_SIZE.labels(*labels).observe(response.content_length)
+    return response
+
+
+def _teardown_request(exception=None):
+    labels = g.pop('metrics_labels', None)
+    if labels is not None:
+        REQUESTS_IN_PROGRESS.labels(*labels).dec()
+
+
+def init_metrics(app):
+    """
+    Register the request hooks. Call this before any other after_request
+    hook is added: Flask runs them in reverse order, so ours runs last and
+    sees the final (compressed) response.
+    """
+    app.before_request(_start_timer)
+    app.after_request(_report_stage_timings)
+
+    if not metrics_available():
+        print("⚠ prometheus_client not installed; /api/metrics is disabled")
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+class BackupStatusCollector:
+    """backup_* gauges, read from the backup scheduler's status file on every scrape."""
+
+    def collect(self):
+        from backup_scheduler import read_status
+        status = read_status()
+        if status is None:
+            return
+        yield GaugeMetricFamily('backup_last_success', 'Whether the last scheduled backup succeeded',
+                                value=1 if status['ok'] else 0)
+        yield GaugeMetricFamily('backup_last_duration_seconds', 'Duration of the last scheduled backup',
+                                value=status['duration_seconds'])
+        if status.get('last_success_at'):
+            yield GaugeMetricFamily('backup_last_success_timestamp_seconds', 'When the last successful backup finished',
+                                    value=datetime.fromisoformat(status['last_success_at']).timestamp())
+        if status['ok']:
+            yield GaugeMetricFamily('backup_last_size_bytes', 'Compressed size of the last backup',
+                                    value=status['size_bytes'])
+            yield GaugeMetricFamily('backup_files_kept', 'Backups kept by rotation', value=status['kept'])
+
+
+if metrics_available():
+    # Single-process mode; with PROMETHEUS_MULTIPROC_DIR, render_metrics() adds it to each scrape
+    REGISTRY.register(BackupStatusCollector())
+
+
+def render_metrics():
+    """Return (body, content_type) for the metrics of every worker."""
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(BackupStatusCollector())
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid):
+    """Called from gunicorn's child_exit hook so live gauges drop the worker."""
+    if metrics_available() and os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid)
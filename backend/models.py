@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, JSON
+from sqlalchemy import create_engine, event, func, DDL, Index, Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
+from contextlib import contextmanager
 
 Base = declarative_base()
 
@@ -59,6 +60,13 @@ class Player(Base):
     
     team = relationship("Team", back_populates="players")
     game_stats = relationship("PlayerGameStats", back_populates="player")
+    
+    # Roster lookups and the free agent search (routes/free_agents.py):
+    # sorted by PPG, and case-insensitive name prefix within a team
+    __table_args__ = (
+        Index('ix_players_team_ppg', 'team_id', 'ppg'),
+        Index('ix_players_team_name', 'team_id', func.lower(name)),
+    )
 
 class Game(Base):
     __tablename__ = 'games'
@@ -183,14 +191,124 @@ class PlayByPlay(Base):
     
     game = relationship("Game", back_populates="play_by_play")
 
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+    
+    # Bumped by writers so process-local caches know when to rebuild (see cache.py)
+    name = Column(String(50), primary_key=True)  # runs, bracket, games, rosters, teams
+    version = Column(Integer, nullable=False, default=0)
+
+class ChangeEvent(Base):
+    __tablename__ = 'change_events'
+    
+    # Append-only log polled by /api/events; the id doubles as the SSE event id
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    kind = Column(String(50), nullable=False)  # game_created, series_updated, round_advanced, ...
+    payload = Column(JSON)
+
+class RowChange(Base):
+    __tablename__ = 'row_changes'
+    
+    # Latest change to each row of TRACKED_TABLES, written by triggers; seq
+    # only grows, so "seq > watermark" selects what an incremental backup needs
+    table_name = Column(String(50), primary_key=True)
+    row_id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False, index=True)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+class RestorePoint(Base):
+    __tablename__ = 'restore_points'
+    
+    # Backups restored into this database (restore.py); an incremental backup
+    # only applies on top of the watermark of the last one
+    id = Column(Integer, primary_key=True)
+    restored_at = Column(DateTime, default=datetime.utcnow)
+    kind = Column(String(20), nullable=False)  # full, merge, delta
+    since = Column(Integer, nullable=True)
+    watermark = Column(Integer, nullable=True)  # None: no incremental backup can follow
+
+TRACKED_TABLES = ('teams', 'players', 'runs', 'series', 'games', 'player_game_stats', 'play_by_play')
+
+for _table in TRACKED_TABLES:
+    for _op, _row, _deleted in (('INSERT', 'NEW', 0), ('UPDATE', 'NEW', 0), ('DELETE', 'OLD', 1)):
+        event.listen(Base.metadata, 'after_create', DDL(
+            f"CREATE TRIGGER IF NOT EXISTS track_{_table}_{_op.lower()} AFTER {_op} ON {_table} BEGIN "
+            f"INSERT OR REPLACE INTO row_changes (table_name, row_id, deleted, seq) "
+            f"VALUES ('{_table}', {_row}.id, {_deleted}, (SELECT COALESCE(MAX(seq), 0) + 1 FROM row_changes)); "
+            f"END"
+        ))
+
 # Database initialization
+
+# One engine (and connection pool) per database file per process
+_engines = {}
+_sessionmakers = {}
+
+def get_engine(db_path='basketball_sim.db'):
+    engine = _engines.get(db_path)
+    if engine is None:
+        engine = _engines[db_path] = create_engine(f'sqlite:///{db_path}')
+        _sessionmakers[db_path] = sessionmaker(bind=engine)
+    return engine
+
+def dispose_engines():
+    """Drop pooled connections, e.g. ones inherited across a fork."""
+    for engine in _engines.values():
+        engine.dispose()
+
+def locking_engine(db_path='basketball_sim.db', timeout=30):
+    """
+    Separate engine whose transactions start with BEGIN IMMEDIATE (takes the
+    write lock up front, waiting up to timeout seconds for it), for one-off
+    jobs that must not interleave with other writers. Dispose it when done.
+    """
+    engine = create_engine(f'sqlite:///{db_path}', connect_args={'timeout': timeout})
+
+    @event.listens_for(engine, 'connect')
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _begin_immediate(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    return engine
+
 def init_db(db_path='basketball_sim.db'):
-    engine = create_engine(f'sqlite:///{db_path}')
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    ensure_schema(db_path)
+    return _sessionmakers[db_path]()
+
+def ensure_schema(db_path='basketball_sim.db'):
+    """Create any tables and indexes missing from an existing database (e.g. ones added after it was seeded)."""
+    get_engine(db_path)
+    # pysqlite would commit every CREATE on its own (one fsync per table,
+    # index and trigger); a locking engine runs them in one transaction
+    engine = locking_engine(db_path)
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        # create_all skips the indexes of tables that already exist
+        existing = {name for name, in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+    engine.dispose()
 
 def get_session(db_path='basketball_sim.db'):
-    engine = create_engine(f'sqlite:///{db_path}')
-    Session = sessionmaker(bind=engine)
-    return Session()
+    """New session on the shared engine; the caller is responsible for closing it."""
+    get_engine(db_path)
+    return _sessionmakers[db_path]()
+
+@contextmanager
+def session_scope(db_path='basketball_sim.db'):
+    """Unit of work for scripts and background jobs: commit on success, roll back on error, always close."""
+    session = get_session(db_path)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,6 +1,7 @@
 import random
 from models import PlayByPlay, PlayerGameStats, get_session
 from datetime import datetime
+from metrics import timed_stage
 
 class PlayByPlayGenerator:
     """
@@ -8,13 +9,22 @@ class PlayByPlayGenerator:
     player stats and quarter scores.
     """
     
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None, autocommit=True):
+        self.session = session or get_session()
+        self.autocommit = autocommit
         self.event_types = [
             'made_shot', 'missed_shot', 'free_throw', 'rebound', 
             'assist', 'steal', 'block', 'turnover', 'foul', 'substitution'
         ]
+
+    def _commit(self):
+        """Commit, or only flush when the caller owns the transaction."""
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
     
+    @timed_stage('generate_play_by_play')
     def generate_play_by_play(self, game):
         """
         Generate complete play-by-play log for a game.
@@ -28,6 +38,21 @@ class PlayByPlayGenerator:
             game_id=game.id, team_id=game.away_team_id
         ).all()
         
+        plays = self._build_plays(game, home_stats, away_stats)
+        
+        # Save all plays to database
+        for play in plays:
+            self.session.add(play)
+        
+        self._commit()
+        return plays
+    
+    def _build_plays(self, game, home_stats, away_stats):
+        """
+        Build the (unsaved) plays for a whole game from both teams' box scores.
+        Only reads ids, quarter scores, minutes and player names, so plain
+        objects work too (see generate_league.py).
+        """
         # Generate plays for each quarter
         plays = []
         running_home_score = 0
@@ -56,11 +81,6 @@ class PlayByPlayGenerator:
             running_home_score += home_quarter_score
             running_away_score += away_quarter_score
         
-        # Save all plays to database
-        for play in plays:
-            self.session.add(play)
-        
-        self.session.commit()
         return plays
     
     def _generate_quarter_plays(self, game, quarter, home_stats, away_stats,
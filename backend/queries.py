@@ -0,0 +1,383 @@
+"""
+Read-side building blocks shared by the individual GET endpoints and
+/api/dashboard. Each builder takes an open session and returns plain
+JSON-ready data; the cached_* helpers memoize them in cache.read_cache
+keyed on the data versions they depend on.
+"""
+import base64
+import json
+from sqlalchemy import func, and_, or_, false
+from models import Team, Player, Game, PlayerGameStats, Run
+from tournament_manager import TournamentManager
+from cache import read_cache, RUNS, BRACKET, GAMES, ROSTERS, TEAMS
+
+ROUND_NAMES = {
+    1: 'Round 1 (Round of 32)',
+    2: 'Round 2 (Sweet 16)',
+    3: 'Round 3 (Elite 8)',
+    4: 'Conference Finals',
+    5: 'Finals'
+}
+
+
+def get_active_run(session):
+    """Return the active Run, or None."""
+    return session.query(Run).filter_by(is_active=True).first()
+
+
+# ==================== TEAM DIRECTORY ====================
+
+def build_team_directory(session):
+    """{team_id: display data} for every team; the values are the entries of /api/teams."""
+    return {t.id: {
+        'id': t.id,
+        'name': t.name,
+        'city': t.city,
+        'abbreviation': t.abbreviation,
+        'conference': t.conference,
+        'division': t.division,
+        'team_type': t.team_type,
+        'full_name': f"{t.city} {t.name}"
+    } for t in session.query(Team).order_by(Team.id)}
+
+
+def team_directory(session, versions):
+    """The team directory, loaded once per process and rebuilt when teams change."""
+    return read_cache.get('team_directory', versions, (TEAMS,), lambda: build_team_directory(session))
+
+
+def team_name(teams, team_id, default=None):
+    """'City Name' of a team from the directory, or default (e.g. for no team)."""
+    team = teams.get(team_id)
+    return team['full_name'] if team else default
+
+
+def build_team_detail(session, team):
+    """A directory entry plus the team's roster."""
+    players = session.query(Player).filter_by(team_id=team['id']).order_by(Player.id).all()
+
+    return {
+        'id': team['id'],
+        'name': team['name'],
+        'city': team['city'],
+        'abbreviation': team['abbreviation'],
+        'conference': team['conference'],
+        'full_name': team['full_name'],
+        'players': [{
+            'id': p.id,
+            'name': p.name,
+            'position': p.position,
+            'jersey_number': p.jersey_number,
+            'height': p.height,
+            'weight': p.weight,
+            'ppg': p.ppg,
+            'rpg': p.rpg,
+            'apg': p.apg,
+            'fg_pct': p.fg_pct,
+            'three_pt_pct': p.three_pt_pct
+        } for p in players]
+    }
+
+
+def build_runs(session, teams):
+    runs = session.query(Run).order_by(Run.year.desc()).all()
+
+    return [{
+        'id': r.id,
+        'name': r.name,
+        'year': r.year,
+        'created_at': r.created_at.isoformat() if r.created_at else None,
+        'is_active': r.is_active,
+        'is_completed': r.is_completed,
+        'champion': team_name(teams, r.champion_team_id)
+    } for r in runs]
+
+
+def build_active_run(session, teams):
+    run = get_active_run(session)
+
+    if not run:
+        return None
+
+    return {
+        'id': run.id,
+        'name': run.name,
+        'year': run.year,
+        'is_completed': run.is_completed,
+        'champion': team_name(teams, run.champion_team_id)
+    }
+
+
+def build_active_series(session, teams):
+    series_list = TournamentManager(session=session).get_current_series()
+
+    return [{
+        'id': s.id,
+        'round': s.tournament_round,
+        'team1': team_name(teams, s.team1_id, "TBD"),
+        'team2': team_name(teams, s.team2_id, "TBD"),
+        'score': f"{s.team1_wins} - {s.team2_wins}"
+    } for s in series_list]
+
+
+def build_tournament_overview(session, teams):
+    rounds = TournamentManager(session=session).get_tournament_overview()
+
+    result = {}
+    for round_num, series_list in rounds.items():
+        round_name = ROUND_NAMES.get(round_num, f'Round {round_num}')
+
+        result[round_name] = [{
+            'id': s.id,
+            'team1': team_name(teams, s.team1_id),
+            'team2': team_name(teams, s.team2_id),
+            'score': f"{s.team1_wins} - {s.team2_wins}",
+            'is_completed': s.is_completed,
+            'winner': team_name(teams, s.winner_team_id)
+        } for s in series_list]
+
+    return result
+
+
+def build_games(session, teams):
+    games = session.query(Game).order_by(Game.game_date.desc()).all()
+
+    return [{
+        'id': g.id,
+        'date': g.game_date.isoformat(),
+        'home_team': team_name(teams, g.home_team_id),
+        'away_team': team_name(teams, g.away_team_id),
+        'final_score': f"{g.home_team_score} - {g.away_team_score}",
+        'series_id': g.series_id
+    } for g in games]
+
+
+def build_stat_leaders(session, run_filter):
+    """League leaders (top 10 PPG/RPG/APG), optionally limited to one run."""
+
+    # Base query builder
+    def build_leader_query(stat_field, label):
+        query = session.query(
+            Player.id,
+            Player.name,
+            Team.city,
+            Team.name.label('team_name'),
+            func.avg(stat_field).label(label),
+            func.count(PlayerGameStats.id).label('games_played')
+        ).select_from(Player)\
+         .join(PlayerGameStats, Player.id == PlayerGameStats.player_id)\
+         .join(Team, Player.team_id == Team.id)
+
+        # Add run filter if specified
+        if run_filter:
+            query = query.join(Game, PlayerGameStats.game_id == Game.id)\
+                         .filter(Game.run_id == run_filter)
+
+        return query.group_by(Player.id, Player.name, Team.city, Team.name)\
+                    .having(func.count(PlayerGameStats.id) >= 1)\
+                    .order_by(func.avg(stat_field).desc()).limit(10).all()
+
+    # Points leaders
+    points_leaders = build_leader_query(PlayerGameStats.points, 'ppg')
+
+    # Rebounds leaders
+    rebounds_leaders = build_leader_query(PlayerGameStats.rebounds, 'rpg')
+
+    # Assists leaders
+    assists_leaders = build_leader_query(PlayerGameStats.assists, 'apg')
+
+    return {
+        'scoring_leaders': [{
+            'rank': i + 1,
+            'player_id': p.id,
+            'name': p.name,
+            'team': f"{p.city} {p.team_name}",
+            'ppg': round(p.ppg, 1),
+            'games': p.games_played
+        } for i, p in enumerate(points_leaders)],
+        'rebounding_leaders': [{
+            'rank': i + 1,
+            'player_id': p.id,
+            'name': p.name,
+            'team': f"{p.city} {p.team_name}",
+            'rpg': round(p.rpg, 1),
+            'games': p.games_played
+        } for i, p in enumerate(rebounds_leaders)],
+        'assists_leaders': [{
+            'rank': i + 1,
+            'player_id': p.id,
+            'name': p.name,
+            'team': f"{p.city} {p.team_name}",
+            'apg': round(p.apg, 1),
+            'games': p.games_played
+        } for i, p in enumerate(assists_leaders)]
+    }
+
+
+# ==================== FREE AGENT SEARCH ====================
+
+# Columns the free agent search can filter on with min_/max_ and sort by
+FREE_AGENT_STATS = ('ppg', 'rpg', 'apg', 'spg', 'bpg', 'fg_pct', 'three_pt_pct', 'ft_pct', 'mpg', 'weight')
+FREE_AGENT_SORTS = FREE_AGENT_STATS + ('name', 'position')
+
+
+class InvalidQuery(ValueError):
+    """A search parameter that can't be used; the message is safe to return to the client."""
+
+
+def parse_sort(text):
+    """'-ppg,name' -> [('ppg', True), ('name', False)] (True: descending)."""
+    keys = []
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        descending = part.startswith('-')
+        name = part.lstrip('-+')
+        if name not in FREE_AGENT_SORTS:
+            raise InvalidQuery(f"Can't sort by '{name}' (one of: {', '.join(FREE_AGENT_SORTS)})")
+        keys.append((name, descending))
+    if not keys:
+        raise InvalidQuery("sort is empty")
+    return keys
+
+
+# SQLite's lower() only folds ASCII letters; names are folded the same way in
+# Python, so prefixes and cursors compare exactly like the SQL side
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def fold_name(name):
+    """A name as SQLite's lower() returns it."""
+    return name.translate(_ASCII_LOWER)
+
+
+def _sort_column(name):
+    # The name index is on lower(name), and the search is case-insensitive anyway
+    return func.lower(Player.name) if name == 'name' else getattr(Player, name)
+
+
+def encode_cursor(sort_text, values):
+    raw = json.dumps({'sort': sort_text, 'after': values}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_text, key_count):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values = data['after']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidQuery("Invalid cursor")
+    if data.get('sort') != sort_text or not isinstance(values, list) or len(values) != key_count:
+        raise InvalidQuery("The cursor belongs to a search with a different sort")
+    return values
+
+
+def _beyond(column, value, descending):
+    """
+    Rows strictly after value in one column's order. SQLite sorts NULL below
+    every value (first ascending, last descending), and comparisons with NULL
+    are never true, so NULLs are handled explicitly.
+    """
+    if descending:
+        return false() if value is None else or_(column < value, column.is_(None))
+    return column.isnot(None) if value is None else column > value
+
+
+def _after(keys, values):
+    """Keyset condition: rows that come after values in the (column, descending) order of keys."""
+    alternatives = []
+    for i, (column, descending) in enumerate(keys):
+        # == None compiles to IS NULL
+        ties = [earlier == value for (earlier, _), value in zip(keys[:i], values[:i])]
+        alternatives.append(and_(*ties, _beyond(column, values[i], descending)))
+    return or_(*alternatives)
+
+
+def search_free_agents(session, team_id, positions=None, ranges=None, name_prefix=None,
+                       sort='-ppg', limit=None, cursor=None):
+    """
+    One page of the free agent pool. ranges maps a FREE_AGENT_STATS column
+    to a (min, max) pair (either can be None). Returns (players, next_cursor);
+    next_cursor is None on the last page and when there is no limit.
+    """
+    sort_keys = parse_sort(sort)
+    # id breaks ties, in the direction of the first key so an index scan needs no extra sort
+    keys = [(_sort_column(name), descending) for name, descending in sort_keys]
+    keys.append((Player.id, sort_keys[0][1]))
+
+    query = session.query(Player).filter(Player.team_id == team_id)
+    if positions:
+        query = query.filter(Player.position.in_(positions))
+    for column, (low, high) in (ranges or {}).items():
+        if low is not None:
+            query = query.filter(getattr(Player, column) >= low)
+        if high is not None:
+            query = query.filter(getattr(Player, column) <= high)
+    if name_prefix:
+        # A range on lower(name) instead of LIKE, so ix_players_team_name is used
+        prefix = fold_name(name_prefix)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        query = query.filter(func.lower(Player.name) >= prefix, func.lower(Player.name) < upper)
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, sort, len(keys))))
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in keys])
+    if limit is None:
+        return query.all(), None
+
+    players = query.limit(limit + 1).all()
+    if len(players) <= limit:
+        return players, None
+    players = players[:limit]
+    last = players[-1]
+    values = [fold_name(last.name) if name == 'name' else getattr(last, name) for name, _ in sort_keys] + [last.id]
+    return players, encode_cursor(sort, values)
+
+
+# ==================== CACHED BUILDERS ====================
+# Builders that show team names also depend on TEAMS through the directory
+
+
+def cached_runs(session, versions):
+    teams = team_directory(session, versions)
+    return read_cache.get('runs', versions, (RUNS, TEAMS), lambda: build_runs(session, teams))
+
+
+def cached_active_run(session, versions):
+    teams = team_directory(session, versions)
+    return read_cache.get('active_run', versions, (RUNS, TEAMS), lambda: build_active_run(session, teams))
+
+
+def cached_active_series(session, versions):
+    teams = team_directory(session, versions)
+    return read_cache.get('active_series', versions, (BRACKET, RUNS, TEAMS),
+                          lambda: build_active_series(session, teams))
+
+
+def cached_tournament_overview(session, versions):
+    teams = team_directory(session, versions)
+    return read_cache.get('tournament_overview', versions, (BRACKET, RUNS, TEAMS),
+                          lambda: build_tournament_overview(session, teams))
+
+
+def cached_games(session, versions):
+    teams = team_directory(session, versions)
+    return read_cache.get('games', versions, (GAMES, TEAMS), lambda: build_games(session, teams))
+
+
+def cached_team_detail(session, versions, team_id):
+    """/api/teams/<id> data, or None for an unknown team; rebuilt when rosters or teams change."""
+    team = team_directory(session, versions).get(team_id)
+    if team is None:
+        return None
+    return read_cache.get(('team_detail', team_id), versions, (ROSTERS, TEAMS),
+                          lambda: build_team_detail(session, team))
+
+
+def cached_stat_leaders(session, versions, run_filter):
+    return read_cache.get(('stat_leaders', run_filter), versions, (GAMES, ROSTERS, TEAMS),
+                          lambda: build_stat_leaders(session, run_filter))
+
+
+def free_agent_team_id(session, versions):
+    """Id of the Free Agents team (None if there is none), from the team directory."""
+    teams = team_directory(session, versions)
+    return next((t['id'] for t in teams.values() if t['team_type'] == 'Free Agent'), None)
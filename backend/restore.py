@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Restore a backup made by /api/backup/export into the database.
+
+Reads either export format (see exports.py), gzipped or not:
+    v1  the JSON document: teams, players, runs, series and games
+    v2  the NDJSON sections, including box scores and play-by-play; row
+        counts and checksums are checked against the manifest
+
+The file is parsed as a stream and rows are inserted in batches with
+executemany, so memory stays bounded however large the backup is. The whole
+restore is one transaction that takes the write lock up front, so it lands
+completely or not at all (other workers' writes wait meanwhile). Secondary
+indexes on the restored tables are dropped while loading and rebuilt at the
+end, and foreign keys are checked once, with PRAGMA foreign_key_check,
+instead of row by row.
+
+Modes:
+    replace  delete all league data first and keep the backup's ids
+             (the default when the database has no runs or games yet)
+    merge    add the backup to the existing data: teams are matched by
+             abbreviation and players by name, everything else is shifted
+             past the current max ids, and merged runs are never active
+
+Incremental backups (export?since=<watermark>) need no mode: their rows
+replace the ones with the same id, a changed game's box scores and
+play-by-play are swapped for the backup's, and deleted rows are removed. They
+only apply on top of the backup they continue from: restore a whole-database
+v2 backup with mode=replace, then each increment in order. Every restore is
+recorded in restore_points, which is how the chain is checked.
+
+Usage:
+    python restore.py BACKUP_FILE [--mode replace|merge] [--db basketball_sim.db]
+    python restore.py full.ndjson.gz delta1.ndjson.gz delta2.ndjson.gz ...
+
+Large restores are better run with this CLI than through /api/backup/import,
+which is bound by the gunicorn worker timeout.
+"""
+import argparse
+import codecs
+import hashlib
+import json
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+from sqlalchemy import insert, select, DateTime, JSON
+from models import Team, Player, Run, Series, Game, PlayerGameStats, PlayByPlay, RestorePoint, ensure_schema, locking_engine
+from cache import bump_versions, RUNS, BRACKET, GAMES, ROSTERS, TEAMS
+from exports import SECTION_KEY, MANIFEST_KEY
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    loads = json.loads
+
+# Dependency order: a table only refers to tables before it
+MODELS = (Team, Player, Run, Series, Game, PlayerGameStats, PlayByPlay)
+TABLES = {model.__tablename__: model for model in MODELS}
+MODES = ('replace', 'merge')
+
+BATCH_SIZE = 5000
+READ_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class BackupError(ValueError):
+    """The file is not a backup this importer understands, or it is damaged."""
+
+
+# ---- reading ------------------------------------------------------------------
+
+def _read_chunks(stream):
+    while True:
+        chunk = stream.read(READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _gunzip(chunks):
+    """Decompress gzip data made of one or more members (v2 has one per section)."""
+    decompressor = zlib.decompressobj(31)
+    pending = False
+    try:
+        for chunk in chunks:
+            while chunk:
+                pending = True
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+                if decompressor.eof:
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(31)
+                    pending = False
+                else:
+                    chunk = b''
+    except zlib.error as e:
+        raise BackupError(f"Corrupt gzip data: {e}")
+    if pending:
+        raise BackupError("Backup file is truncated")
+
+
+def open_backup(stream):
+    """Return (chunks, header): the decompressed bytes of the backup and its v2 header (None for v1)."""
+    chunks = _read_chunks(stream)
+    first = next(chunks, b'')
+    data = chain([first], chunks)
+    if first.startswith(GZIP_MAGIC):
+        data = _gunzip(data)
+
+    # v2 starts with a one-line header; v1 is a single JSON document
+    head = b''
+    for chunk in data:
+        head += chunk
+        if b'\n' in head or len(head) >= READ_SIZE:
+            break
+    data = chain([head], data)
+    try:
+        header = loads(head.split(b'\n', 1)[0]) if b'\n' in head else None
+    except ValueError:
+        header = None
+    if isinstance(header, dict) and header.get('type') == 'header':
+        if header.get('version') != 2:
+            raise BackupError(f"Unsupported backup version {header.get('version')}")
+        return data, header
+    return data, None
+
+
+def _lines(chunks):
+    pending = b''
+    for chunk in chunks:
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending.strip():
+        yield pending
+
+
+def _marker(row, legacy):
+    """('section', table, columns), ('manifest', sections, None), or None for a data row."""
+    if legacy:
+        # Exports from before SECTION_KEY: {"type": "section" | "manifest", ...} lines
+        kind = row.get('type') if len(row) <= 3 else None
+        if kind == 'section':
+            return kind, row['table'], row['columns']
+        return (kind, row['sections'], None) if kind == 'manifest' else None
+    if SECTION_KEY in row:
+        return 'section', row[SECTION_KEY], row['columns']
+    if MANIFEST_KEY in row:
+        return 'manifest', row[MANIFEST_KEY], None
+    return None
+
+
+def iter_v2(chunks):
+    """Yield (table, columns, rows) batches from a v2 export, then check them against the manifest."""
+    lines = _lines(chunks)
+    next(lines)  # header, already checked by open_backup
+    seen = {}
+    table = columns = None
+    batch = []
+    manifest = None
+    legacy = None
+
+    for line in lines:
+        if not line:
+            continue
+        row = loads(line)
+        if legacy is None:
+            # The line after the header is always a section line
+            legacy = SECTION_KEY not in row and row.get('type') == 'section'
+        marker = _marker(row, legacy)
+        if marker is not None:
+            if batch:
+                yield table, columns, batch
+                batch = []
+            kind, value, section_columns = marker
+            if kind == 'manifest':
+                manifest = value
+                break
+            table, columns = value, section_columns
+            seen[table] = {'rows': 0, 'digest': hashlib.sha256()}
+            continue
+        if table is None:
+            raise BackupError("Row found before any section header")
+        section = seen[table]
+        section['rows'] += 1
+        section['digest'].update(line + b'\n')
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield table, columns, batch
+            batch = []
+
+    if manifest is None:
+        raise BackupError("Backup file has no manifest (truncated?)")
+    for name, expected in manifest.items():
+        got = seen.get(name)
+        if got is None or got['rows'] != expected['rows'] or got['digest'].hexdigest() != expected['sha256']:
+            raise BackupError(f"Section '{name}' does not match the manifest (corrupt or truncated backup)")
+
+
+class _JSONReader:
+    """Pull parser for the v1 document: an object of scalars and arrays of flat objects."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        self._decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + self._decode(chunk or b'', final=chunk is None)
+        self.pos = 0
+
+    def peek(self):
+        """The next non-whitespace character, '' at the end of the document."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self._fill()
+
+    def skip(self, char):
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, char):
+        if not self.skip(char):
+            raise BackupError(f"Invalid backup file: expected {char!r}")
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+                # A value that ends with the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise BackupError("Invalid JSON in backup file")
+            self._fill()
+
+
+def iter_v1(chunks):
+    """Yield (table, None, rows) batches from a v1 export."""
+    reader = _JSONReader(chunks)
+    reader.expect('{')
+    while not reader.skip('}'):
+        key = reader.value()
+        reader.expect(':')
+        if reader.skip('['):
+            batch = []
+            while not reader.skip(']'):
+                batch.append(reader.value())
+                if len(batch) >= BATCH_SIZE:
+                    yield key, None, batch
+                    batch = []
+                reader.skip(',')
+            if batch:
+                yield key, None, batch
+        else:
+            value = reader.value()
+            if key == 'version' and not str(value).startswith('1'):
+                raise BackupError(f"Unsupported backup version {value}")
+        reader.skip(',')
+
+
+# ---- loading ------------------------------------------------------------------
+
+class _Loader:
+    """Inserts batches into one transaction, remapping ids when merging and replacing rows for increments."""
+
+    def __init__(self, conn, mode):
+        self.conn = conn
+        self.dialect = conn.dialect
+        self.mode = mode
+        self.specs = {}
+        self.counts = defaultdict(int)
+        self.matched = defaultdict(int)
+        self.deleted = defaultdict(int)
+        self.started = set()
+        self.remap = {}
+        if mode == 'merge':
+            self._prepare_merge()
+
+    def _scalar(self, sql):
+        return self.conn.exec_driver_sql(sql).scalar()
+
+    def _prepare_merge(self):
+        # Small tables are matched to existing rows; large ones are shifted past the max id
+        self.team_ids = {}
+        self.player_ids = {}
+        self.existing_teams = dict(self.conn.exec_driver_sql('SELECT abbreviation, id FROM teams').all())
+        self.existing_players = dict(self.conn.exec_driver_sql('SELECT name, id FROM players').all())
+        self.next_team_id = (self._scalar('SELECT MAX(id) FROM teams') or 0) + 1
+        self.next_player_id = (self._scalar('SELECT MAX(id) FROM players') or 0) + 1
+
+        def lookup(name, ids):
+            def remap(value):
+                if value is None:
+                    return None
+                try:
+                    return ids[value]
+                except KeyError:
+                    raise BackupError(f"Backup refers to {name} id {value}, which it does not contain")
+            return remap
+
+        self.remap = {'teams': lookup('team', self.team_ids), 'players': lookup('player', self.player_ids)}
+        for model in (Run, Series, Game, PlayerGameStats, PlayByPlay):
+            offset = self._scalar(f'SELECT MAX(id) FROM {model.__tablename__}') or 0
+            self.remap[model.__tablename__] = lambda value, offset=offset: None if value is None else value + offset
+
+    def _match(self, table, rows):
+        """Merge mode: map backup teams/players onto existing ones and give the rest new ids."""
+        if table == 'teams':
+            ids, existing, key, counter = self.team_ids, self.existing_teams, 'abbreviation', 'next_team_id'
+        else:
+            ids, existing, key, counter = self.player_ids, self.existing_players, 'name', 'next_player_id'
+        new_rows = []
+        for row in rows:
+            match = existing.get(row.get(key))
+            if match is not None:
+                ids[row['id']] = match
+                self.matched[table] += 1
+                continue
+            new_id = getattr(self, counter)
+            setattr(self, counter, new_id + 1)
+            ids[row['id']] = new_id
+            existing[row.get(key)] = new_id
+            new_rows.append({**row, 'id': new_id})
+        return new_rows
+
+    def _spec(self, table, model, columns):
+        """INSERT statement, row getter and per-column converters for a table."""
+        table_columns = model.__table__.c
+        columns = [c for c in columns if c in table_columns]
+        getter = itemgetter(*columns) if len(columns) > 1 else (lambda row: (row[columns[0]],))
+
+        converters = []
+        for index, name in enumerate(columns):
+            column = table_columns[name]
+            steps = []
+            if self.mode == 'merge':
+                if name == 'id' and table in self.remap and table not in ('teams', 'players'):
+                    steps.append(self.remap[table])
+                for fk in column.foreign_keys:
+                    steps.append(self.remap[fk.column.table.name])
+                if table == 'runs' and name == 'is_active':
+                    steps.append(lambda value: False)
+            if isinstance(column.type, DateTime):
+                steps.append(lambda value: datetime.fromisoformat(value) if isinstance(value, str) else value)
+            if isinstance(column.type, (DateTime, JSON)):
+                # The same conversion the ORM applies when binding these types
+                process = column.type.dialect_impl(self.dialect).bind_processor(self.dialect)
+                if process is not None:
+                    steps.append(process)
+            if steps:
+                converters.append((index, steps))
+
+        verb = 'INSERT OR REPLACE' if self.mode == 'delta' else 'INSERT'
+        sql = f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        return sql, getter, columns, converters
+
+    def _delete_games_details(self, game_ids):
+        # One statement per batch: game_id has no index in these tables
+        for model in (PlayerGameStats, PlayByPlay):
+            self.conn.exec_driver_sql(
+                f'DELETE FROM {model.__tablename__} WHERE game_id IN (SELECT value FROM json_each(?))',
+                (json.dumps(game_ids),)
+            )
+
+    def _delete(self, rows):
+        """Increment mode: remove the rows listed in the "deleted" section."""
+        by_table = defaultdict(list)
+        for row in rows:
+            by_table[row['table']].append(row['id'])
+        for table, ids in by_table.items():
+            if table not in TABLES:
+                raise BackupError(f"Backup deletes rows of unknown table '{table}'")
+            if table == 'games':
+                self._delete_games_details(ids)
+            self.conn.exec_driver_sql(f'DELETE FROM {table} WHERE id = ?', [(row_id,) for row_id in ids])
+            self.deleted[table] += len(ids)
+
+    def load(self, table, columns, rows):
+        if self.mode == 'delta' and table == 'deleted':
+            return self._delete(rows)
+        model = TABLES.get(table)
+        if model is None:
+            return
+        if self.mode == 'merge':
+            for fk in model.__table__.foreign_keys:
+                target = fk.column.table.name
+                if target not in self.started and target != table:
+                    raise BackupError(f"Merging needs '{target}' before '{table}' in the backup; "
+                                      f"re-export it with the current version")
+        self.started.add(table)
+
+        if self.mode == 'merge' and table in ('teams', 'players'):
+            rows = self._match(table, rows)
+            if not rows:
+                return
+        if table not in self.specs:
+            self.specs[table] = self._spec(table, model, columns or list(rows[0]))
+        sql, getter, names, converters = self.specs[table]
+        if self.mode == 'delta' and table == 'games':
+            # The backup has the complete box score and play-by-play of every changed game
+            self._delete_games_details([row['id'] for row in rows])
+
+        values = []
+        for row in rows:
+            try:
+                row_values = getter(row)
+            except KeyError:
+                row_values = tuple(row.get(c) for c in names)
+            if converters:
+                row_values = list(row_values)
+                for index, steps in converters:
+                    value = row_values[index]
+                    for step in steps:
+                        value = step(value)
+                    row_values[index] = value
+            values.append(tuple(row_values))
+        self.conn.exec_driver_sql(sql, values)
+        self.counts[table] += len(values)
+
+
+def restore_backup(stream, mode=None, db_path='basketball_sim.db'):
+    """
+    Restore a backup read from a binary file-like object. Returns a summary
+    dict; raises BackupError (and changes nothing) when the backup is
+    invalid or does not fit.
+    """
+    if mode is not None and mode not in MODES:
+        raise BackupError(f"mode must be one of {', '.join(MODES)}")
+    start = time.perf_counter()
+    chunks, header = open_backup(stream)
+    batches = iter_v2(chunks) if header else iter_v1(chunks)
+    since = header.get('since') if header else None
+    if since is not None:
+        if mode is not None:
+            raise BackupError("This is an incremental backup: it applies on top of its base, without a mode")
+        mode = 'delta'
+
+    ensure_schema(db_path)
+    engine = locking_engine(db_path)
+    try:
+        with engine.begin() as conn:
+            if mode == 'delta':
+                last = conn.execute(
+                    select(RestorePoint.watermark).order_by(RestorePoint.id.desc()).limit(1)
+                ).first()
+                if last is None or last.watermark is None:
+                    raise BackupError("Incremental backups apply on top of a whole-database v2 backup "
+                                      "restored with mode=replace; restore that first")
+                if since > last.watermark:
+                    raise BackupError(f"This increment starts at watermark {since}, but the database is "
+                                      f"restored up to {last.watermark}: restore the increments in between first")
+                if header.get('watermark') < last.watermark:
+                    raise BackupError(f"The database is already restored past this increment "
+                                      f"(watermark {last.watermark} > {header.get('watermark')})")
+            elif mode is None:
+                has_data = conn.exec_driver_sql('SELECT EXISTS (SELECT 1 FROM runs) OR EXISTS (SELECT 1 FROM games)').scalar()
+                if has_data:
+                    raise BackupError("The database already has league data: pass mode=replace or mode=merge")
+                mode = 'replace'
+            conn.exec_driver_sql('PRAGMA cache_size = -65536')  # 64 MB page cache for the load
+
+            names = tuple(TABLES)
+            # Rebuilding indexes only pays off for full loads; increments are small
+            indexes = [] if mode == 'delta' else conn.exec_driver_sql(
+                f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                f"AND tbl_name IN ({', '.join('?' * len(names))})", names
+            ).all()
+            for name, _ in indexes:
+                conn.exec_driver_sql(f'DROP INDEX "{name}"')
+            if mode == 'replace':
+                for model in reversed(MODELS):
+                    conn.exec_driver_sql(f'DELETE FROM {model.__tablename__}')
+
+            loader = _Loader(conn, mode)
+            for table, columns, rows in batches:
+                loader.load(table, columns, rows)
+
+            for _, sql in indexes:
+                conn.exec_driver_sql(sql)
+            for table in loader.started:
+                problems = conn.exec_driver_sql(f'PRAGMA foreign_key_check({table})').all()
+                if problems:
+                    raise BackupError(f"{len(problems)} rows in {table} refer to missing "
+                                      f"{problems[0][2]} rows (first: rowid {problems[0][1]})")
+            # Only a whole-database v2 backup, or an increment on top of one, can be continued
+            watermark = header.get('watermark') if header and mode in ('replace', 'delta') else None
+            conn.execute(insert(RestorePoint.__table__).values(
+                kind='full' if mode == 'replace' else mode, since=since, watermark=watermark
+            ))
+            bump_versions(conn, RUNS, BRACKET, GAMES, ROSTERS, TEAMS)
+    finally:
+        engine.dispose()
+
+    return {
+        'format': header['version'] if header else 1,
+        'mode': mode,
+        'watermark': watermark,
+        'restored': {name: loader.counts[name] for name in TABLES if name in loader.started},
+        'matched': dict(loader.matched),
+        'deleted': dict(loader.deleted),
+        'seconds': round(time.perf_counter() - start, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+', metavar='file',
+                        help='a .json/.json.gz (v1) or .ndjson.gz (v2) export, optionally followed by increments')
+    parser.add_argument('--mode', choices=MODES, help='for the first file; default: replace on an empty database, otherwise required')
+    parser.add_argument('--db', default='basketball_sim.db')
+    args = parser.parse_args()
+
+    mode = args.mode
+    for path in args.files:
+        try:
+            with open(path, 'rb') as f:
+                summary = restore_backup(f, mode=mode, db_path=args.db)
+        except BackupError as e:
+            raise SystemExit(f"⚠ Restoring {path} failed, it was not applied: {e}")
+        mode = None  # the rest are increments
+
+        print(f"✓ Restored {path}: v{summary['format']} backup ({summary['mode']}) in {summary['seconds']}s"
+              + (f", watermark {summary['watermark']}" if summary['watermark'] is not None else ''))
+        for table, count in summary['restored'].items():
+            matched = summary['matched'].get(table)
+            print(f"  {table:<18} {count:>10,}" + (f"  ({matched:,} matched existing rows)" if matched else ''))
+        for table, count in summary['deleted'].items():
+            print(f"  {table:<18} {count:>10,} deleted")
+
+
+if __name__ == '__main__':
+    main()
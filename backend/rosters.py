@@ -0,0 +1,163 @@
+"""
+Roster snapshots and the rules for roster moves (sign, release, trade),
+shared by the trade evaluator and /api/rosters/transactions.
+
+A move is a dict shaped like the body of the matching endpoint in
+routes/free_agents.py plus an action:
+    {"action": "trade", "player_ids_team1": [1, 2], "player_ids_team2": [30]}
+    {"action": "sign", "player_id": 400, "team_id": 3}
+    {"action": "release", "player_id": 12}
+and resolves to {player_id: new_team_id} against a RosterSnapshot.
+"""
+from models import Team, Player
+from cache import read_cache, ROSTERS, TEAMS
+from game_extrapolator import team_strength
+
+RATING_COLUMNS = ('ppg', 'rpg', 'apg', 'spg', 'bpg', 'mpg')
+MOVE_ACTIONS = ('trade', 'sign', 'release')
+
+
+class InvalidMove(ValueError):
+    """A move that breaks the roster rules; the message is safe to return to the client."""
+
+
+class PlayerNotFound(InvalidMove):
+    pass
+
+
+class RosterSnapshot:
+    """
+    Every team's roster as plain data. Snapshots are shared through the read
+    cache and never mutated: with_moves() returns a new one.
+    """
+
+    def __init__(self, teams, league_team_ids, free_agent_team_id, players):
+        self.teams = teams                        # {team_id: 'City Name'}
+        self.league_team_ids = league_team_ids    # teams that play games, sorted
+        self.free_agent_team_id = free_agent_team_id
+        self.players = players                    # {player_id: (name, team_id, ratings)}
+        self._rosters = {}
+        for player_id, (_, team_id, ratings) in sorted(players.items()):
+            self._rosters.setdefault(team_id, []).append((player_id, ratings))
+        self.strength = {
+            team_id: team_strength(ratings[0] for _, ratings in self._rosters.get(team_id, ()))
+            for team_id in teams
+        }
+
+    @classmethod
+    def load(cls, session):
+        teams = {t.id: t for t in session.query(Team)}
+        fa_team = next((t for t in teams.values() if t.team_type == 'Free Agent'), None)
+        players = {
+            p.id: (p.name, p.team_id, tuple(getattr(p, c) or 0.0 for c in RATING_COLUMNS))
+            for p in session.query(Player).filter(Player.team_id.isnot(None))
+        }
+        return cls(
+            {team_id: f'{t.city} {t.name}' for team_id, t in teams.items()},
+            sorted(team_id for team_id, t in teams.items() if t.conference in ('East', 'West')),
+            fa_team.id if fa_team else None,
+            players
+        )
+
+    def team_of(self, player_id):
+        if player_id not in self.players:
+            raise PlayerNotFound(f'Player {player_id} not found')
+        return self.players[player_id][1]
+
+    def with_moves(self, moves):
+        """A copy with the players in moves ({player_id: team_id}) on their new teams."""
+        players = dict(self.players)
+        for player_id, team_id in moves.items():
+            name, _, ratings = players[player_id]
+            players[player_id] = (name, team_id, ratings)
+        return RosterSnapshot(self.teams, self.league_team_ids, self.free_agent_team_id, players)
+
+    def roster(self, team_id):
+        """(player_ids, {rating: array}) for a team, sorted by PPG like the box score engine."""
+        import numpy as np
+        entries = sorted(self._rosters.get(team_id, ()), key=lambda e: (-e[1][0], e[0]))
+        table = np.array([ratings for _, ratings in entries], dtype=float).reshape(-1, len(RATING_COLUMNS))
+        return [player_id for player_id, _ in entries], dict(zip(RATING_COLUMNS, table.T))
+
+
+def cached_snapshot(session, versions):
+    """The current RosterSnapshot, rebuilt when rosters or teams change."""
+    return read_cache.get('roster_snapshot', versions, (ROSTERS, TEAMS),
+                          lambda: RosterSnapshot.load(session))
+
+
+# ==================== MOVES ====================
+# Same rules as the sign, release and trade endpoints in routes/free_agents.py
+
+def _player_id(value):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InvalidMove('Player ids must be integers')
+    return value
+
+
+def trade_moves(snapshot, player_ids_team1, player_ids_team2):
+    if not isinstance(player_ids_team1, list) or not isinstance(player_ids_team2, list):
+        raise InvalidMove('player_ids_team1 and player_ids_team2 must be lists')
+    if not player_ids_team1 or not player_ids_team2:
+        raise InvalidMove('Both teams must trade at least one player')
+    team1_ids = {snapshot.team_of(_player_id(p)) for p in player_ids_team1}
+    team2_ids = {snapshot.team_of(_player_id(p)) for p in player_ids_team2}
+    if len(team1_ids) > 1:
+        raise InvalidMove('All team1 players must be on the same team')
+    if len(team2_ids) > 1:
+        raise InvalidMove('All team2 players must be on the same team')
+    team1_id, team2_id = team1_ids.pop(), team2_ids.pop()
+    moves = {p: team2_id for p in player_ids_team1}
+    moves.update({p: team1_id for p in player_ids_team2})
+    return moves
+
+
+def sign_moves(snapshot, player_id, team_id):
+    if not team_id:
+        raise InvalidMove('team_id required')
+    if snapshot.team_of(_player_id(player_id)) != snapshot.free_agent_team_id:
+        raise InvalidMove('Player is not a free agent')
+    if not isinstance(team_id, int) or team_id not in snapshot.teams:
+        raise PlayerNotFound('Player or team not found')
+    return {player_id: team_id}
+
+
+def release_moves(snapshot, player_id):
+    snapshot.team_of(_player_id(player_id))
+    if snapshot.free_agent_team_id is None:
+        raise PlayerNotFound('Free agent team not found')
+    return {player_id: snapshot.free_agent_team_id}
+
+
+def resolve_move(snapshot, move):
+    """{player_id: team_id} for one move dict; raises InvalidMove."""
+    if not isinstance(move, dict):
+        raise InvalidMove('Each move must be an object')
+    action = move.get('action')
+    if action == 'trade':
+        return trade_moves(snapshot, move.get('player_ids_team1', []), move.get('player_ids_team2', []))
+    if action == 'sign':
+        return sign_moves(snapshot, move.get('player_id'), move.get('team_id'))
+    if action == 'release':
+        return release_moves(snapshot, move.get('player_id'))
+    raise InvalidMove(f"action must be one of: {', '.join(MOVE_ACTIONS)}")
+
+
+def plan_moves(snapshot, items):
+    """
+    Resolve an ordered list of moves, each against the rosters as the moves
+    before it left them. Returns (resolved, errors, final snapshot): resolved
+    has one {player_id: team_id} per item, errors is a list of {'index',
+    'error'} dicts (empty when every move is valid).
+    """
+    resolved, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            moves = resolve_move(snapshot, item)
+        except InvalidMove as e:
+            errors.append({'index': index, 'error': str(e)})
+            resolved.append({})
+            continue
+        resolved.append(moves)
+        snapshot = snapshot.with_moves(moves)
+    return resolved, errors, snapshot
@@ -1,133 +1,139 @@
-from flask import Blueprint, jsonify, send_file
-from models import Team, Player, Game, Series, Run, get_session
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+from werkzeug.wsgi import ClosingIterator
+from models import Run, get_session
+from compression import compress_stream
+import analytics_export
+import exports
+import restore
+import snapshots
 from datetime import datetime
 import os
+import shutil
+import tempfile
 
 backup_bp = Blueprint('backup', __name__)
 
 @backup_bp.route('/backup/export', methods=['GET'])
 def export_database_json():
-    """Export database to JSON"""
-    session = get_session()
-    
-    # Export all data
-    backup_data = {
-        'export_date': datetime.utcnow().isoformat(),
-        'version': '1.0',
-        'teams': [],
-        'players': [],
-        'runs': [],
-        'series': [],
-        'games': []
-    }
-    
-    # Export teams
-    teams = session.query(Team).all()
-    for t in teams:
-        backup_data['teams'].append({
-            'id': t.id,
-            'name': t.name,
-            'city': t.city,
-            'abbreviation': t.abbreviation,
-            'conference': t.conference,
-            'division': t.division,
-            'team_type': t.team_type
-        })
+    """
+    Export the database, streamed so memory use does not grow with the
+    database and the download starts right away (formats: see exports.py)
     
-    # Export players
-    players = session.query(Player).all()
-    for p in players:
-        backup_data['players'].append({
-            'id': p.id,
-            'name': p.name,
-            'team_id': p.team_id,
-            'position': p.position,
-            'jersey_number': p.jersey_number,
-            'height': p.height,
-            'weight': p.weight,
-            'ppg': p.ppg,
-            'rpg': p.rpg,
-            'apg': p.apg,
-            'spg': p.spg,
-            'bpg': p.bpg,
-            'fg_pct': p.fg_pct,
-            'three_pt_pct': p.three_pt_pct,
-            'ft_pct': p.ft_pct,
-            'mpg': p.mpg
-        })
+    Query params:
+        version: 1 (default, JSON without box scores) or 2 (gzipped NDJSON,
+                 every table including box scores and play-by-play)
+        run_id: with version 2, export only this run
+        since: a watermark from an earlier version 2 export (header line or
+               X-Backup-Watermark); export only what changed after it
+    """
+    since = request.args.get('since', type=int)
+    version = request.args.get('version', 1 if since is None else 2, type=int)
+    run_id = request.args.get('run_id', type=int)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Own session: the stream outlives the request's session
+    session = get_session()
     
-    # Export runs
-    runs = session.query(Run).all()
-    for r in runs:
-        backup_data['runs'].append({
-            'id': r.id,
-            'name': r.name,
-            'year': r.year,
-            'created_at': r.created_at.isoformat() if r.created_at else None,
-            'is_active': r.is_active,
-            'is_completed': r.is_completed,
-            'champion_team_id': r.champion_team_id
-        })
+    if version == 2:
+        if run_id is not None and session.get(Run, run_id) is None:
+            session.close()
+            return jsonify({'error': f'Run {run_id} not found'}), 404
+        watermark, max_ids = exports.export_bounds(session)
+        session.rollback()
+        if since is not None and (run_id is not None or not 0 <= since <= watermark):
+            session.close()
+            return jsonify({'error': f'since must be a watermark from a whole-database export of this database (0-{watermark})'}), 400
+        suffix = f'_run{run_id}' if run_id is not None else f'_since{since}' if since is not None else ''
+        response = Response(exports.generate_v2(session, current_app.json.dumps, watermark, max_ids, run_id, since),
+                            mimetype='application/gzip')
+        response.headers['Content-Disposition'] = f'attachment; filename=basketball_sim_backup_{stamp}{suffix}.ndjson.gz'
+        if run_id is None:
+            response.headers['X-Backup-Watermark'] = str(watermark)
+        return response
+    if version != 1 or run_id is not None or since is not None:
+        session.close()
+        return jsonify({'error': 'Only version 1 or 2 is supported, and run_id and since need version 2'}), 400
     
-    # Export series
-    series_list = session.query(Series).all()
-    for s in series_list:
-        backup_data['series'].append({
-            'id': s.id,
-            'tournament_round': s.tournament_round,
-            'series_number': s.series_number,
-            'conference': s.conference,
-            'team1_id': s.team1_id,
-            'team2_id': s.team2_id,
-            'team1_wins': s.team1_wins,
-            'team2_wins': s.team2_wins,
-            'winner_team_id': s.winner_team_id,
-            'is_completed': s.is_completed,
-            'run_id': s.run_id
-        })
+    chunks, encoding = compress_stream(exports.generate_v1(session, current_app.json.dumps))
+    response = Response(chunks, mimetype='application/json')
+    response.headers['Content-Disposition'] = f'attachment; filename=basketball_sim_backup_{stamp}.json'
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@backup_bp.route('/backup/analytics', methods=['GET'])
+def export_analytics():
+    """
+    Games and box scores as a zip of Parquet or Arrow files, one per table,
+    for loading into pandas and friends (see analytics_export.py)
     
-    # Export games
-    games = session.query(Game).all()
-    for g in games:
-        backup_data['games'].append({
-            'id': g.id,
-            'game_date': g.game_date.isoformat() if g.game_date else None,
-            'home_team_id': g.home_team_id,
-            'away_team_id': g.away_team_id,
-            'series_id': g.series_id,
-            'game_number_in_series': g.game_number_in_series,
-            'run_id': g.run_id,
-            'home_team_score': g.home_team_score,
-            'away_team_score': g.away_team_score,
-            'home_q1': g.home_q1,
-            'home_q2': g.home_q2,
-            'home_q3': g.home_q3,
-            'home_q4': g.home_q4,
-            'away_q1': g.away_q1,
-            'away_q2': g.away_q2,
-            'away_q3': g.away_q3,
-            'away_q4': g.away_q4,
-            'input_quarter_number': g.input_quarter_number,
-            'input_home_score': g.input_home_score,
-            'input_away_score': g.input_away_score,
-            'is_completed': g.is_completed
-        })
+    Query params:
+        format: parquet (default) or arrow
+        runs: a run id or an inclusive range like 3-7 (default: all runs)
+        pbp: 1 to include play_by_play
+    """
+    if not analytics_export.load_pyarrow():
+        return jsonify({'error': 'Analytics exports need pyarrow (pip install pyarrow)'}), 501
+    fmt = request.args.get('format', 'parquet')
+    if fmt not in analytics_export.FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(analytics_export.FORMATS)}"}), 400
+    try:
+        run_range = analytics_export.parse_run_range(request.args['runs']) if request.args.get('runs') else None
+    except ValueError:
+        return jsonify({'error': 'runs must be a run id or a range like 3-7'}), 400
+    pbp = request.args.get('pbp', '0').lower() in ('1', 'true', 'yes')
     
-    # Return as downloadable JSON
-    response = jsonify(backup_data)
-    response.headers['Content-Disposition'] = f'attachment; filename=basketball_sim_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    work_dir = tempfile.mkdtemp(prefix='analytics-')
+    try:
+        path = analytics_export.export_zip(work_dir, fmt, run_range, pbp)
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    suffix = f"_runs{run_range[0]}-{run_range[1]}" if run_range else ''
+    response = send_file(
+        path,
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f'basketball_sim_analytics_{datetime.now().strftime("%Y%m%d_%H%M%S")}{suffix}_{fmt}.zip',
+        max_age=0
+    )
+    # send_file responses skip call_on_close; this runs once the file is closed
+    response.response = ClosingIterator(response.response, lambda: shutil.rmtree(work_dir, ignore_errors=True))
     return response
 
 @backup_bp.route('/backup/download-db', methods=['GET'])
 def download_database_file():
-    """Download the SQLite database file directly"""
-    db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'basketball_sim.db')
-    
-    if not os.path.exists(db_path):
+    """Download a consistent snapshot of the SQLite database (see snapshots.py)"""
+    if not os.path.exists(snapshots.database_path()):
         return jsonify({'error': 'Database file not found'}), 404
     
-    return send_file(
-        db_path,
+    path, owned = snapshots.cached_snapshot()
+    response = send_file(
+        path,
         as_attachment=True,
-        download_name=f'basketball_sim_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db'
+        download_name=f'basketball_sim_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db',
+        max_age=0
     )
+    if owned:
+        # send_file responses skip call_on_close; this runs once the file is closed
+        response.response = ClosingIterator(response.response, lambda: os.remove(path))
+    return response
+
+@backup_bp.route('/backup/import', methods=['POST'])
+def import_backup():
+    """
+    Restore a backup made by /backup/export (either version, gzipped or not),
+    sent as the request body or as a multipart 'file' field (see restore.py)
+    
+    Query params:
+        mode: replace (delete current league data) or merge (add to it);
+              required when the database already has runs or games
+    """
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    try:
+        summary = restore.restore_backup(stream, mode=request.args.get('mode'),
+                                         db_path=snapshots.database_path())
+    except restore.BackupError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(summary)
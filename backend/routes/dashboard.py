@@ -0,0 +1,50 @@
+from flask import Blueprint, request, jsonify
+from services import get_db
+from cache import get_versions
+from routes.stats import resolve_leaders_run_filter, run_exists
+import queries
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+DASHBOARD_SECTIONS = ('runs', 'active_run', 'active_series', 'tournament', 'games', 'leaders')
+
+@dashboard_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """
+    Everything the UI loads on start and after each game, in one request.
+    
+    Query params:
+        fields: comma-separated subset of DASHBOARD_SECTIONS (default: all)
+        season: 'current' or 'all', passed through to the leaders section
+        run_id: optional run for the leaders section
+    """
+    requested = request.args.get('fields')
+    fields = [f.strip() for f in requested.split(',') if f.strip()] if requested else list(DASHBOARD_SECTIONS)
+    unknown = [f for f in fields if f not in DASHBOARD_SECTIONS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    session = get_db()
+    versions = get_versions(session)
+    # Resolved once and shared by every section that needs it
+    active_run = queries.cached_active_run(session, versions)
+    result = {}
+    
+    if 'runs' in fields:
+        result['runs'] = queries.cached_runs(session, versions)
+    if 'active_run' in fields:
+        result['active_run'] = active_run
+    if 'active_series' in fields:
+        result['active_series'] = queries.cached_active_series(session, versions)
+    if 'tournament' in fields:
+        result['tournament'] = queries.cached_tournament_overview(session, versions)
+    if 'games' in fields:
+        result['games'] = queries.cached_games(session, versions)
+    if 'leaders' in fields:
+        run_id = request.args.get('run_id', type=int)
+        if run_id and not run_exists(session, versions, run_id):
+            return jsonify({'error': f'Run {run_id} not found'}), 404
+        run_filter = resolve_leaders_run_filter(run_id, request.args.get('season', 'current'), active_run)
+        result['leaders'] = queries.cached_stat_leaders(session, versions, run_filter)
+    
+    return jsonify(result)
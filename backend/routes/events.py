@@ -0,0 +1,74 @@
+from flask import Blueprint, Response, request, stream_with_context
+from models import get_session
+from events import events_since, latest_event_id
+import json
+import os
+import time
+
+events_bp = Blueprint('events', __name__)
+
+# How often the stream checks the event log for new rows
+EVENTS_POLL_SECONDS = float(os.environ.get('EVENTS_POLL_SECONDS', 1.0))
+# Streams end after this long so a gunicorn worker thread (gunicorn.conf.py
+# runs gthread workers) is never pinned to one client; EventSource reconnects
+# on its own and resumes from Last-Event-ID
+EVENTS_STREAM_SECONDS = float(os.environ.get('EVENTS_STREAM_SECONDS', 30))
+KEEPALIVE_SECONDS = 15
+RECONNECT_MS = 1000
+
+
+def format_event(event_id, kind, payload):
+    return f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(payload)}\n\n"
+
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of change events (see events.py for kinds).
+
+    Resumes after the Last-Event-ID header (sent automatically on reconnect)
+    or the ?since=<id> query param; otherwise starts with new events only.
+    """
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('since', type=int)
+
+    session = get_session()
+    if last_id is None:
+        last_id = latest_event_id(session)
+
+    def generate():
+        cursor = last_id
+        deadline = time.monotonic() + EVENTS_STREAM_SECONDS
+        last_write = time.monotonic()
+        yield f"retry: {RECONNECT_MS}\n\n"
+
+        try:
+            while time.monotonic() < deadline:
+                events = [(e.id, e.kind, e.payload) for e in events_since(session, cursor)]
+                # End the read transaction so the next poll sees other workers' commits
+                session.rollback()
+
+                for event_id, kind, payload in events:
+                    cursor = event_id
+                    yield format_event(event_id, kind, payload)
+
+                if events:
+                    last_write = time.monotonic()
+                    continue
+
+                if time.monotonic() - last_write >= KEEPALIVE_SECONDS:
+                    last_write = time.monotonic()
+                    yield ": keep-alive\n\n"
+                time.sleep(EVENTS_POLL_SECONDS)
+        finally:
+            session.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
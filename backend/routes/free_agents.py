@@ -1,20 +1,63 @@
 from flask import Blueprint, jsonify, request
-from models import Team, Player, get_session
+from models import Player
+from services import get_db
+from cache import get_versions, bump_versions, ROSTERS
+import queries
+import rosters
+import trade_evaluator
+from events import publish
 
 free_agents_bp = Blueprint('free_agents', __name__)
 
+FREE_AGENT_PAGE_MAX = 200
+ROSTER_TRANSACTION_MAX = 100
+
 @free_agents_bp.route('/free-agents', methods=['GET'])
 def get_free_agents():
-    """Get all free agents"""
-    session = get_session()
-    fa_team = session.query(Team).filter_by(team_type='Free Agent').first()
-    
-    if not fa_team:
-        return jsonify([])
+    """
+    Search the free agent pool (best scorers first by default)
     
-    players = session.query(Player).filter_by(team_id=fa_team.id).order_by(Player.ppg.desc()).all()
+    Query params:
+        position: one or more positions, e.g. PG,SG
+        min_<stat> / max_<stat>: inclusive bounds on ppg, rpg, apg, spg, bpg,
+                                 fg_pct, three_pt_pct, ft_pct, mpg or weight
+        name: case-insensitive name prefix
+        sort: comma-separated columns, '-' for descending (default -ppg)
+        limit: page size (max 200); without it every match is returned
+        cursor: the X-Next-Cursor header of the previous page
+    """
+    session = get_db()
+    args = request.args
+    try:
+        ranges = {}
+        for stat in queries.FREE_AGENT_STATS:
+            low = args.get(f'min_{stat}', type=float)
+            high = args.get(f'max_{stat}', type=float)
+            if low is not None or high is not None:
+                ranges[stat] = (low, high)
+        limit = args.get('limit', type=int)
+        if limit is not None and not 1 <= limit <= FREE_AGENT_PAGE_MAX:
+            raise queries.InvalidQuery(f"limit must be between 1 and {FREE_AGENT_PAGE_MAX}")
+        if args.get('cursor') and limit is None:
+            raise queries.InvalidQuery("cursor needs a limit")
+        positions = [p.strip().upper() for p in args.get('position', '').split(',') if p.strip()]
+        
+        fa_team_id = queries.free_agent_team_id(session, get_versions(session))
+        if fa_team_id is None:
+            return jsonify([])
+        players, next_cursor = queries.search_free_agents(
+            session, fa_team_id,
+            positions=positions,
+            ranges=ranges,
+            name_prefix=args.get('name', '').strip(),
+            sort=args.get('sort', '-ppg'),
+            limit=limit,
+            cursor=args.get('cursor')
+        )
+    except queries.InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify([{
+    response = jsonify([{
         'id': p.id,
         'name': p.name,
         'position': p.position,
@@ -30,6 +73,9 @@ def get_free_agents():
         'ft_pct': p.ft_pct,
         'mpg': p.mpg
     } for p in players])
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @free_agents_bp.route('/players/<int:player_id>/sign', methods=['POST'])
 def sign_player(player_id):
@@ -39,53 +85,65 @@ def sign_player(player_id):
     
     if not team_id:
         return jsonify({'error': 'team_id required'}), 400
+    try:
+        team_id = int(team_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'team_id must be an integer'}), 400
     
-    session = get_session()
+    session = get_db()
+    versions = get_versions(session)
+    teams = queries.team_directory(session, versions)
     player = session.query(Player).filter_by(id=player_id).first()
-    team = session.query(Team).filter_by(id=team_id).first()
+    team = teams.get(team_id)
     
     if not player or not team:
         return jsonify({'error': 'Player or team not found'}), 404
     
     # Check if player is a free agent
-    fa_team = session.query(Team).filter_by(team_type='Free Agent').first()
-    if player.team_id != fa_team.id:
+    if player.team_id != queries.free_agent_team_id(session, versions):
         return jsonify({'error': 'Player is not a free agent'}), 400
     
     # Sign player to team
-    old_team_name = player.team.name if player.team else "Free Agency"
+    old_team_name = teams[player.team_id]['name'] if player.team_id in teams else "Free Agency"
+    publish(session, 'roster_move', player_id=player.id, move='sign',
+            from_team_id=player.team_id, to_team_id=team_id)
     player.team_id = team_id
+    bump_versions(session, ROSTERS)
     session.commit()
     
     return jsonify({
-        'message': f'{player.name} signed to {team.city} {team.name}',
+        'message': f"{player.name} signed to {team['full_name']}",
         'player': player.name,
         'old_team': old_team_name,
-        'new_team': f'{team.city} {team.name}'
+        'new_team': team['full_name']
     })
 
 @free_agents_bp.route('/players/<int:player_id>/release', methods=['POST'])
 def release_player(player_id):
     """Release a player to free agency"""
-    session = get_session()
+    session = get_db()
+    versions = get_versions(session)
     player = session.query(Player).filter_by(id=player_id).first()
-    fa_team = session.query(Team).filter_by(team_type='Free Agent').first()
+    fa_team_id = queries.free_agent_team_id(session, versions)
     
     if not player:
         return jsonify({'error': 'Player not found'}), 404
     
-    if not fa_team:
+    if fa_team_id is None:
         return jsonify({'error': 'Free agent team not found'}), 404
     
     # Release player
-    old_team = player.team
-    player.team_id = fa_team.id
+    old_team = queries.team_name(queries.team_directory(session, versions), player.team_id, 'Unknown')
+    publish(session, 'roster_move', player_id=player.id, move='release',
+            from_team_id=player.team_id, to_team_id=fa_team_id)
+    player.team_id = fa_team_id
+    bump_versions(session, ROSTERS)
     session.commit()
     
     return jsonify({
         'message': f'{player.name} released to free agency',
         'player': player.name,
-        'old_team': f'{old_team.city} {old_team.name}' if old_team else 'Unknown'
+        'old_team': old_team
     })
 
 @free_agents_bp.route('/players/trade', methods=['POST'])
@@ -99,7 +157,7 @@ def trade_players():
     if not player_ids_team1 or not player_ids_team2:
         return jsonify({'error': 'Both teams must trade at least one player'}), 400
     
-    session = get_session()
+    session = get_db()
     
     # Get all players
     players_team1 = session.query(Player).filter(Player.id.in_(player_ids_team1)).all()
@@ -121,19 +179,132 @@ def trade_players():
     # Perform the trade
     for player in players_team1:
         player.team_id = team2_id
+        publish(session, 'roster_move', player_id=player.id, move='trade',
+                from_team_id=team1_id, to_team_id=team2_id)
     
     for player in players_team2:
         player.team_id = team1_id
+        publish(session, 'roster_move', player_id=player.id, move='trade',
+                from_team_id=team2_id, to_team_id=team1_id)
     
+    bump_versions(session, ROSTERS)
     session.commit()
     
-    team1 = session.query(Team).filter_by(id=team1_id).first()
-    team2 = session.query(Team).filter_by(id=team2_id).first()
+    teams = queries.team_directory(session, get_versions(session))
     
     return jsonify({
         'message': 'Trade completed',
-        'team1': f'{team1.city} {team1.name}',
-        'team2': f'{team2.city} {team2.name}',
+        'team1': queries.team_name(teams, team1_id),
+        'team2': queries.team_name(teams, team2_id),
         'team1_receives': [p.name for p in players_team2],
         'team2_receives': [p.name for p in players_team1]
     })
+
+@free_agents_bp.route('/players/evaluate', methods=['POST'])
+def evaluate_move():
+    """
+    Dry run of a trade, signing or release, or of a whole list of them:
+    simulate the affected teams against the league before and after and
+    return win rate and stat deltas, without changing anything (see
+    trade_evaluator.py)
+    
+    Body: one move (see rosters.py), e.g.
+        {"action": "trade", "player_ids_team1": [1, 2], "player_ids_team2": [30]}
+        {"action": "sign", "player_id": 400, "team_id": 3}
+        {"action": "release", "player_id": 12}
+    or {"moves": [...]} as for /rosters/transactions.
+    Optional: simulations (games per team, default 5000, max 50000), seed
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    simulations = data.get('simulations', trade_evaluator.DEFAULT_SIMULATIONS)
+    if not isinstance(simulations, int) or not 1 <= simulations <= trade_evaluator.MAX_SIMULATIONS:
+        return jsonify({'error': f'simulations must be between 1 and {trade_evaluator.MAX_SIMULATIONS}'}), 400
+    seed = data.get('seed')
+    if seed is not None and (not isinstance(seed, int) or seed < 0):
+        return jsonify({'error': 'seed must be a non-negative integer'}), 400
+    
+    session = get_db()
+    snapshot = rosters.cached_snapshot(session, get_versions(session))
+    # The simulation only needs the snapshot
+    session.rollback()
+    if 'moves' in data:
+        items = data['moves']
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'moves must be a non-empty list'}), 400
+        _, errors, final = rosters.plan_moves(snapshot, items)
+        if errors:
+            return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+        moves = {p: final.team_of(p) for p, (_, team_id, _) in snapshot.players.items()
+                 if final.team_of(p) != team_id}
+    else:
+        try:
+            moves = rosters.resolve_move(snapshot, data)
+        except rosters.PlayerNotFound as e:
+            return jsonify({'error': str(e)}), 404
+        except rosters.InvalidMove as e:
+            return jsonify({'error': str(e)}), 400
+    
+    return jsonify(trade_evaluator.evaluate(snapshot, moves, simulations, seed))
+
+@free_agents_bp.route('/rosters/transactions', methods=['POST'])
+def roster_transactions():
+    """
+    Apply an ordered list of signings, releases and trades in one transaction.
+    Each move is checked against the rosters as the moves before it left
+    them; if any is invalid nothing is applied. Rosters are bumped once, so
+    cached views are rebuilt once for the whole batch.
+    
+    Body: {"moves": [...]} or the list itself; moves as in rosters.py
+    """
+    data = request.get_json(silent=True)
+    items = data.get('moves') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Expected a non-empty list of moves'}), 400
+    if len(items) > ROSTER_TRANSACTION_MAX:
+        return jsonify({'error': f'At most {ROSTER_TRANSACTION_MAX} moves per request'}), 400
+    
+    session = get_db()
+    snapshot = rosters.cached_snapshot(session, get_versions(session))
+    resolved, errors, final = rosters.plan_moves(snapshot, items)
+    if errors:
+        return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+    
+    results = []
+    current = {}
+    for index, (item, moves) in enumerate(zip(items, resolved)):
+        applied = []
+        for player_id, team_id in moves.items():
+            from_team_id = current.get(player_id, snapshot.team_of(player_id))
+            current[player_id] = team_id
+            publish(session, 'roster_move', player_id=player_id, move=item['action'],
+                    from_team_id=from_team_id, to_team_id=team_id)
+            applied.append({
+                'player_id': player_id,
+                'player': snapshot.players[player_id][0],
+                'from_team': snapshot.teams.get(from_team_id),
+                'to_team': snapshot.teams.get(team_id)
+            })
+        results.append({'index': index, 'action': item['action'], 'moves': applied})
+    
+    # Only the net change is written; the expected current team guards
+    # against a move made by another request since the snapshot was taken
+    changed = [(p, snapshot.team_of(p), team_id) for p, team_id in current.items()
+               if team_id != snapshot.team_of(p)]
+    for player_id, from_team_id, team_id in changed:
+        updated = session.query(Player).filter_by(id=player_id, team_id=from_team_id)\
+                         .update({Player.team_id: team_id}, synchronize_session=False)
+        if updated != 1:
+            session.rollback()
+            return jsonify({'error': 'Rosters changed while the moves were being applied; please retry'}), 409
+    bump_versions(session, ROSTERS)
+    session.commit()
+    
+    return jsonify({
+        'message': f'{len(items)} roster moves applied',
+        'applied': len(items),
+        'players_moved': len(changed),
+        'results': results
+    })
@@ -0,0 +1,34 @@
+from flask import Blueprint, jsonify, send_from_directory
+import os
+
+frontend_bp = Blueprint('frontend', __name__)
+
+# Use absolute path from /app root
+FRONTEND_BUILD_DIR = '/app/frontend/build'
+
+# Serve static files (CSS, JS, etc.)
+@frontend_bp.route('/static/css/<path:filename>')
+def serve_css(filename):
+    return send_from_directory(os.path.join(FRONTEND_BUILD_DIR, 'static', 'css'), filename)
+
+@frontend_bp.route('/static/js/<path:filename>')
+def serve_js(filename):
+    return send_from_directory(os.path.join(FRONTEND_BUILD_DIR, 'static', 'js'), filename)
+
+@frontend_bp.route('/', defaults={'path': ''})
+@frontend_bp.route('/<path:path>')
+def serve_frontend(path):
+    # API routes should not be caught here
+    if path.startswith('api/'):
+        return jsonify({'error': 'Not found'}), 404
+    
+    target = os.path.join(FRONTEND_BUILD_DIR, path)
+    if path and os.path.exists(target) and os.path.isfile(target):
+        return send_from_directory(FRONTEND_BUILD_DIR, path)
+    
+    # Always serve index.html for frontend routes
+    index_path = os.path.join(FRONTEND_BUILD_DIR, 'index.html')
+    if os.path.exists(index_path):
+        return send_from_directory(FRONTEND_BUILD_DIR, 'index.html')
+    
+    return jsonify({'error': 'Frontend not built. Run npm run build in frontend/'}), 404
@@ -0,0 +1,455 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+from models import Series, Game, PlayerGameStats, PlayByPlay
+from game_extrapolator import GameExtrapolator
+from play_by_play_generator import PlayByPlayGenerator
+from tournament_manager import TournamentManager, SeriesDecided
+from services import get_db, get_extrapolator, get_pbp_generator, get_tournament_manager
+from cache import get_versions, bump_versions, BRACKET, GAMES
+from events import publish, series_row
+from metrics import stage
+import queries
+
+games_bp = Blueprint('games', __name__)
+
+@games_bp.route('/games/preview', methods=['POST'])
+def preview_game():
+    """Preview extrapolated game scores without creating the game"""
+    data = request.json
+    
+    try:
+        home_team_id = data['home_team_id']
+        away_team_id = data['away_team_id']
+        quarter_number = data['quarter_number']
+        home_score = data['home_score']
+        away_score = data['away_score']
+        
+        if quarter_number not in [1, 2, 3, 4]:
+            return jsonify({'error': 'Quarter number must be 1-4'}), 400
+        
+        session = get_db()
+        teams = queries.team_directory(session, get_versions(session))
+        home_team = queries.team_name(teams, home_team_id)
+        away_team = queries.team_name(teams, away_team_id)
+        
+        if not home_team or not away_team:
+            return jsonify({'error': 'Invalid team IDs'}), 400
+        
+        home_base_rate = home_score / 12
+        away_base_rate = away_score / 12
+        
+        quarters_data = get_extrapolator()._generate_all_quarters(
+            home_base_rate, away_base_rate, quarter_number,
+            home_score, away_score
+        )
+        
+        home_total = sum(quarters_data['home'])
+        away_total = sum(quarters_data['away'])
+        
+        return jsonify({
+            'home_team': home_team,
+            'away_team': away_team,
+            'quarters': {
+                'home': quarters_data['home'],
+                'away': quarters_data['away']
+            },
+            'final_score': {
+                'home': home_total,
+                'away': away_total
+            },
+            'winner': home_team if home_total > away_total else away_team
+        })
+    except KeyError as e:
+        return jsonify({'error': f'Missing required field: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@games_bp.route('/games/create', methods=['POST'])
+def create_game():
+    """Create and simulate a game from quarter input"""
+    data = request.json
+    
+    try:
+        home_team_id = data['home_team_id']
+        away_team_id = data['away_team_id']
+        quarter_number = data['quarter_number']
+        home_score = data['home_score']
+        away_score = data['away_score']
+        series_id = data.get('series_id')
+        
+        if quarter_number not in [1, 2, 3, 4]:
+            return jsonify({'error': 'Quarter number must be 1-4'}), 400
+        
+        extrapolator = get_extrapolator()
+        game = extrapolator.extrapolate_game(
+            home_team_id, away_team_id, 
+            quarter_number, home_score, away_score,
+            series_id=series_id
+        )
+        
+        if series_id:
+            with stage('game_number_in_series'):
+                game.game_number_in_series = len([g for g in extrapolator.session.query(Game).filter_by(series_id=series_id).all()]) + 1
+                bump_versions(extrapolator.session, GAMES)
+                extrapolator.session.commit()
+            
+            winner_id = game.home_team_id if game.home_team_score > game.away_team_score else game.away_team_id
+            get_tournament_manager().update_series_result(series_id, winner_id)
+        
+        get_pbp_generator().generate_play_by_play(game)
+        
+        return jsonify({
+            'game_id': game.id,
+            'message': 'Game created and simulated successfully',
+            'final_score': {
+                'home': game.home_team_score,
+                'away': game.away_team_score
+            }
+        })
+        
+    except KeyError as e:
+        return jsonify({'error': f'Missing required field: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+BULK_GAMES_MAX = 100
+BULK_GAME_FIELDS = ('home_team_id', 'away_team_id', 'quarter_number', 'home_score', 'away_score')
+
+def validate_bulk_games(session, items):
+    """
+    Validate a batch of game inputs before anything is written.
+    Series are checked in input order against their projected wins, so a
+    batch cannot keep playing a series that an earlier item already decided.
+    This runs before the write lock is taken; update_series_result checks
+    again under the lock for games another request added in between.
+    Returns a list of {'index', 'error'} dicts (empty when the batch is valid).
+    """
+    errors = []
+    team_ids = set(queries.team_directory(session, get_versions(session)))
+    series_ids = {item.get('series_id') for item in items if isinstance(item, dict) and item.get('series_id')}
+    series_map = {s.id: s for s in session.query(Series).filter(Series.id.in_(series_ids))} if series_ids else {}
+    projected_wins = {s.id: [s.team1_wins or 0, s.team2_wins or 0] for s in series_map.values()}
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'Each game must be an object'})
+            continue
+
+        missing = [field for field in BULK_GAME_FIELDS if field not in item]
+        if missing:
+            errors.append({'index': index, 'error': f"Missing required field: {', '.join(missing)}"})
+            continue
+
+        if not all(isinstance(item[field], int) and not isinstance(item[field], bool) for field in BULK_GAME_FIELDS):
+            errors.append({'index': index, 'error': 'Team IDs, quarter number and scores must be integers'})
+            continue
+
+        if item['quarter_number'] not in [1, 2, 3, 4]:
+            errors.append({'index': index, 'error': 'Quarter number must be 1-4'})
+            continue
+
+        if item['home_score'] < 0 or item['away_score'] < 0:
+            errors.append({'index': index, 'error': 'Scores cannot be negative'})
+            continue
+
+        if item['home_team_id'] == item['away_team_id'] or not {item['home_team_id'], item['away_team_id']} <= team_ids:
+            errors.append({'index': index, 'error': 'Invalid team IDs'})
+            continue
+
+        series_id = item.get('series_id')
+        if series_id:
+            series = series_map.get(series_id)
+            if not series:
+                errors.append({'index': index, 'error': f'Series {series_id} not found'})
+                continue
+            if {item['home_team_id'], item['away_team_id']} != {series.team1_id, series.team2_id}:
+                errors.append({'index': index, 'error': f'Teams are not playing in series {series_id}'})
+                continue
+            wins = projected_wins[series_id]
+            if series.is_completed or max(wins) >= 4:
+                errors.append({'index': index, 'error': f'Series {series_id} is already decided'})
+                continue
+
+            # The team that won the input quarter always wins the game
+            winner_id = item['home_team_id'] if item['home_score'] > item['away_score'] else item['away_team_id']
+            wins[0 if winner_id == series.team1_id else 1] += 1
+
+    return errors
+
+@games_bp.route('/games/bulk', methods=['POST'])
+def create_games_bulk():
+    """Create and simulate a batch of games in a single transaction"""
+    data = request.get_json(silent=True)
+    items = data.get('games') if isinstance(data, dict) else data
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Expected a non-empty list of games'}), 400
+    if len(items) > BULK_GAMES_MAX:
+        return jsonify({'error': f'At most {BULK_GAMES_MAX} games per request'}), 400
+
+    session = get_db()
+    errors = validate_bulk_games(session, items)
+    if errors:
+        return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+
+    # All services share the request session and only flush; we commit once at the end
+    bulk_extrapolator = GameExtrapolator(session=session, autocommit=False)
+    bulk_pbp_generator = PlayByPlayGenerator(session=session, autocommit=False)
+    bulk_tournament_mgr = TournamentManager(session=session, autocommit=False)
+
+    try:
+        games = bulk_extrapolator.extrapolate_games(items)
+
+        results = []
+        decided_rounds = set()
+        for index, (item, game) in enumerate(zip(items, games)):
+            series_id = item.get('series_id')
+            if series_id:
+                # Later games of this batch are already flushed, so count only earlier ids
+                game.game_number_in_series = session.query(func.count(Game.id)).filter(
+                    Game.series_id == series_id, Game.id < game.id
+                ).scalar() + 1
+
+                winner_id = game.home_team_id if game.home_team_score > game.away_team_score else game.away_team_id
+                try:
+                    series = bulk_tournament_mgr.update_series_result(series_id, winner_id, advance=False,
+                                                                      reject_decided=True)
+                except SeriesDecided as e:
+                    # Another request finished the series after validation; apply nothing
+                    session.rollback()
+                    return jsonify({'error': 'Validation failed', 'errors': [{'index': index, 'error': str(e)}]}), 409
+                if series.is_completed:
+                    decided_rounds.add((series.run_id, series.tournament_round))
+
+            bulk_pbp_generator.generate_play_by_play(game)
+
+            results.append({
+                'index': index,
+                'game_id': game.id,
+                'series_id': game.series_id,
+                'game_number_in_series': game.game_number_in_series,
+                'final_score': {
+                    'home': game.home_team_score,
+                    'away': game.away_team_score
+                }
+            })
+
+        # Advance the bracket once per affected round, after every result is in;
+        # a round only counts as completed once all of its series are
+        completed_rounds = set()
+        for run_id, round_number in sorted(decided_rounds, key=lambda r: (r[0] or 0, r[1])):
+            if bulk_tournament_mgr._check_and_advance_round(round_number, run_id=run_id):
+                completed_rounds.add(round_number)
+
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({
+        'message': f'{len(results)} games created and simulated successfully',
+        'created': len(results),
+        'rounds_completed': sorted(completed_rounds),
+        'results': results
+    })
+
+@games_bp.route('/games/<int:game_id>', methods=['GET'])
+def get_game(game_id):
+    """Get complete game details"""
+    session = get_db()
+    game = session.query(Game).filter_by(id=game_id).first()
+    
+    if not game:
+        return jsonify({'error': 'Game not found'}), 404
+    
+    teams = queries.team_directory(session, get_versions(session))
+    home_stats = session.query(PlayerGameStats).filter_by(
+        game_id=game_id, team_id=game.home_team_id
+    ).all()
+    
+    away_stats = session.query(PlayerGameStats).filter_by(
+        game_id=game_id, team_id=game.away_team_id
+    ).all()
+    
+    def format_player_stats(stats):
+        return [{
+            'player_name': s.player.name,
+            'minutes': s.minutes_played,
+            'points': s.points,
+            'rebounds': s.rebounds,
+            'assists': s.assists,
+            'steals': s.steals,
+            'blocks': s.blocks,
+            'fg': f"{s.fgm}/{s.fga}",
+            'three_pt': f"{s.three_pm}/{s.three_pa}",
+            'ft': f"{s.ftm}/{s.fta}",
+            'turnovers': s.turnovers,
+            'fouls': s.fouls,
+            'plus_minus': s.plus_minus,
+            'ts_pct': s.true_shooting_pct,
+            'per': s.per
+        } for s in stats]
+    
+    return jsonify({
+        'id': game.id,
+        'date': game.game_date.isoformat(),
+        'home_team': {
+            'id': game.home_team_id,
+            'name': queries.team_name(teams, game.home_team_id),
+            'score': game.home_team_score,
+            'quarter_scores': [game.home_q1, game.home_q2, game.home_q3, game.home_q4]
+        },
+        'away_team': {
+            'id': game.away_team_id,
+            'name': queries.team_name(teams, game.away_team_id),
+            'score': game.away_team_score,
+            'quarter_scores': [game.away_q1, game.away_q2, game.away_q3, game.away_q4]
+        },
+        'input_data': {
+            'quarter': game.input_quarter_number,
+            'home_score': game.input_home_score,
+            'away_score': game.input_away_score
+        },
+        'box_score': {
+            'home': format_player_stats(home_stats),
+            'away': format_player_stats(away_stats)
+        }
+    })
+
+@games_bp.route('/games/<int:game_id>/playbyplay', methods=['GET'])
+def get_play_by_play(game_id):
+    """Get play-by-play for a game"""
+    session = get_db()
+    plays = session.query(PlayByPlay).filter_by(game_id=game_id).order_by(
+        PlayByPlay.game_time_seconds
+    ).all()
+    
+    if not plays:
+        return jsonify({'error': 'No play-by-play data found'}), 404
+    
+    return jsonify([{
+        'id': p.id,
+        'quarter': p.quarter,
+        'time': p.time_remaining,
+        'event_type': p.event_type,
+        'description': p.description,
+        'home_score': p.home_score,
+        'away_score': p.away_score,
+        'details': p.details
+    } for p in plays])
+
+@games_bp.route('/games/<int:game_id>', methods=['DELETE'])
+def delete_game(game_id):
+    """Delete a game and revert series wins"""
+    session = get_db()
+    game = session.query(Game).filter_by(id=game_id).first()
+    
+    if not game:
+        return jsonify({'error': 'Game not found'}), 404
+    
+    if game.series_id:
+        series = session.query(Series).filter_by(id=game.series_id).first()
+        if series:
+            if game.home_team_score > game.away_team_score:
+                if series.team1_id == game.home_team_id:
+                    series.team1_wins = max(0, series.team1_wins - 1)
+                else:
+                    series.team2_wins = max(0, series.team2_wins - 1)
+            else:
+                if series.team1_id == game.away_team_id:
+                    series.team1_wins = max(0, series.team1_wins - 1)
+                else:
+                    series.team2_wins = max(0, series.team2_wins - 1)
+            
+            series.is_completed = False
+            series.winner_team_id = None
+            publish(session, 'series_updated', **series_row(series))
+    
+    session.query(PlayerGameStats).filter_by(game_id=game_id).delete()
+    session.query(PlayByPlay).filter_by(game_id=game_id).delete()
+    session.delete(game)
+    publish(session, 'game_deleted', id=game_id, series_id=game.series_id)
+    bump_versions(session, GAMES, BRACKET)
+    session.commit()
+    
+    return jsonify({'message': 'Game deleted successfully'})
+
+@games_bp.route('/games', methods=['GET'])
+def get_all_games():
+    """Get all games"""
+    session = get_db()
+    return jsonify(queries.cached_games(session, get_versions(session)))
+
+@games_bp.route('/games/history', methods=['GET'])
+def get_game_history():
+    """Get recent games with detailed info (game feed)"""
+    session = get_db()
+    
+    run_id = request.args.get('run_id', type=int)
+    limit = request.args.get('limit', type=int, default=20)
+    team_id = request.args.get('team_id', type=int)
+    
+    query = session.query(Game).filter(Game.is_completed == True)
+    
+    if run_id:
+        query = query.filter(Game.run_id == run_id)
+    
+    if team_id:
+        query = query.filter(
+            (Game.home_team_id == team_id) | (Game.away_team_id == team_id)
+        )
+    
+    games = query.order_by(Game.game_date.desc()).limit(limit).all()
+    
+    teams = queries.team_directory(session, get_versions(session))
+    result = []
+    for g in games:
+        home_team, away_team = teams[g.home_team_id], teams[g.away_team_id]
+        home_won = g.home_team_score > g.away_team_score
+        margin = abs(g.home_team_score - g.away_team_score)
+        
+        if margin <= 3:
+            game_type = "Nail-biter"
+        elif margin <= 10:
+            game_type = "Close game"
+        elif margin >= 20:
+            game_type = "Blowout"
+        else:
+            game_type = "Competitive"
+        
+        result.append({
+            'id': g.id,
+            'date': g.game_date.isoformat(),
+            'home_team': {
+                'id': g.home_team_id,
+                'name': home_team['full_name'],
+                'abbr': home_team['abbreviation'],
+                'score': g.home_team_score,
+                'won': home_won
+            },
+            'away_team': {
+                'id': g.away_team_id,
+                'name': away_team['full_name'],
+                'abbr': away_team['abbreviation'],
+                'score': g.away_team_score,
+                'won': not home_won
+            },
+            'margin': margin,
+            'game_type': game_type,
+            'series_info': {
+                'id': g.series_id,
+                'game_number': g.game_number_in_series,
+                'round': g.series.tournament_round if g.series else None
+            } if g.series_id else None,
+            'input_quarter': {
+                'number': g.input_quarter_number,
+                'home_score': g.input_home_score,
+                'away_score': g.input_away_score
+            },
+            'quarters': {
+                'home': [g.home_q1, g.home_q2, g.home_q3, g.home_q4],
+                'away': [g.away_q1, g.away_q2, g.away_q3, g.away_q4]
+            }
+        })
+    
+    return jsonify(result)
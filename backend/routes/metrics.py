@@ -0,0 +1,13 @@
+from flask import Blueprint, Response, jsonify
+from metrics import metrics_available, render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics, aggregated across gunicorn workers"""
+    if not metrics_available():
+        return jsonify({'error': 'prometheus_client is not installed'}), 503
+    
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
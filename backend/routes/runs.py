@@ -0,0 +1,72 @@
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+from models import Run
+from services import get_db, get_tournament_manager
+from cache import get_versions, bump_versions, RUNS
+import queries
+
+runs_bp = Blueprint('runs', __name__)
+
+@runs_bp.route('/runs', methods=['GET'])
+def get_runs():
+    """Get all tournament runs/seasons"""
+    session = get_db()
+    return jsonify(queries.cached_runs(session, get_versions(session)))
+
+@runs_bp.route('/runs', methods=['POST'])
+def create_run():
+    """Create a new tournament run/season"""
+    data = request.get_json()
+    
+    session = get_db()
+    session.query(Run).update({'is_active': False})
+    
+    new_run = Run(
+        name=data.get('name', f"Season {data.get('year', datetime.now().year)}"),
+        year=data.get('year', datetime.now().year),
+        is_active=True,
+        is_completed=False
+    )
+    session.add(new_run)
+    bump_versions(session, RUNS)
+    session.commit()
+    
+    result = get_tournament_manager().create_tournament_bracket(run_id=new_run.id)
+    
+    return jsonify({
+        'id': new_run.id,
+        'name': new_run.name,
+        'year': new_run.year,
+        'tournament_created': result is not None
+    })
+
+@runs_bp.route('/runs/<int:run_id>/activate', methods=['PUT'])
+def activate_run(run_id):
+    """Switch to a different run/season"""
+    session = get_db()
+    session.query(Run).update({'is_active': False})
+    
+    run = session.query(Run).filter_by(id=run_id).first()
+    if not run:
+        return jsonify({'error': 'Run not found'}), 404
+    
+    run.is_active = True
+    bump_versions(session, RUNS)
+    session.commit()
+    
+    return jsonify({
+        'id': run.id,
+        'name': run.name,
+        'is_active': True
+    })
+
+@runs_bp.route('/runs/active', methods=['GET'])
+def get_active_run():
+    """Get currently active run"""
+    session = get_db()
+    run = queries.cached_active_run(session, get_versions(session))
+    
+    if not run:
+        return jsonify({'error': 'No active run'}), 404
+    
+    return jsonify(run)
@@ -0,0 +1,128 @@
+from flask import Blueprint, request, jsonify
+from models import Game
+from services import get_db
+from cache import get_versions
+import queries
+
+stats_bp = Blueprint('stats', __name__)
+
+def resolve_leaders_run_filter(run_id, season_filter, active_run):
+    """Which run the leaders should cover: None for all seasons, else a run id."""
+    if season_filter == 'all':
+        return None  # Don't filter by run
+    if run_id:
+        return run_id
+    # Default to active run
+    return active_run['id'] if active_run else None
+
+def run_exists(session, versions, run_id):
+    """Whether run_id is an existing run; checked before it becomes part of a cache key."""
+    return any(run['id'] == run_id for run in queries.cached_runs(session, versions))
+
+@stats_bp.route('/stats/leaders', methods=['GET'])
+def get_stat_leaders():
+    """Get league leaders in various statistical categories"""
+    session = get_db()
+    
+    # Get optional run_id filter (defaults to active run)
+    run_id = request.args.get('run_id', type=int)
+    season_filter = request.args.get('season', 'current')  # 'current' or 'all'
+    
+    versions = get_versions(session)
+    if run_id and not run_exists(session, versions, run_id):
+        return jsonify({'error': f'Run {run_id} not found'}), 404
+    run_filter = resolve_leaders_run_filter(run_id, season_filter, queries.cached_active_run(session, versions))
+    return jsonify(queries.cached_stat_leaders(session, versions, run_filter))
+
+@stats_bp.route('/stats/input-performance', methods=['GET'])
+def get_input_performance():
+    """Get aggregated stats from user's quarter inputs"""
+    session = get_db()
+    run_id = request.args.get('run_id', type=int)
+    
+    games_query = session.query(Game).filter(Game.is_completed == True)
+    if run_id:
+        games_query = games_query.filter(Game.run_id == run_id)
+    
+    games = games_query.all()
+    
+    if not games:
+        return jsonify({
+            'total_games': 0,
+            'avg_total_score': 0,
+            'avg_home_score': 0,
+            'avg_away_score': 0,
+            'avg_point_diff': 0,
+            'highest_scoring_game': None,
+            'lowest_scoring_game': None,
+            'closest_game': None,
+            'biggest_blowout': None,
+            'quarters_played': {},
+            'recent_inputs': []
+        })
+    
+    total_home = sum(g.input_home_score for g in games)
+    total_away = sum(g.input_away_score for g in games)
+    total_combined = total_home + total_away
+    
+    point_diffs = [abs(g.input_home_score - g.input_away_score) for g in games]
+    
+    quarter_counts = {1: 0, 2: 0, 3: 0, 4: 0}
+    for g in games:
+        quarter_counts[g.input_quarter_number] = quarter_counts.get(g.input_quarter_number, 0) + 1
+    
+    highest_game = max(games, key=lambda g: g.input_home_score + g.input_away_score)
+    lowest_game = min(games, key=lambda g: g.input_home_score + g.input_away_score)
+    closest_game = min(games, key=lambda g: abs(g.input_home_score - g.input_away_score))
+    biggest_blowout = max(games, key=lambda g: abs(g.input_home_score - g.input_away_score))
+    teams = queries.team_directory(session, get_versions(session))
+    
+    return jsonify({
+        'total_games': len(games),
+        'avg_total_score': round(total_combined / len(games), 1),
+        'avg_home_score': round(total_home / len(games), 1),
+        'avg_away_score': round(total_away / len(games), 1),
+        'avg_point_diff': round(sum(point_diffs) / len(games), 1),
+        'highest_scoring_game': {
+            'game_id': highest_game.id,
+            'home_team': queries.team_name(teams, highest_game.home_team_id),
+            'away_team': queries.team_name(teams, highest_game.away_team_id),
+            'score': f"{highest_game.input_home_score}-{highest_game.input_away_score}",
+            'total': highest_game.input_home_score + highest_game.input_away_score
+        },
+        'lowest_scoring_game': {
+            'game_id': lowest_game.id,
+            'home_team': queries.team_name(teams, lowest_game.home_team_id),
+            'away_team': queries.team_name(teams, lowest_game.away_team_id),
+            'score': f"{lowest_game.input_home_score}-{lowest_game.input_away_score}",
+            'total': lowest_game.input_home_score + lowest_game.input_away_score
+        },
+        'closest_game': {
+            'game_id': closest_game.id,
+            'home_team': queries.team_name(teams, closest_game.home_team_id),
+            'away_team': queries.team_name(teams, closest_game.away_team_id),
+            'score': f"{closest_game.input_home_score}-{closest_game.input_away_score}",
+            'diff': abs(closest_game.input_home_score - closest_game.input_away_score)
+        },
+        'biggest_blowout': {
+            'game_id': biggest_blowout.id,
+            'home_team': queries.team_name(teams, biggest_blowout.home_team_id),
+            'away_team': queries.team_name(teams, biggest_blowout.away_team_id),
+            'score': f"{biggest_blowout.input_home_score}-{biggest_blowout.input_away_score}",
+            'diff': abs(biggest_blowout.input_home_score - biggest_blowout.input_away_score)
+        },
+        'quarters_played': quarter_counts,
+        'win_rate_by_score': {
+            '20+': round(len([g for g in games if max(g.input_home_score, g.input_away_score) >= 20]) / len(games) * 100, 1),
+            '25+': round(len([g for g in games if max(g.input_home_score, g.input_away_score) >= 25]) / len(games) * 100, 1),
+            '30+': round(len([g for g in games if max(g.input_home_score, g.input_away_score) >= 30]) / len(games) * 100, 1)
+        },
+        'recent_inputs': [{
+            'game_id': g.id,
+            'date': g.game_date.isoformat(),
+            'quarter': g.input_quarter_number,
+            'home_score': g.input_home_score,
+            'away_score': g.input_away_score,
+            'total': g.input_home_score + g.input_away_score
+        } for g in sorted(games, key=lambda x: x.game_date, reverse=True)[:10]]
+    })
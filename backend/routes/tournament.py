@@ -0,0 +1,107 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+from models import Series, Game
+from services import get_db, get_tournament_manager
+from cache import get_versions
+import queries
+
+tournament_bp = Blueprint('tournament', __name__)
+
+@tournament_bp.route('/tournament/initialize', methods=['POST'])
+def initialize_tournament():
+    """Initialize tournament bracket"""
+    try:
+        result = get_tournament_manager().create_tournament_bracket()
+        return jsonify({
+            'message': 'Tournament initialized',
+            'round1_series': len(result['round1_series']) if result else 0,
+            'total_teams': result['total_teams'] if result else 0
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tournament_bp.route('/tournament/overview', methods=['GET'])
+def get_tournament_overview():
+    """Get complete tournament overview"""
+    session = get_db()
+    return jsonify(queries.cached_tournament_overview(session, get_versions(session)))
+
+@tournament_bp.route('/tournament/series/<int:series_id>', methods=['GET'])
+def get_series(series_id):
+    """Get detailed series information"""
+    session = get_db()
+    series = session.get(Series, series_id)
+    
+    if not series:
+        return jsonify({'error': 'Series not found'}), 404
+    
+    teams = queries.team_directory(session, get_versions(session))
+    games_played = session.query(func.count(Game.id)).filter_by(series_id=series_id).scalar()
+    return jsonify({
+        'id': series.id,
+        'round': series.tournament_round,
+        'team1': {
+            'id': series.team1_id,
+            'name': queries.team_name(teams, series.team1_id),
+            'wins': series.team1_wins
+        },
+        'team2': {
+            'id': series.team2_id,
+            'name': queries.team_name(teams, series.team2_id),
+            'wins': series.team2_wins
+        },
+        'games_played': games_played,
+        'is_completed': series.is_completed,
+        'winner': queries.team_name(teams, series.winner_team_id) if series.is_completed else None
+    })
+
+@tournament_bp.route('/tournament/active-series', methods=['GET'])
+def get_active_series():
+    """Get all active (incomplete) series"""
+    session = get_db()
+    return jsonify(queries.cached_active_series(session, get_versions(session)))
+
+@tournament_bp.route('/tournament/advance-round/<int:round_number>', methods=['POST'])
+def advance_round(round_number):
+    """Create next round matchups after current round completes"""
+    try:
+        next_series = get_tournament_manager().create_next_round(round_number)
+        return jsonify({
+            'message': f'Round {round_number + 1} created',
+            'matchups': len(next_series)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tournament_bp.route('/tournament/reset', methods=['POST'])
+def reset_tournament():
+    """Reset the current tournament"""
+    try:
+        data = request.get_json() or {}
+        run_id = data.get('run_id')
+        result = get_tournament_manager().reset_tournament(run_id=run_id)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tournament_bp.route('/tournament/series/<int:series_id>/games', methods=['GET'])
+def get_series_games(series_id):
+    """Get all games for a specific series"""
+    session = get_db()
+    games = session.query(Game).filter_by(series_id=series_id).order_by(Game.game_date).all()
+    teams = queries.team_directory(session, get_versions(session))
+    
+    return jsonify([{
+        'id': g.id,
+        'game_number': g.game_number_in_series,
+        'date': g.game_date.isoformat(),
+        'home_team': queries.team_name(teams, g.home_team_id),
+        'away_team': queries.team_name(teams, g.away_team_id),
+        'home_score': g.home_team_score,
+        'away_score': g.away_team_score,
+        'winner': queries.team_name(teams, g.home_team_id if g.home_team_score > g.away_team_score else g.away_team_id),
+        'quarters': {
+            'home': [g.home_q1, g.home_q2, g.home_q3, g.home_q4],
+            'away': [g.away_q1, g.away_q2, g.away_q3, g.away_q4]
+        }
+    } for g in games])
@@ -0,0 +1,52 @@
+"""
+Request-scoped database session and services for the route blueprints.
+
+Each request gets one session (get_db) that every service it uses shares,
+and the session is closed when the request ends. Nothing loaded during a
+request outlives it, and every request starts from a fresh view of the
+database, including rows committed by other gunicorn workers.
+
+Scripts and background jobs should use models.session_scope() instead.
+"""
+from flask import g
+from models import get_session
+from game_extrapolator import GameExtrapolator
+from play_by_play_generator import PlayByPlayGenerator
+from tournament_manager import TournamentManager
+
+
+def get_db():
+    """The session for the current request, opened on first use."""
+    if 'db' not in g:
+        g.db = get_session()
+    return g.db
+
+
+def close_db(exception=None):
+    """Teardown hook: roll back anything uncommitted and release the connection."""
+    session = g.pop('db', None)
+    if session is not None:
+        session.close()
+
+
+def _get(service_class):
+    services = g.setdefault('services', {})
+    if service_class not in services:
+        services[service_class] = service_class(session=get_db())
+    return services[service_class]
+
+
+def get_extrapolator():
+    return _get(GameExtrapolator)
+
+
+def get_pbp_generator():
+    return _get(PlayByPlayGenerator)
+
+
+def get_tournament_manager():
+    return _get(TournamentManager)
+
+
+def init_services(app):
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,93 @@
+"""
+Consistent copies of the live SQLite database.
+
+Copying basketball_sim.db with a plain file read while other workers write to
+it can produce a torn file (and misses anything still in a -wal file).
+create_snapshot() uses SQLite's online backup API instead. It copies
+SNAPSHOT_PAGES_PER_STEP pages at a time and sleeps in between, so writers get
+the lock back after every step. When another connection writes during the
+copy, SQLite restarts it; if that keeps the copy from finishing within
+SNAPSHOT_PACED_SECONDS, it is redone in one step, which blocks writers only
+for the length of a single copy.
+
+cached_snapshot() reuses a snapshot for SNAPSHOT_CACHE_SECONDS, so repeated
+downloads don't redo the copy. The cache lives in the temp directory and is
+shared by every gunicorn worker.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from models import get_engine
+
+SNAPSHOT_PAGES_PER_STEP = int(os.environ.get('SNAPSHOT_PAGES_PER_STEP', 1024))
+SNAPSHOT_STEP_SLEEP = float(os.environ.get('SNAPSHOT_STEP_SLEEP', 0.005))
+SNAPSHOT_PACED_SECONDS = float(os.environ.get('SNAPSHOT_PACED_SECONDS', 30))
+# 0 disables the cache: every download gets a fresh snapshot
+SNAPSHOT_CACHE_SECONDS = float(os.environ.get('SNAPSHOT_CACHE_SECONDS', 60))
+SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'bball_snapshots')
+BUSY_TIMEOUT_SECONDS = 30
+
+
+class _PacingTimeout(Exception):
+    pass
+
+
+def database_path(db_path=None):
+    """Absolute path of the database the app's engine uses."""
+    return os.path.abspath(db_path or get_engine().url.database)
+
+
+def create_snapshot(dest, db_path=None):
+    """Copy the database to dest (overwritten) with the online backup API; returns dest."""
+    deadline = time.monotonic() + SNAPSHOT_PACED_SECONDS
+
+    def give_up_when_late(status, remaining, total):
+        if time.monotonic() > deadline:
+            raise _PacingTimeout()
+
+    source = sqlite3.connect(database_path(db_path), timeout=BUSY_TIMEOUT_SECONDS)
+    target = sqlite3.connect(dest)
+    try:
+        try:
+            source.backup(target, pages=SNAPSHOT_PAGES_PER_STEP,
+                          progress=give_up_when_late, sleep=SNAPSHOT_STEP_SLEEP)
+        except _PacingTimeout:
+            print("⚠ Paced snapshot kept restarting under writes; copying in one step")
+            source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return dest
+
+
+def new_snapshot_path():
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix='snapshot-', suffix='.db', dir=SNAPSHOT_DIR)
+    os.close(fd)
+    return path
+
+
+def cached_snapshot(db_path=None):
+    """
+    Path to a snapshot at most SNAPSHOT_CACHE_SECONDS old, and whether the
+    caller owns it (and must delete it once sent). Without the cache every
+    call makes a new, caller-owned snapshot.
+    """
+    if SNAPSHOT_CACHE_SECONDS <= 0:
+        return create_snapshot(new_snapshot_path(), db_path), True
+
+    key = hashlib.sha1(database_path(db_path).encode()).hexdigest()[:12]
+    cached = os.path.join(SNAPSHOT_DIR, f'latest-{key}.db')
+    try:
+        if time.time() - os.path.getmtime(cached) < SNAPSHOT_CACHE_SECONDS:
+            return cached, False
+    except OSError:
+        pass
+
+    # Build under a unique name, then swap it in atomically: a download that
+    # already opened the old file keeps reading it
+    path = create_snapshot(new_snapshot_path(), db_path)
+    os.replace(path, cached)
+    return cached, False
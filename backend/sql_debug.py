@@ -0,0 +1,168 @@
+"""
+Opt-in SQL instrumentation for finding N+1 query patterns.
+
+Hooks SQLAlchemy's engine events to count statements and their total time,
+and groups them by shape (the SQL text with parameter lists collapsed) so a
+lazy load fired once per row shows up as one shape repeated many times.
+
+Enable per request reporting with SQL_DEBUG=1 (env or app config); every
+response then carries:
+    X-SQL-Queries    number of statements
+    X-SQL-Time-ms    total time spent executing them
+    X-SQL-Repeated   shapes run at least SQL_DEBUG_REPEAT_THRESHOLD times,
+                     e.g. "16x SELECT teams.id ... WHERE teams.id = ?"
+and requests with repeated shapes are also logged.
+
+count_queries() and assert_max_queries() use the same collector outside of
+the request hooks, e.g. to keep a query budget per endpoint
+(see benchmarks/check_query_counts.py).
+"""
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REPEAT_THRESHOLD = int(os.environ.get('SQL_DEBUG_REPEAT_THRESHOLD', 5))
+SHAPE_HEADER_LENGTH = 120
+
+_local = threading.local()
+_listening = False
+_listen_lock = threading.Lock()
+
+_IN_LIST = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    """Normalize SQL so statements that differ only in IN-list length compare equal."""
+    return _IN_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class QueryCollector:
+    """Statements executed while the collector is active on this thread."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold=REPEAT_THRESHOLD):
+        """[(count, shape)] for shapes run at least threshold times, most frequent first."""
+        return [(n, shape) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def summary(self):
+        lines = [f"{self.count} queries in {self.total_time * 1000:.1f} ms"]
+        lines += [f"  {n}x {shape}" for n, shape in self.repeated()]
+        return '\n'.join(lines)
+
+
+def _active_collectors():
+    if not hasattr(_local, 'collectors'):
+        _local.collectors = []
+    return _local.collectors
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_collectors():
+        conn.info.setdefault('sql_debug_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active_collectors()
+    starts = conn.info.get('sql_debug_start')
+    if not collectors or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for collector in collectors:
+        collector.record(statement, elapsed)
+
+
+def _ensure_listening():
+    """Attach the engine event listeners once; they cost nothing while no collector is active."""
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listening = True
+
+
+@contextmanager
+def count_queries():
+    """Collect every statement executed on this thread inside the block."""
+    _ensure_listening()
+    collector = QueryCollector()
+    collectors = _active_collectors()
+    collectors.append(collector)
+    try:
+        yield collector
+    finally:
+        collectors.remove(collector)
+
+
+def assert_max_queries(client, path, max_queries, method='GET', **kwargs):
+    """
+    Issue a request through a Flask test client and raise AssertionError,
+    listing the repeated shapes, if it ran more than max_queries statements.
+    Returns (response, collector).
+    """
+    with count_queries() as collector:
+        response = client.open(path, method=method, **kwargs)
+    if collector.count > max_queries:
+        raise AssertionError(
+            f"{method} {path} ran {collector.count} queries (max {max_queries})\n{collector.summary()}"
+        )
+    return response, collector
+
+
+def sql_debug_enabled(app):
+    return str(app.config.get('SQL_DEBUG', os.environ.get('SQL_DEBUG', ''))).lower() in ('1', 'true', 'yes')
+
+
+def _start_request_collector():
+    _ensure_listening()
+    g.sql_collector = QueryCollector()
+    _active_collectors().append(g.sql_collector)
+
+
+def _report_request_queries(response):
+    collector = g.get('sql_collector')
+    if collector is None:
+        return response
+
+    response.headers['X-SQL-Queries'] = str(collector.count)
+    response.headers['X-SQL-Time-ms'] = f"{collector.total_time * 1000:.1f}"
+    repeated = collector.repeated()
+    if repeated:
+        response.headers['X-SQL-Repeated'] = ' | '.join(
+            f"{n}x {shape[:SHAPE_HEADER_LENGTH]}" for n, shape in repeated
+        )
+        print(f"⚠ Possible N+1 in {request.method} {request.path}: {collector.summary()}")
+    return response
+
+
+def _stop_request_collector(exception=None):
+    collector = g.pop('sql_collector', None)
+    collectors = _active_collectors()
+    if collector in collectors:
+        collectors.remove(collector)
+
+
+def init_sql_debug(app):
+    """Report per-request query counts in response headers when SQL_DEBUG is on."""
+    if not sql_debug_enabled(app):
+        return
+    app.before_request(_start_request_collector)
+    app.after_request(_report_request_queries)
+    app.teardown_request(_stop_request_collector)
+    print("SQL_DEBUG on: per-request query counts in X-SQL-* response headers")
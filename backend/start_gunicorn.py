@@ -5,8 +5,9 @@ import sys
 # Get PORT from environment, default to 8080
 port = os.environ.get('PORT', '8080')
 
-# Build gunicorn command
-cmd = f"gunicorn -w 4 -b 0.0.0.0:{port} app:app"
+# Build gunicorn command (workers, the one-time startup hook and the backup
+# scheduler process come from gunicorn.conf.py)
+cmd = ['gunicorn', '-c', 'gunicorn.conf.py', '-b', f'0.0.0.0:{port}', 'app:create_app()']
 
 # Execute gunicorn
-os.execvp('gunicorn', ['gunicorn', '-w', '4', '-b', f'0.0.0.0:{port}', 'app:app'])
+os.execvp('gunicorn', cmd)
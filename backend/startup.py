@@ -0,0 +1,94 @@
+"""
+One-time startup work: create missing tables, make sure there is an active
+run with a bracket and give older series games their run.
+
+Under gunicorn this runs once in the master before workers fork (see the
+on_starting hook in gunicorn.conf.py). Anywhere else it runs on the first
+request a process serves. Either way it happens inside a write-locked
+SQLite transaction, so processes that start together wait for the first one
+to finish and then find the run already created.
+"""
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from models import Game, Run, Series, ensure_schema, locking_engine
+from tournament_manager import TournamentManager
+from cache import bump_versions, GAMES, RUNS
+
+# Set by the gunicorn master once it has initialized the database, so forked
+# workers skip the check entirely
+INITIALIZED_ENV = 'BBALL_DB_INITIALIZED'
+
+_done = False
+_lock = threading.Lock()
+
+
+def auto_initialize_tournament(session):
+    """Create the initial run and its bracket if they do not exist yet."""
+    active_run = session.query(Run).filter_by(is_active=True).first()
+
+    if not active_run:
+        print("No active run found. Creating initial season...")
+        active_run = Run(
+            name=f"Season {datetime.now().year}",
+            year=datetime.now().year,
+            is_active=True,
+            is_completed=False
+        )
+        session.add(active_run)
+        bump_versions(session, RUNS)
+        session.flush()
+        print(f"✓ Created initial run: {active_run.name}")
+
+    existing_series = session.query(Series).filter_by(run_id=active_run.id).first()
+    if not existing_series:
+        print(f"No tournament found for {active_run.name}. Auto-initializing...")
+        result = TournamentManager(session=session, autocommit=False).create_tournament_bracket(run_id=active_run.id)
+        if result:
+            print(f"✓ Tournament auto-initialized with {result['round1_series']} Round 1 series")
+        else:
+            print("⚠ Tournament initialization returned None (check team count)")
+    else:
+        print(f"✓ Tournament already exists for {active_run.name}")
+
+
+def assign_game_runs(session):
+    """Set run_id on series games created before games were given their run (single game input)."""
+    series_run = select(Series.run_id).where(Series.id == Game.series_id).scalar_subquery()
+    updated = session.execute(
+        update(Game).where(Game.run_id.is_(None), Game.series_id.isnot(None)).values(run_id=series_run)
+    ).rowcount
+    if updated:
+        bump_versions(session, GAMES)
+        print(f"✓ Assigned {updated} series games to their run")
+
+
+def initialize_database(db_path='basketball_sim.db'):
+    """Run the startup work under the database write lock."""
+    ensure_schema(db_path)
+
+    engine = locking_engine(db_path)
+    session = Session(bind=engine)
+    try:
+        auto_initialize_tournament(session)
+        assign_game_runs(session)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"⚠ Error auto-initializing tournament: {e}")
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def initialize_once():
+    """Run initialize_database() at most once per process."""
+    global _done
+    if _done or os.environ.get(INITIALIZED_ENV):
+        return
+    with _lock:
+        if not _done:
+            initialize_database()
+            _done = True
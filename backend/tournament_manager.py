@@ -1,13 +1,29 @@
-from models import Team, Series, get_session
+from models import Team, Series, Run, get_session
+from cache import bump_versions, RUNS, BRACKET, GAMES
+from events import publish, series_row
+from metrics import timed_stage
 import random
 
+
+class SeriesDecided(ValueError):
+    """A result was recorded for a series that is already over."""
+
+
 class TournamentManager:
     """
     Manages the tournament bracket for 32 teams in a best-of-7 series format.
     """
     
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None, autocommit=True):
+        self.session = session or get_session()
+        self.autocommit = autocommit
+
+    def _commit(self):
+        """Commit, or only flush when the caller owns the transaction."""
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
     
     def create_tournament_bracket(self, run_id=None):
         """
@@ -77,7 +93,8 @@ class TournamentManager:
             self.session.add(series)
             round1_series.append(series)
         
-        self.session.commit()
+        bump_versions(self.session, BRACKET)
+        self._commit()
         
         print("Tournament Bracket Created with East/West Conferences!")
         print("\n=== EASTERN CONFERENCE - ROUND 1 ===")
@@ -92,13 +109,25 @@ class TournamentManager:
             'total_teams': 32
         }
     
-    def create_next_round(self, current_round):
+    def _active_run_id(self):
+        run = self.session.query(Run.id).filter_by(is_active=True).first()
+        return run[0] if run else None
+    
+    def _run_series(self, run_id):
+        """Series query limited to one run (the active run when run_id is None, if there is one)."""
+        if run_id is None:
+            run_id = self._active_run_id()
+        query = self.session.query(Series)
+        return query.filter(Series.run_id == run_id) if run_id is not None else query
+    
+    def create_next_round(self, current_round, run_id=None):
         """
         After a round completes, create the next round's matchups.
         Maintains conference separation until Finals.
+        Only series of the given run (default: the active run) are considered.
         """
         # Get all completed series from current round
-        completed_series = self.session.query(Series).filter_by(
+        completed_series = self._run_series(run_id).filter_by(
             tournament_round=current_round,
             is_completed=True
         ).all()
@@ -114,6 +143,10 @@ class TournamentManager:
         next_round = current_round + 1
         next_round_series = []
         
+        if self._run_series(run_id).filter_by(tournament_round=next_round).first():
+            print(f"Round {next_round} already exists")
+            return []
+        
         # If we're going into Round 5 (Finals), it's East champion vs West champion
         if next_round == 5:
             # Separate by conference
@@ -169,6 +202,9 @@ class TournamentManager:
                 self.session.add(series)
                 next_round_series.append(series)
             
+            # Flush so the new series can resolve team1/team2 for the log below
+            self.session.flush()
+            
             round_name = {
                 2: "ROUND 2 (Conference Quarterfinals)",
                 3: "ROUND 3 (Conference Semifinals)",
@@ -183,19 +219,37 @@ class TournamentManager:
             for series in next_round_series[len(east_winners)//2:]:
                 print(f"  Series {series.series_number}: {series.team1.city} {series.team1.name} vs {series.team2.city} {series.team2.name}")
         
-        self.session.commit()
+        if next_round_series:
+            self.session.flush()
+            publish(self.session, 'round_advanced', run_id=run_id, round=next_round,
+                    series_ids=[s.id for s in next_round_series])
+        
+        bump_versions(self.session, BRACKET)
+        self._commit()
         return next_round_series
     
-    def update_series_result(self, series_id, winning_team_id):
+    @timed_stage('update_series_result')
+    def update_series_result(self, series_id, winning_team_id, advance=True, reject_decided=False):
         """
         Update series when a game is completed.
         Check if series is won (best of 7, first to 4 wins).
         Auto-advance to next round if all series in current round are complete.
+        
+        Pass advance=False to skip the round check (e.g. when applying a batch
+        of results) and call _check_and_advance_round once per round afterwards.
+        With reject_decided=True a series that is already over raises
+        SeriesDecided instead of counting the win.
         """
-        series = self.session.query(Series).filter_by(id=series_id).first()
+        # Write first so the read-modify-write below runs under SQLite's write
+        # lock; otherwise concurrent workers can lose each other's wins.
+        # populate_existing: the session may hold the series as read before the lock
+        bump_versions(self.session, BRACKET)
+        series = self.session.query(Series).populate_existing().filter_by(id=series_id).first()
         
         if not series:
             return None
+        if reject_decided and series.is_completed:
+            raise SeriesDecided(f'Series {series_id} is already decided')
         
         # Update wins
         if winning_team_id == series.team1_id:
@@ -208,33 +262,38 @@ class TournamentManager:
             series.winner_team_id = series.team1_id
             series.is_completed = True
             print(f"\n🏆 {series.team1.city} {series.team1.name} wins series {series.team1_wins}-{series.team2_wins}!")
-            self.session.commit()
-            self._check_and_advance_round(series.tournament_round)
         elif series.team2_wins >= 4:
             series.winner_team_id = series.team2_id
             series.is_completed = True
             print(f"\n🏆 {series.team2.city} {series.team2.name} wins series {series.team2_wins}-{series.team1_wins}!")
-            self.session.commit()
-            self._check_and_advance_round(series.tournament_round)
-        else:
-            self.session.commit()
+        
+        publish(self.session, 'series_updated', **series_row(series))
+        self._commit()
+        
+        if series.is_completed and advance:
+            self._check_and_advance_round(series.tournament_round, run_id=series.run_id)
         
         return series
     
-    def _check_and_advance_round(self, current_round):
+    def _check_and_advance_round(self, current_round, run_id=None):
         """
-        Check if all series in current round are complete.
-        If so, automatically create next round matchups.
+        Check if all series in current round (of the given run, default: the
+        active run) are complete. If so, automatically create next round matchups.
+        Returns whether the round is complete.
         """
+        # Take the write lock before reading, so two workers completing the
+        # round's last series at the same time cannot both create the next round
+        bump_versions(self.session, BRACKET)
+        
         # Get all series in current round
-        round_series = self.session.query(Series).filter_by(tournament_round=current_round).all()
+        round_series = self._run_series(run_id).filter_by(tournament_round=current_round).all()
         
         # Check if all are complete
         all_complete = all(s.is_completed for s in round_series)
         
         if all_complete and current_round < 5:  # Max 5 rounds
             print(f"\n✅ Round {current_round} Complete! Advancing to Round {current_round + 1}...")
-            next_series = self.create_next_round(current_round)
+            next_series = self.create_next_round(current_round, run_id=run_id)
             if next_series:
                 print(f"✨ Created {len(next_series)} series for Round {current_round + 1}")
         elif all_complete and current_round == 5:
@@ -242,14 +301,16 @@ class TournamentManager:
             print(f"\n🏆🏆🏆 TOURNAMENT CHAMPION: {winner.city} {winner.name}! 🏆🏆🏆")
             
             # Mark the run as completed and set champion
-            from models import Run
             if round_series[0].run_id:
                 run = self.session.query(Run).filter_by(id=round_series[0].run_id).first()
                 if run:
                     run.is_completed = True
                     run.champion_team_id = winner.id
-                    self.session.commit()
+                    publish(self.session, 'run_completed', run_id=run.id, champion_team_id=winner.id)
+                    bump_versions(self.session, RUNS)
+                    self._commit()
                     print(f"✅ Season '{run.name}' marked as completed!")
+        return all_complete
     
     def reset_tournament(self, run_id=None):
         """
@@ -263,7 +324,6 @@ class TournamentManager:
             series_to_delete = self.session.query(Series).filter_by(run_id=run_id).all()
         else:
             # If no run_id, reset current active run
-            from models import Run
             active_run = self.session.query(Run).filter_by(is_active=True).first()
             if active_run:
                 series_to_delete = self.session.query(Series).filter_by(run_id=active_run.id).all()
@@ -290,16 +350,18 @@ class TournamentManager:
                 self.session.query(PlayByPlay).filter_by(game_id=game.id).delete()
                 self.session.delete(game)
         
-        self.session.commit()
+        publish(self.session, 'tournament_reset', run_id=run_id)
+        bump_versions(self.session, BRACKET, GAMES)
+        self._commit()
         print(f"✅ Tournament reset complete! All series and games deleted.")
         
         return {'message': 'Tournament reset successfully', 'run_id': run_id}
     
-    def get_current_series(self):
+    def get_current_series(self, run_id=None):
         """
-        Get all active (incomplete) series.
+        Get all active (incomplete) series of the given run (default: the active run).
         """
-        active_series = self.session.query(Series).filter_by(is_completed=False).all()
+        active_series = self._run_series(run_id).filter_by(is_completed=False).all()
         return active_series
     
     def get_series_status(self, series_id):
@@ -325,11 +387,11 @@ class TournamentManager:
             'winner': series.winner if series.is_completed else None
         }
     
-    def get_tournament_overview(self):
+    def get_tournament_overview(self, run_id=None):
         """
-        Get overview of entire tournament.
+        Get overview of the entire tournament of the given run (default: the active run).
         """
-        all_series = self.session.query(Series).order_by(Series.tournament_round, Series.series_number).all()
+        all_series = self._run_series(run_id).order_by(Series.tournament_round, Series.series_number).all()
         
         rounds = {}
         for series in all_series:
@@ -0,0 +1,183 @@
+"""
+Monte Carlo evaluation of roster moves (trades, signings, releases) before
+they are made.
+
+A RosterSnapshot (rosters.py) is an in-memory copy of every roster.
+evaluate() applies the proposed moves to a copy of it and plays each
+affected team against the rest of the league, thousands of games before and
+after the move, with the vectorized extrapolator and box score engine in
+game_extrapolator.py.
+Winners come from the same roster strength model generate_league.py uses.
+The before and after runs reuse the same random draws (common random
+numbers), so the deltas measure the move rather than sampling noise.
+
+numpy is imported on the first evaluation rather than with the app.
+
+Games are played in chunks on a thread pool. numpy releases the GIL in the
+array operations, so the chunks run on several cores without copying the
+snapshot into other processes.
+
+Settings (environment):
+    EVALUATOR_THREADS   default: the number of CPUs
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from game_extrapolator import box_score_batch, extrapolate_quarters_batch, win_probability
+
+EVALUATOR_THREADS = int(os.environ.get('EVALUATOR_THREADS', os.cpu_count() or 1))
+DEFAULT_SIMULATIONS = 5000  # games per affected team, before and after
+MAX_SIMULATIONS = 50000
+CHUNK_GAMES = 1250
+
+STATS = ('points', 'rebounds', 'assists', 'steals', 'blocks', 'minutes')
+
+
+# ==================== SIMULATION ====================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EVALUATOR_THREADS, thread_name_prefix='evaluator')
+        return _executor
+
+
+def _play_chunk(snapshot, team_id, first_game, games, seed):
+    """
+    Play games first_game.. of team_id's schedule (every other league team in
+    turn, alternating home and away). Returns the summed results.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    opponents = np.array([t for t in snapshot.league_team_ids if t != team_id])
+    index = np.arange(first_game, first_game + games)
+    opponent = opponents[index % len(opponents)]
+    at_home = (index // len(opponents)) % 2 == 0
+
+    strength = np.array([snapshot.strength[t] for t in opponent])
+    wins = rng.random(games) < win_probability(snapshot.strength[team_id], strength)
+
+    # Input quarter drawn like generate_league.py: the winner scores 24-36
+    quarter = rng.integers(1, 5, games)
+    winner_score, loser_score = rng.integers(24, 37, games), rng.integers(16, 31, games)
+    loser_score = np.where(loser_score >= winner_score, winner_score - rng.integers(1, 7, games), loser_score)
+    home_wins = wins == at_home
+    home, away = extrapolate_quarters_batch(
+        rng, quarter,
+        np.where(home_wins, winner_score, loser_score),
+        np.where(home_wins, loser_score, winner_score)
+    )
+    home_total, away_total = home.sum(axis=1), away.sum(axis=1)
+    points_for = np.where(at_home, home_total, away_total)
+    points_against = np.where(at_home, away_total, home_total)
+
+    _, ratings = snapshot.roster(team_id)
+    box = box_score_batch(rng, ratings, points_for)
+    return {
+        'games': games,
+        'wins': int(wins.sum()),
+        'points_for': int(points_for.sum()),
+        'points_against': int(points_against.sum()),
+        'played': (box['minutes'] > 0).sum(axis=0),
+        **{stat: box[stat].sum(axis=0) for stat in STATS},
+    }
+
+
+def _merge(parts):
+    total = dict(parts[0])
+    for part in parts[1:]:
+        for key, value in part.items():
+            total[key] = total[key] + value
+    return total
+
+
+def _team_summary(totals):
+    games = totals['games']
+    win_rate = totals['wins'] / games
+    return {
+        'win_rate': round(win_rate, 4),
+        'win_rate_stderr': round(math.sqrt(win_rate * (1 - win_rate) / games), 4),
+        'points_for': round(totals['points_for'] / games, 2),
+        'points_against': round(totals['points_against'] / games, 2),
+        'margin': round((totals['points_for'] - totals['points_against']) / games, 2),
+    }
+
+
+def _delta(before, after, keys):
+    if before is None or after is None:
+        return None
+    return {key: round(after[key] - before[key], 4) for key in keys}
+
+
+def evaluate(snapshot, moves, simulations=DEFAULT_SIMULATIONS, seed=None):
+    """
+    Simulate every league team touched by moves ({player_id: team_id}) before
+    and after the moves. Returns per-team and per-player averages with deltas;
+    the same seed gives the same result.
+    """
+    import numpy as np
+    start = time.perf_counter()
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    after_snapshot = snapshot.with_moves(moves)
+    touched = {snapshot.team_of(p) for p in moves} | set(moves.values())
+    team_ids = [t for t in snapshot.league_team_ids if t in touched]
+
+    seed_sequence = np.random.SeedSequence(seed)
+    chunks = [(first, min(CHUNK_GAMES, simulations - first)) for first in range(0, simulations, CHUNK_GAMES)]
+    jobs = {}
+    for team_id, team_seeds in zip(team_ids, seed_sequence.spawn(len(team_ids))):
+        for (first, games), chunk_seed in zip(chunks, team_seeds.spawn(len(chunks))):
+            # The same seed before and after: both runs see the same draws
+            for label, state in (('before', snapshot), ('after', after_snapshot)):
+                future = _pool().submit(_play_chunk, state, team_id, first, games, chunk_seed)
+                jobs.setdefault((team_id, label), []).append(future)
+    results = {key: _merge([f.result() for f in futures]) for key, futures in jobs.items()}
+
+    teams, players = [], []
+    for team_id in team_ids:
+        before, after = (_team_summary(results[(team_id, label)]) for label in ('before', 'after'))
+        teams.append({
+            'team_id': team_id,
+            'team': snapshot.teams[team_id],
+            'before': before,
+            'after': after,
+            'delta': _delta(before, after, ('win_rate', 'points_for', 'points_against', 'margin')),
+        })
+
+    player_lines = {}
+    for label, state in (('before', snapshot), ('after', after_snapshot)):
+        for team_id in team_ids:
+            totals = results[(team_id, label)]
+            player_ids, _ = state.roster(team_id)
+            for i, player_id in enumerate(player_ids):
+                line = {stat: round(float(totals[stat][i]) / totals['games'], 2) for stat in STATS}
+                line['rotation_rate'] = round(float(totals['played'][i]) / totals['games'], 4)
+                player_lines.setdefault(player_id, {})[label] = (team_id, line)
+    for player_id, lines in sorted(player_lines.items()):
+        before = lines.get('before', (None, None))[1]
+        after = lines.get('after', (None, None))[1]
+        players.append({
+            'player_id': player_id,
+            'name': snapshot.players[player_id][0],
+            'team_before': snapshot.team_of(player_id),
+            'team_after': after_snapshot.team_of(player_id),
+            'before': before,
+            'after': after,
+            'delta': _delta(before, after, STATS + ('rotation_rate',)),
+        })
+
+    return {
+        'simulations': simulations,
+        'seed': seed,
+        'teams': teams,
+        'players': players,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
@@ -124,7 +124,7 @@ After=network.target
 User=$USER
 WorkingDirectory=$SCRIPT_DIR/backend
 Environment="PATH=$SCRIPT_DIR/backend/venv/bin"
-ExecStart=$SCRIPT_DIR/backend/venv/bin/gunicorn -w 4 -b 127.0.0.1:5000 app:app
+ExecStart=$SCRIPT_DIR/backend/venv/bin/gunicorn -w 4 -b 127.0.0.1:5000 'app:create_app()'
 Restart=always
 
 [Install]
@@ -203,7 +203,7 @@ RUN pip install --no-cache-dir -r requirements.txt gunicorn
 COPY backend/ .
 RUN if [ ! -f basketball_sim.db ]; then python seed_data.py && python add_free_agents.py; fi
 EXPOSE 5000
-CMD ["gunicorn", "-w", "4", "-b", "0.0.0.0:5000", "app:app"]
+CMD ["gunicorn", "-w", "4", "-b", "0.0.0.0:5000", "app:create_app()"]
 EOF
     fi
     
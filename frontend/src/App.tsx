@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './App.css';
 import * as api from './api';
 import { BracketTree } from './BracketTree';
@@ -43,29 +43,60 @@ function App() {
 
   useEffect(() => {
     // Load active series, runs, and stats on mount
-    loadActiveSeries();
-    loadRuns();
-    loadActiveRun();
-    loadStatLeaders();
+    loadDashboard(['runs', 'active_run', 'active_series', 'leaders']);
   }, []);
 
-  const loadRuns = async () => {
-    try {
-      const response = await api.getRuns();
-      setRuns(response.data);
-    } catch (err: any) {
-      console.error('Failed to load runs:', err.message);
-    }
-  };
+  // Apply change events as deltas instead of refetching whole collections.
+  // The subscription lives for the whole session, so it reloads through a ref
+  // to the latest loadDashboard (and so the current season filter).
+  const loadDashboardRef = useRef<(fields?: api.DashboardField[]) => Promise<void>>();
+  useEffect(() => {
+    const unsubscribe = api.subscribeToEvents((kind, payload) => {
+      switch (kind) {
+        case 'game_created':
+          setGames((prev) => [payload, ...prev.filter((g) => g.id !== payload.id)]);
+          break;
+        case 'game_deleted':
+          setGames((prev) => prev.filter((g) => g.id !== payload.id));
+          break;
+        case 'series_updated':
+          setActiveSeries((prev) =>
+            payload.is_completed
+              ? prev.filter((s) => s.id !== payload.id)
+              : prev.map((s) => (s.id === payload.id ? { ...s, score: payload.score } : s))
+          );
+          break;
+        case 'round_advanced':
+        case 'run_completed':
+        case 'tournament_reset':
+          loadDashboardRef.current?.(['runs', 'active_run', 'active_series', 'tournament']);
+          break;
+        case 'roster_move':
+          loadDashboardRef.current?.(['leaders']);
+          break;
+        default:
+          break;
+      }
+    });
+    return unsubscribe;
+  }, []);
 
-  const loadActiveRun = async () => {
+  // One request for any mix of runs, active run, series, bracket, games and leaders
+  const loadDashboard = async (fields?: api.DashboardField[]) => {
     try {
-      const response = await api.getActiveRun();
-      setActiveRun(response.data);
+      const response = await api.getDashboard({ fields, season: seasonFilter });
+      const data = response.data;
+      if ('runs' in data) setRuns(data.runs);
+      if ('active_run' in data) setActiveRun(data.active_run);
+      if ('active_series' in data) setActiveSeries(data.active_series);
+      if ('tournament' in data) setTournamentData(data.tournament);
+      if ('games' in data) setGames(data.games);
+      if ('leaders' in data) setStatLeaders(data.leaders);
     } catch (err: any) {
-      console.error('Failed to load active run:', err.message);
+      console.error('Failed to load dashboard:', err.message);
     }
   };
+  loadDashboardRef.current = loadDashboard;
 
   const loadActiveSeries = async () => {
     try {
@@ -119,9 +150,7 @@ function App() {
     try {
       setLoading(true);
       await api.createRun({ year: parseInt(year) });
-      await loadRuns();
-      await loadActiveRun();
-      await loadActiveSeries();
+      await loadDashboard(['runs', 'active_run', 'active_series']);
       setSuccess(`New season ${year} created!`);
       setLoading(false);
     } catch (err: any) {
@@ -134,8 +163,7 @@ function App() {
     try {
       setLoading(true);
       await api.activateRun(runId);
-      await loadActiveRun();
-      await loadActiveSeries();
+      await loadDashboard(['runs', 'active_run', 'active_series']);
       setSuccess('Switched season!');
       setLoading(false);
     } catch (err: any) {
@@ -212,8 +240,8 @@ function App() {
       setShowPreview(false);
       setGamePreview(null);
       
-      // Reload active series to update scores
-      await loadActiveSeries();
+      // Refresh series scores, bracket, game list and leaders in one request
+      await loadDashboard();
       
       setLoading(false);
       
@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { AxiosResponse } from 'axios';
 // Allow reading CRA env at type level without adding @types/node
 declare const process: any;
 
@@ -39,6 +39,19 @@ const api = axios.create({
   timeout: 10000, // 10 second timeout
 });
 
+// "extrapolate_game;dur=41.2, total;dur=97.0" -> { extrapolate_game: 41.2, total: 97.0 } (ms)
+const parseServerTiming = (header: string) => {
+  const stages: Record<string, number> = {};
+  header.split(',').forEach((entry) => {
+    const [name, ...params] = entry.trim().split(';');
+    const dur = params.find((p) => p.trim().startsWith('dur='));
+    if (name && dur) {
+      stages[name] = parseFloat(dur.trim().slice(4));
+    }
+  });
+  return stages;
+};
+
 // Add request/response interceptors for debugging
 api.interceptors.request.use(
   (config: any) => {
@@ -54,6 +67,10 @@ api.interceptors.request.use(
 api.interceptors.response.use(
   (response: any) => {
     console.log('API Response:', response.config.url, 'Status:', response.status);
+    const serverTiming = response.headers?.['server-timing'];
+    if (serverTiming) {
+      console.log('Server-Timing:', response.config.url, parseServerTiming(serverTiming));
+    }
     return response;
   },
   (error: any) => {
@@ -67,9 +84,131 @@ api.interceptors.response.use(
   }
 );
 
+// Response cache for GETs. Identical requests in flight share one request,
+// and responses are kept by URL and params:
+// - for FRESH_MS they are returned without asking the server;
+// - until STALE_MS they are returned at once and revalidated in the background;
+// - after that, or once a change touches one of their tags, callers wait for
+//   the revalidation.
+// Revalidation sends the cached ETag in If-None-Match, and the server answers
+// 304 with no body when nothing changed. Mutations and change events
+// invalidate the tags they affect.
+export type CacheTag = 'teams' | 'rosters' | 'games' | 'tournament' | 'stats' | 'runs';
+
+const FRESH_MS = 2000;
+const STALE_MS = 30000;
+const MAX_CACHE_ENTRIES = 200;
+
+type CacheEntry = {
+  response: AxiosResponse;
+  etag?: string;
+  tags: CacheTag[];
+  request: number;
+  fetchedAt: number;
+  invalidated: boolean;
+};
+
+const responseCache = new Map<string, CacheEntry>();
+const inFlight = new Map<string, { promise: Promise<AxiosResponse>; tags: CacheTag[] }>();
+// Bumped on invalidation, so a response requested before a change isn't cached as current
+const tagVersions: Record<CacheTag, number> = { teams: 0, rosters: 0, games: 0, tournament: 0, stats: 0, runs: 0 };
+let requestCount = 0;
+
+const cacheKey = (url: string, params?: Record<string, any>) => {
+  const query = Object.keys(params || {})
+    .filter((name) => params![name] !== undefined && params![name] !== null)
+    .sort()
+    .map((name) => `${name}=${params![name]}`)
+    .join('&');
+  return query ? `${url}?${query}` : url;
+};
+
+const revalidate = (key: string, url: string, params: Record<string, any> | undefined, tags: CacheTag[]) => {
+  const cached = responseCache.get(key);
+  const versions = tags.map((tag) => tagVersions[tag]);
+  const request = ++requestCount;
+  const promise = api
+    .get(url, {
+      params,
+      headers: cached?.etag ? { 'If-None-Match': cached.etag } : {},
+      validateStatus: (status: number) => (status >= 200 && status < 300) || status === 304,
+    })
+    .then((response: AxiosResponse) => {
+      const fresh = response.status === 304 && cached ? cached.response : response;
+      const current = responseCache.get(key);
+      if (current && current.request > request) {
+        return fresh; // a later request already answered
+      }
+      responseCache.delete(key);
+      responseCache.set(key, {
+        response: fresh,
+        etag: (response.headers?.etag as string | undefined) || cached?.etag,
+        tags,
+        request,
+        fetchedAt: Date.now(),
+        invalidated: tags.some((tag, i) => tagVersions[tag] !== versions[i]),
+      });
+      if (responseCache.size > MAX_CACHE_ENTRIES) {
+        responseCache.delete(responseCache.keys().next().value);
+      }
+      return fresh;
+    })
+    .finally(() => {
+      if (inFlight.get(key)?.promise === promise) {
+        inFlight.delete(key);
+      }
+    });
+  inFlight.set(key, { promise, tags });
+  return promise;
+};
+
+const cachedGet = (url: string, tags: CacheTag[], params?: Record<string, any>): Promise<AxiosResponse> => {
+  const key = cacheKey(url, params);
+  const pending = inFlight.get(key);
+  if (pending) {
+    return pending.promise;
+  }
+  const cached = responseCache.get(key);
+  if (cached && !cached.invalidated) {
+    const age = Date.now() - cached.fetchedAt;
+    if (age < FRESH_MS) {
+      return Promise.resolve(cached.response);
+    }
+    if (age < STALE_MS) {
+      // Failures are logged by the response interceptor; the entry stays as it was
+      revalidate(key, url, params, tags).catch(() => undefined);
+      return Promise.resolve(cached.response);
+    }
+  }
+  return revalidate(key, url, params, tags);
+};
+
+// Mark every cached response with one of the tags (all of them by default)
+// as out of date; the next request for it waits for the server.
+export const invalidateCache = (...tags: CacheTag[]) => {
+  const all = tags.length === 0;
+  (Object.keys(tagVersions) as CacheTag[]).forEach((tag) => {
+    if (all || tags.includes(tag)) tagVersions[tag] += 1;
+  });
+  const touched = (entryTags: CacheTag[]) => all || entryTags.some((tag) => tags.includes(tag));
+  responseCache.forEach((entry) => {
+    if (touched(entry.tags)) entry.invalidated = true;
+  });
+  inFlight.forEach((pending, key) => {
+    if (touched(pending.tags)) inFlight.delete(key);
+  });
+};
+
+// Invalidate once the request is over; also on failure, since the change may have been made anyway
+const mutation = <T>(tags: CacheTag[], request: Promise<T>) => request.finally(() => invalidateCache(...tags));
+
+// What each kind of change can make out of date
+const GAME_TAGS: CacheTag[] = ['games', 'tournament', 'stats', 'runs'];
+const ROSTER_TAGS: CacheTag[] = ['rosters', 'teams', 'stats'];
+
 // Teams
-export const getTeams = () => api.get('/teams');
-export const getTeam = (id: number) => api.get(`/teams/${id}`);
+export const getTeams = () => cachedGet('/teams', ['teams']);
+export const getTeam = (id: number) => cachedGet(`/teams/${id}`, ['teams', 'rosters']);
 
 // Games
 export const createGame = (data: {
@@ -79,7 +218,16 @@ export const createGame = (data: {
   home_score: number;
   away_score: number;
   series_id?: number;
-}) => api.post('/games/create', data);
+}) => mutation(GAME_TAGS, api.post('/games/create', data));
+
+export const createGamesBulk = (games: Array<{
+  home_team_id: number;
+  away_team_id: number;
+  quarter_number: number;
+  home_score: number;
+  away_score: number;
+  series_id?: number;
+}>) => mutation(GAME_TAGS, api.post('/games/bulk', { games }));
 
 export const previewGame = (data: {
   home_team_id: number;
@@ -89,49 +237,100 @@ export const previewGame = (data: {
   away_score: number;
 }) => api.post('/games/preview', data);
 
-export const getGame = (id: number) => api.get(`/games/${id}`);
-export const getGames = () => api.get('/games');
-export const deleteGame = (id: number) => api.delete(`/games/${id}`);
-export const getPlayByPlay = (gameId: number) => api.get(`/games/${gameId}/playbyplay`);
+export const getGame = (id: number) => cachedGet(`/games/${id}`, ['games', 'teams']);
+export const getGames = () => cachedGet('/games', ['games', 'teams']);
+export const deleteGame = (id: number) => mutation(GAME_TAGS, api.delete(`/games/${id}`));
+export const getPlayByPlay = (gameId: number) => cachedGet(`/games/${gameId}/playbyplay`, ['games']);
 
 // Tournament
-export const initializeTournament = () => api.post('/tournament/initialize');
-export const getTournamentOverview = () => api.get('/tournament/overview');
-export const getSeries = (id: number) => api.get(`/tournament/series/${id}`);
-export const getSeriesGames = (id: number) => api.get(`/tournament/series/${id}/games`);
-export const getActiveSeries = () => api.get('/tournament/active-series');
-export const advanceRound = (roundNumber: number) => api.post(`/tournament/advance-round/${roundNumber}`);
-export const resetTournament = (runId?: number) => api.post('/tournament/reset', { run_id: runId });
+export const initializeTournament = () => mutation(GAME_TAGS, api.post('/tournament/initialize'));
+export const getTournamentOverview = () => cachedGet('/tournament/overview', ['tournament', 'teams']);
+export const getSeries = (id: number) => cachedGet(`/tournament/series/${id}`, ['tournament', 'teams']);
+export const getSeriesGames = (id: number) => cachedGet(`/tournament/series/${id}/games`, ['games', 'teams']);
+export const getActiveSeries = () => cachedGet('/tournament/active-series', ['tournament', 'teams']);
+export const advanceRound = (roundNumber: number) =>
+  mutation(GAME_TAGS, api.post(`/tournament/advance-round/${roundNumber}`));
+export const resetTournament = (runId?: number) => mutation(GAME_TAGS, api.post('/tournament/reset', { run_id: runId }));
 
 // Stats
-export const getPlayerStats = (playerId: number) => api.get(`/stats/player/${playerId}`);
+export const getPlayerStats = (playerId: number) => cachedGet(`/stats/player/${playerId}`, ['stats', 'rosters']);
 export const getStatLeaders = (params?: { run_id?: number; season?: 'current' | 'all' }) => 
-  api.get('/stats/leaders', { params });
+  cachedGet('/stats/leaders', ['stats', 'teams'], params);
 export const getTeamStats = (params?: { run_id?: number; season?: 'current' | 'all' }) =>
-  api.get('/stats/teams', { params });
+  cachedGet('/stats/teams', ['stats', 'teams'], params);
 export const getHeadToHead = (team1Id: number, team2Id: number) =>
-  api.get(`/stats/head-to-head?team1_id=${team1Id}&team2_id=${team2Id}`);
+  cachedGet('/stats/head-to-head', ['stats', 'teams'], { team1_id: team1Id, team2_id: team2Id });
 export const getInputPerformance = (runId?: number) =>
-  api.get('/stats/input-performance', { params: { run_id: runId } });
+  cachedGet('/stats/input-performance', ['stats', 'teams'], { run_id: runId });
 export const getGameHistory = (params?: { limit?: number; run_id?: number; team_id?: number }) =>
-  api.get('/games/history', { params });
+  cachedGet('/games/history', ['games', 'teams'], params);
+
+// Dashboard: any subset of the startup/refresh data in one request
+export type DashboardField = 'runs' | 'active_run' | 'active_series' | 'tournament' | 'games' | 'leaders';
+export const getDashboard = (params?: { fields?: DashboardField[]; season?: 'current' | 'all'; run_id?: number }) =>
+  cachedGet('/dashboard', ['runs', 'tournament', 'games', 'stats', 'teams'], {
+    ...params,
+    fields: params?.fields?.join(','),
+  });
+
+// Change feed (Server-Sent Events). Returns a function that closes the stream.
+export type ChangeEventKind =
+  | 'game_created'
+  | 'game_deleted'
+  | 'series_updated'
+  | 'round_advanced'
+  | 'run_completed'
+  | 'tournament_reset'
+  | 'roster_move';
+
+export const subscribeToEvents = (onEvent: (kind: ChangeEventKind, payload: any) => void) => {
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  const kinds: ChangeEventKind[] = [
+    'game_created', 'game_deleted', 'series_updated', 'round_advanced',
+    'run_completed', 'tournament_reset', 'roster_move',
+  ];
+  kinds.forEach((kind) => {
+    source.addEventListener(kind, (event: MessageEvent) => {
+      // Changes made elsewhere (other tabs, scripts) make cached responses out of date too
+      invalidateCache(...(kind === 'roster_move' ? ROSTER_TAGS : GAME_TAGS));
+      onEvent(kind, JSON.parse(event.data));
+    });
+  });
+  return () => source.close();
+};
 
 // Database Backup
 export const exportDatabaseJSON = () => api.get('/backup/export', { responseType: 'blob' });
 export const downloadDatabaseFile = () => api.get('/backup/download-db', { responseType: 'blob' });
 
 // Free Agents
-export const getFreeAgents = () => api.get('/free-agents');
+// params: position, min_<stat>/max_<stat>, name, sort, limit, cursor (the
+// X-Next-Cursor response header of the previous page)
+export const getFreeAgents = (params?: Record<string, string | number>) =>
+  cachedGet('/free-agents', ['rosters'], params);
 export const signPlayer = (playerId: number, teamId: number) => 
-  api.post(`/players/${playerId}/sign`, { team_id: teamId });
-export const releasePlayer = (playerId: number) => api.post(`/players/${playerId}/release`);
+  mutation(ROSTER_TAGS, api.post(`/players/${playerId}/sign`, { team_id: teamId }));
+export const releasePlayer = (playerId: number) => mutation(ROSTER_TAGS, api.post(`/players/${playerId}/release`));
 export const tradePlayers = (data: { player_ids_team1: number[]; player_ids_team2: number[] }) =>
-  api.post('/players/trade', data);
+  mutation(ROSTER_TAGS, api.post('/players/trade', data));
+export type RosterMove = {
+  action: 'trade' | 'sign' | 'release';
+  player_ids_team1?: number[];
+  player_ids_team2?: number[];
+  player_id?: number;
+  team_id?: number;
+};
+// Dry run of one move or a list of them; changes nothing
+export const evaluateMove = (data: (RosterMove | { moves: RosterMove[] }) & { simulations?: number; seed?: number }) =>
+  api.post('/players/evaluate', data);
+// Several moves in one transaction: all of them are applied or none
+export const applyRosterTransactions = (moves: RosterMove[]) =>
+  mutation(ROSTER_TAGS, api.post('/rosters/transactions', { moves }));
 
 // Runs (Seasons)
-export const getRuns = () => api.get('/runs');
-export const getActiveRun = () => api.get('/runs/active');
-export const createRun = (data: { name?: string; year?: number }) => api.post('/runs', data);
-export const activateRun = (runId: number) => api.put(`/runs/${runId}/activate`);
+export const getRuns = () => cachedGet('/runs', ['runs']);
+export const getActiveRun = () => cachedGet('/runs/active', ['runs']);
+export const createRun = (data: { name?: string; year?: number }) => mutation(GAME_TAGS, api.post('/runs', data));
+export const activateRun = (runId: number) => mutation(GAME_TAGS, api.put(`/runs/${runId}/activate`));
 
 export default api;
@@ -29,4 +29,4 @@ else
 fi
 
 echo "🚀 Starting backend server..."
-exec gunicorn -w 4 -b 0.0.0.0:$PORT app:app
+exec gunicorn -w 4 -b 0.0.0.0:$PORT 'app:create_app()'